@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Time and peak memory of summing flextime and vacation over an archive
+file, parsed whole with Parser.parse_archive_file and read through
+MappedArchive.
+
+    python benchmarks/bench_archive.py [years, default 30]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from corpus import month_strings
+
+from chrono.mapped_archive import MappedArchive
+from chrono.parser import Parser
+
+
+def write_archive(file_name: str, years: int):
+    with open(file_name, "w") as archive_file:
+        for month, string in sorted(month_strings(1990,
+                                                  1990 + years - 1).items()):
+            archive_file.write("{}\n{}\n".format(month, string))
+
+
+def measure(function) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def parse_whole(file_name: str) -> tuple:
+    archive = Parser().parse_archive_file(file_name)
+    return archive.calculate_flextime(), archive.used_vacation()
+
+
+def read_mapped(file_name: str) -> tuple:
+    with MappedArchive(file_name) as archive:
+        return archive.calculate_flextime(), archive.used_vacation()
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    with tempfile.TemporaryDirectory() as folder:
+        file_name = os.path.join(folder, "archive.txt")
+        write_archive(file_name, years)
+        print("{} years, {:.1f} MB archive".format(
+            years, os.path.getsize(file_name) / 1e6))
+        results = set()
+        for name, function in (
+                ("parse_archive_file", lambda: parse_whole(file_name)),
+                ("MappedArchive, index built", lambda: read_mapped(file_name)),
+                ("MappedArchive, index read", lambda: read_mapped(file_name))):
+            result, elapsed, peak = measure(function)
+            results.add(result)
+            print("{:<28}{:8.1f} ms {:8.1f} MB peak".format(
+                name, elapsed * 1000, peak / 1e6))
+        if len(results) != 1:
+            print("Totals differ: {}".format(results))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+"""Disk footprint and load time of plain, gzip and lzma compressed archive
+files.
+
+    python benchmarks/bench_compression.py [years, default 30]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from corpus import month_strings
+
+from chrono.archive import open_archive_file
+from chrono.parser import Parser
+
+
+def write_archive(file_name: str, years: int) -> float:
+    start = time.perf_counter()
+    with open_archive_file(file_name, "w") as archive_file:
+        for month, string in sorted(month_strings(1990,
+                                                  1990 + years - 1).items()):
+            archive_file.write("{}\n{}\n".format(month, string))
+    return time.perf_counter() - start
+
+
+def load(file_name: str) -> tuple:
+    start = time.perf_counter()
+    archive = Parser().parse_archive_file(file_name)
+    result = archive.calculate_flextime(), archive.used_vacation()
+    return result, time.perf_counter() - start
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    print("{} years".format(years))
+    with tempfile.TemporaryDirectory() as folder:
+        results = set()
+        for extension in (".txt", ".txt.gz", ".txt.xz"):
+            file_name = os.path.join(folder, "archive" + extension)
+            write_seconds = write_archive(file_name, years)
+            result, load_seconds = load(file_name)
+            results.add(result)
+            print("{:<8}{:10.1f} kB {:8.1f} ms write {:8.1f} ms load".format(
+                extension, os.path.getsize(file_name) / 1e3,
+                write_seconds * 1000, load_seconds * 1000))
+        if len(results) != 1:
+            print("Totals differ: {}".format(results))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Time to aggregate flextime and vacation over a long report history.
+
+Compares summing Day.calculate_flextime() day by day with the Python and
+NumPy engines of chrono.engine.
+
+    python benchmarks/bench_engine.py [years]
+"""
+
+import datetime
+import sys
+import tempfile
+import timeit
+
+from corpus import write_data_folder
+
+from chrono import engine
+from chrono.day import DayType
+from chrono.parser import Parser
+
+
+def per_day(user):
+    flextime = datetime.timedelta()
+    vacation = 0
+    for day in user.all_days():
+        flextime += day.calculate_flextime()
+        vacation += day.day_type == DayType.vacation
+    return flextime, vacation
+
+
+def with_engine(user):
+    return user.calculate_flextime(), user.used_vacation()
+
+
+def best_of(function, user, number=20):
+    return min(timeit.repeat(lambda: function(user), number=number,
+                             repeat=5)) / number
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as data_folder:
+        write_data_folder(data_folder, 2026 - years, 2025)
+        user = Parser().parse_data_folder(data_folder)
+
+    expected = per_day(user)
+    baseline = best_of(per_day, user)
+    print("{} years, {} days".format(years, len(user.all_days())))
+    print("per day: {:8.2f} ms".format(baseline * 1000))
+
+    engines = [engine.PythonEngine()]
+    if engine.numpy is not None:
+        engines.append(engine.NumpyEngine())
+    for current in engines:
+        engine.current = current
+        assert with_engine(user) == expected
+        seconds = best_of(with_engine, user)
+        print("{:<8} {:8.2f} ms ({:.1f}x)".format(
+            current.name + ":", seconds * 1000, baseline / seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Time to report histories of growing length to a user.
+
+Compares the one pass Month.load_records path with reporting the same
+records day by day, for histories of 5 to 40 years.
+
+    python benchmarks/bench_load.py
+"""
+
+import timeit
+
+from corpus import month_strings
+
+from chrono.month import Month
+from chrono.parser import Parser, tokenize_month_string
+from chrono.user import User
+
+
+def load(first_year, month_records):
+    parser = Parser()
+    parser.user = User(employed_date="{}-01-01".format(first_year))
+    for month_string, records in month_records:
+        parser.add_month_records(records, month_string)
+    return parser.user
+
+
+def day_by_day(month, records):
+    return False
+
+
+def best_of(function, number=3):
+    return min(timeit.repeat(function, number=number, repeat=3)) / number
+
+
+def main():
+    load_records = Month.load_records
+    for years in (5, 10, 20, 40):
+        first_year = 2026 - years
+        month_records = [
+            (month_string, tokenize_month_string(string, month_string))
+            for month_string, string in sorted(
+                month_strings(first_year, 2025).items())]
+
+        bulk = best_of(lambda: load(first_year, month_records))
+        Month.load_records = day_by_day
+        try:
+            per_day = best_of(lambda: load(first_year, month_records))
+        finally:
+            Month.load_records = load_records
+        print("{:>2} years: {:7.1f} ms day by day, {:6.1f} ms in one pass "
+              "({:.1f}x)".format(years, per_day * 1000, bulk * 1000,
+                                 per_day / bulk))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Memory used by the days of a long report history.
+
+Compares the DayStore columns with a copy of the representation they
+replaced: one instance dict per day holding datetime, timedelta and DayType
+values.
+
+    python benchmarks/bench_memory.py [years]
+"""
+
+import datetime
+import sys
+import tempfile
+import tracemalloc
+
+from corpus import write_data_folder
+
+from chrono.day import Day, DayStore
+from chrono.parser import Parser
+
+
+class LegacyDay(object):
+    def __init__(self, day: Day):
+        self.date = datetime.date.fromordinal(day.date.toordinal())
+        self.start_time = day.start_time
+        self.lunch_duration = day.lunch_duration
+        self.end_time = day.end_time
+        self.deviation = day.deviation
+        self.day_type = day.day_type
+        self.comment = day.comment
+        self.info = day.info
+
+
+def legacy_days(days):
+    return [LegacyDay(day) for day in days]
+
+
+def copy_store(days):
+    store = DayStore()
+    for day in days:
+        new_day = Day.from_row(store, store.append(day.ordinal))
+        new_day.day_type = day.day_type
+        new_day.start_time = day.start_time
+        new_day.lunch_duration = day.lunch_duration
+        new_day.end_time = day.end_time
+        new_day.deviation = day.deviation
+        new_day.comment = day.comment
+        new_day.info = day.info
+    return store
+
+
+def allocated(build, days):
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    copy = build(days)
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del copy
+    return size
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with tempfile.TemporaryDirectory() as data_folder:
+        write_data_folder(data_folder, 2026 - years, 2025)
+        days = Parser().parse_data_folder(data_folder).all_days()
+
+    before = allocated(legacy_days, days)
+    after = allocated(copy_store, days)
+    print("{} years, {} days".format(years, len(days)))
+    print("before: {:>10,} bytes ({:.0f} bytes/day)".format(
+        before, before / len(days)))
+    print("after:  {:>10,} bytes ({:.0f} bytes/day)".format(
+        after, after / len(days)))
+    print("ratio:  {:.1f}x".format(before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Startup cost of the chrono command, from python -X importtime.
+
+Imports chrono.chrono in new processes and reports the median cumulative
+import time and the slowest modules it pulls in. Exits with status 1 if the
+median is over the budget, or if a module that only some commands need is
+imported up front.
+
+    python benchmarks/bench_startup.py [budget in ms, default 15]
+"""
+
+import statistics
+import subprocess
+import sys
+
+BUDGET_MS = 15
+RUNS = 10
+
+# Modules imported by the commands that use them, never at startup.
+DEFERRED_MODULES = ("chrono.daemon", "chrono.parser", "chrono.user",
+                    "chrono.writer", "concurrent.futures", "docopt",
+                    "locale", "numpy", "pkg_resources",
+                    "statistics", "subprocess")
+
+
+def import_times() -> dict:
+    """Return cumulative import time in microseconds by module, for the
+    modules imported by one import of chrono.chrono. Modules imported at
+    interpreter startup, like site, aren't included.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import chrono.chrono"],
+        check=True, stderr=subprocess.PIPE, universal_newlines=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdecimal():
+            continue
+        times[name.strip()] = int(cumulative)
+        # Imports are listed with the imported modules before the module
+        # importing them, indented, so an unindented line ends an import.
+        if not name[1:].startswith(" "):
+            if name.strip() == "chrono.chrono":
+                return times
+            times = {}
+    return times
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    runs = [import_times() for _ in range(RUNS)]
+    median = statistics.median(times["chrono.chrono"] / 1000
+                               for times in runs)
+    print("import chrono.chrono: {:.1f} ms median of {} runs (budget {:g} "
+          "ms)".format(median, RUNS, budget))
+    last = runs[-1]
+    top_level = sorted((name for name in last if name != "chrono.chrono"),
+                       key=last.get, reverse=True)[:8]
+    for name in top_level:
+        print("  {:<30}{:6.1f} ms".format(name, last[name] / 1000))
+
+    deferred = [name for name in last if name.split(".")[0] in
+                DEFERRED_MODULES or name in DEFERRED_MODULES]
+    if deferred:
+        print("Imported at startup: {}".format(", ".join(sorted(deferred))))
+        sys.exit(1)
+    if median > budget:
+        print("Over budget.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
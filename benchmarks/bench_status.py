@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+"""Time of the status command for a 20 year history, as a shell prompt pays
+it: a new `python -m chrono.chrono status` process, from start to exit.
+
+Starting the interpreter isn't chrono's to optimize, so the time of an empty
+`python -c pass` is measured alongside and the budget applies to the
+difference, i.e. to importing chrono and printing the status line. Exits with
+status 1 if the median difference is over the budget or if the status was
+read by parsing the data folder, which rewrites the balance summary.
+
+Importing the standard library modules chrono needs (typing, configparser,
+datetime, json) costs about half the budget on its own. Chrono is compiled
+to bytecode first, as an installed package is, since PYTHONDONTWRITEBYTECODE
+would otherwise make every run compile it from source.
+
+    python benchmarks/bench_status.py [budget in ms, default 20]
+"""
+
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from corpus import write_data_folder
+
+import chrono
+
+BUDGET_MS = 20
+RUNS = 20
+
+
+def run_time(arguments: list, environment: dict) -> float:
+    """Return the wall clock time of a process in milliseconds."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + arguments, env=environment, check=True,
+                   stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else BUDGET_MS
+    compileall.compile_dir(os.path.dirname(chrono.__file__), quiet=1)
+    with tempfile.TemporaryDirectory() as home:
+        data_folder = os.path.join(home, "data")
+        os.mkdir(data_folder)
+        write_data_folder(data_folder, 2006, 2025)
+        with open(os.path.join(home, ".chrono"), "w") as config_file:
+            config_file.write("[Paths]\nData = {}\nCache = {}\n".format(
+                data_folder, os.path.join(home, "cache")))
+        environment = dict(os.environ, HOME=home)
+
+        # The first status parses the data folder and writes the summary.
+        subprocess.run([sys.executable, "-m", "chrono.chrono", "--no-daemon",
+                        "status"], env=environment, check=True,
+                       stdout=subprocess.DEVNULL)
+        summary_file = os.path.join(home, "cache", "status.json")
+        summary_time = os.stat(summary_file).st_mtime_ns
+        interpreter_times = []
+        status_times = []
+        for _ in range(RUNS):
+            interpreter_times.append(
+                run_time(["-c", "pass"], environment))
+            status_times.append(
+                run_time(["-m", "chrono.chrono", "status"], environment))
+        parsed = os.stat(summary_file).st_mtime_ns != summary_time
+
+    interpreter = statistics.median(interpreter_times)
+    times = [status_time - interpreter for status_time in status_times]
+    median = statistics.median(times)
+    print("interpreter: {:.1f} ms median of {} runs".format(interpreter, RUNS))
+    print("status: {:.1f} ms median, {:.1f} ms best over the interpreter "
+          "(budget {:g} ms)".format(median, min(times), budget))
+    if parsed:
+        print("The data folder was parsed instead of read from the summary.")
+        sys.exit(1)
+    if median > budget:
+        print("Over budget.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
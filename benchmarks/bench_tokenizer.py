@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""Month file parsing throughput in lines per second.
+
+Compares Parser.parse_month_string of the working tree with the same method
+at a baseline revision, which compiled its patterns on every call, ran the
+comment pattern twice per line, consumed tokens with list.pop(0) and
+reported every token to a Day, parsing times with strptime. Both parse the
+same synthetic history, from tokens to a Month, each in its own process with
+its own chrono package. The baseline is exported from git to a temporary
+folder, so this must run in a clone of the repository.
+
+    python benchmarks/bench_tokenizer.py [years] [baseline revision]
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+BASELINE_REVISION = "8eca758"
+
+PARSE_SCRIPT = """
+import sys
+import time
+
+from corpus import month_strings
+
+from chrono.parser import Parser
+
+months = month_strings(2026 - {years}, 2025)
+best = None
+for _ in range({repeat}):
+    start = time.perf_counter()
+    for month, string in months.items():
+        Parser().parse_month_string(string, month)
+    elapsed = time.perf_counter() - start
+    best = elapsed if best is None else min(best, elapsed)
+lines = sum(string.count("\\n") for string in months.values())
+print(lines, lines / best)
+"""
+
+
+def lines_per_second(package_folder: str, years: int,
+                     repeat: int = 3) -> tuple:
+    """Return the number of lines and the lines parsed per second by the
+    chrono package in a folder.
+    """
+    benchmark_folder = os.path.dirname(os.path.abspath(__file__))
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(
+        (package_folder, benchmark_folder)))
+    result = subprocess.run(
+        [sys.executable, "-c",
+         PARSE_SCRIPT.format(years=years, repeat=repeat)],
+        env=environment, check=True, stdout=subprocess.PIPE,
+        universal_newlines=True)
+    lines, rate = result.stdout.split()
+    return int(lines), float(rate)
+
+
+def main():
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    revision = sys.argv[2] if len(sys.argv) > 2 else BASELINE_REVISION
+    repository = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as baseline_folder:
+        archive = subprocess.run(
+            ["git", "-C", repository, "archive", revision, "chrono"],
+            check=True, stdout=subprocess.PIPE)
+        subprocess.run(["tar", "-x", "-C", baseline_folder],
+                       input=archive.stdout, check=True)
+        lines, before = lines_per_second(baseline_folder, years)
+    _, after = lines_per_second(repository, years)
+    print("{} years, {} lines".format(years, lines))
+    print("before: {:>10,.0f} lines/s ({})".format(before, revision))
+    print("after:  {:>10,.0f} lines/s".format(after))
+    print("speedup: {:.1f}x".format(after / before))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""Time of writing a report line to month files of growing length.
+
+Each write replaces the last line, like chrono report end does after
+chrono report start. A replaced line is written by renaming a copy of the
+whole month file over it, so its cost grows with the file. Only lines for
+new dates, appended with O_APPEND, cost the same for any file length.
+Month files are at most 31 lines, the longer files show the trend.
+
+    python benchmarks/bench_writer.py
+"""
+
+import os
+import tempfile
+import timeit
+
+from chrono.writer import write_line
+
+
+def main():
+    with tempfile.TemporaryDirectory() as folder:
+        file_path = os.path.join(folder, "2015-02.txt")
+        for lines in (20, 2000, 200000):
+            with open(file_path, "w") as month_file:
+                month_file.write("\n".join(
+                    "{}. 8:00 1:00 17:00".format(n % 28 + 1)
+                    for n in range(lines - 1)))
+                month_file.write("\n28. 8:00")
+            for fsync in (False, True):
+                seconds = min(timeit.repeat(
+                    lambda: write_line(file_path, "28. 8:00 1:00",
+                                       fsync=fsync),
+                    number=100, repeat=3)) / 100
+                print("{:>6} lines, {:<10}{:7.1f} us per write".format(
+                    lines, "fsync:" if fsync else "no fsync:",
+                    seconds * 1e6))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Synthetic report history used by the benchmarks."""
+
+import datetime
+import os
+
+
+def month_lines(first_year: int, last_year: int) -> dict:
+    """Return month file lines for every workday between two years.
+    :returns: Dict mapping "YYYY-MM" to a list of month file lines.
+    """
+    date = datetime.date(first_year, 1, 1)
+    lines = {}
+    while date.year <= last_year:
+        if date.weekday() < 5:
+            ordinal = date.toordinal()
+            if ordinal % 23 == 0:
+                line = "{}. V".format(date.day)
+            elif ordinal % 41 == 0:
+                line = "{}. S \"Fever\"".format(date.day)
+            elif ordinal % 7 == 0:
+                line = "{}. 8:{:02d} 0:45 17:{:02d} 0:30 \"Dentist\"".format(
+                    date.day, ordinal % 60, ordinal * 7 % 60)
+            else:
+                line = "{}. 8:{:02d} 0:45 17:{:02d}".format(
+                    date.day, ordinal % 60, ordinal * 7 % 60)
+            lines.setdefault(date.strftime("%Y-%m"), []).append(line)
+        date += datetime.timedelta(days=1)
+    return lines
+
+
+def month_strings(first_year: int, last_year: int) -> dict:
+    return {month: "\n".join(lines) + "\n" for month, lines in
+            month_lines(first_year, last_year).items()}
+
+
+def write_data_folder(folder: str, first_year: int, last_year: int):
+    """Write user.cfg and month files for a history to a folder."""
+    with open(os.path.join(folder, "user.cfg"), "w") as user_file:
+        user_file.write("Name: Jane Doe\n"
+                        "Employed date: {}-01-01\n"
+                        "Payed vacation: 30\n".format(first_year))
+    for month, string in month_strings(first_year, last_year).items():
+        with open(os.path.join(folder, month + ".txt"), "w") as month_file:
+            month_file.write(string)
@@ -1,3 +1,8 @@
-from pkg_resources import get_distribution
-
-__version__ = get_distribution('chrono').version
\ No newline at end of file
+def __getattr__(name):
+    # Looking up the installed distribution takes longer than most commands,
+    # so it's only done when the version is asked for.
+    if name == "__version__":
+        from pkg_resources import get_distribution
+        return get_distribution('chrono').version
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
@@ -1,52 +1,118 @@
 # -*- coding: utf-8 -*-
 
 from datetime import timedelta
+import gzip
+import lzma
+from typing import IO, Iterable
 
 from chrono import errors, month
 
+_OPENERS = {".gz": gzip.open, ".xz": lzma.open}
+
+
+def is_compressed(file_name: str) -> bool:
+    """Return True if an archive file is gzip or lzma compressed, see
+    open_archive_file.
+    """
+    return file_name[-3:] in _OPENERS
+
+
+def open_archive_file(file_name: str, mode: str = "r") -> IO:
+    """Open an archive file as text. Files ending with ".gz" or ".xz" are
+    gzip or lzma compressed and are decompressed while they're read.
+    :param mode:  "r", "w" or "a". Appending to a compressed archive adds a
+                  compressed stream to the end of the file.
+    """
+    opener = _OPENERS.get(file_name[-3:], open)
+    if opener is open:
+        return open(file_name, mode, encoding='utf-8')
+    return opener(file_name, mode + "t", encoding='utf-8')
+
+
+def write_archive_months(archive_file: IO, months: Iterable[month.Month]):
+    """Write months to an archive file, each under its YYYY-MM header. The
+    lines are written month by month.
+    """
+    for archived_month in months:
+        archive_file.write("{}-{:02d}\n".format(archived_month.year,
+                                                archived_month.month))
+        archive_file.write("".join("{}\n".format(day.export())
+                                   for day in archived_month.days))
+
 
 class Archive(object):
+    """Archived months, kept as FrozenMonths. Flextime, vacation and sick
+    days are summed when months are archived.
+    """
     def __init__(self):
         self.months = []
+        self._archived = set()
+        self._next_month = ""
+        self._flextime = timedelta()
+        self._vacation = 0
+        self._sick_days = 0
 
     def calculate_flextime(self) -> timedelta:
-        flextime = timedelta()
-        for month in self.months:
-            flextime += month.calculate_flextime()
-        return flextime
+        return self._flextime
 
     def used_vacation(self) -> int:
-        used_vacation = 0
-        for month in self.months:
-            used_vacation += month.used_vacation()
-        return used_vacation
+        return self._vacation
+
+    def sick_days(self) -> int:
+        return self._sick_days
 
     def archive_month(self, month: month.Month):
-        for old_month in self.months:
-            if old_month.year == month.year and old_month.month == month.month:
-                raise errors.ReportError("Month {}-{} is allready archived."
-                                         .format(month.year, month.month))
+        """Freeze a month and add it to the archive.
+        :raises: errors.ReportError
+        """
+        self._check_month(month)
+        frozen_month = month.freeze()
+        self.months.append(frozen_month)
+        self._flextime += frozen_month.totals.flextime
+        self._vacation += frozen_month.totals.vacation
+        self._sick_days += frozen_month.totals.sick_days
+        self._archived.add((month.year, month.month))
+        if month.month == 12:
+            self._next_month = "{}-01".format(month.year + 1)
+        else:
+            self._next_month = "{}-{:02d}".format(month.year, month.month + 1)
 
-        date_string = "{}-{:02d}".format(month.year, month.month)
-        if self.next_month() != "" and date_string != self.next_month():
+    def _check_month(self, month: month.Month):
+        """Raise the error archive_month would raise for a month, without
+        archiving it.
+        """
+        if (month.year, month.month) in self._archived:
+            raise errors.ReportError("Month {}-{} is allready archived."
+                                     .format(month.year, month.month))
+
+        if self._next_month != "" and (
+                month.year != int(self._next_month[:4]) or
+                month.month != int(self._next_month[5:])):
             raise errors.ReportError(
                 "Months must be archived sequentially. Expected {}, got "
                 "{}-{:02d}.".format(
-                    self.next_month(), month.year, month.month))
+                    self._next_month, month.year, month.month))
 
         if not month.complete():
             raise errors.ReportError("Month still has unreported workdays and "
                                      "can't be archived.")
-        self.months.append(month)
-
-    def next_month(self) -> month.Month:
-        if len(self.months) > 0:
-            month = self.months[-1].month + 1
-            year = self.months[-1].year
-            if month > 12:
-                month = 1
-                year += 1
-            new_month = "{}-{:02d}".format(year, month)
-        else:
-            new_month = ""
-        return new_month
+
+    def next_month(self) -> str:
+        return self._next_month
+
+    def write(self, file_name: str):
+        """Write the archived months to an archive file."""
+        with open_archive_file(file_name, "w") as archive_file:
+            write_archive_months(archive_file, self.months)
+
+    def append_month(self, file_name: str, month: month.Month):
+        """Archive a month and append it to the archive file the archive was
+        written to. Only the month's lines are written.
+        :raises: errors.ReportError
+        """
+        self._check_month(month)
+        # Archived in memory only once written, so that a failed write
+        # leaves the archive as it was.
+        with open_archive_file(file_name, "a") as archive_file:
+            write_archive_months(archive_file, [month])
+        self.archive_month(month)
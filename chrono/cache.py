@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+import os
+import re
+from typing import Dict, Optional
+
+CACHE_VERSION = 3
+
+USER_FILE = "user.cfg"
+YEAR_FILE = re.compile(r"^\d{4}\.cfg$")
+MONTH_FILE = re.compile(r"^[1-2]\d{3}-[0-1]\d\.txt$")
+JOURNAL_FILE = "journal.log"
+
+Fingerprint = namedtuple("Fingerprint", "path mtime size digest")
+
+
+def file_fingerprint(file_name: str,
+                     previous: Optional[Fingerprint] = None) -> Fingerprint:
+    """Return the fingerprint of a file.
+    :param previous:  A known fingerprint of the file. It is returned
+                      without reading the file if modification time and size
+                      are unchanged.
+    """
+    file_stat = os.stat(file_name)
+    if (previous is not None and
+            previous.mtime == file_stat.st_mtime_ns and
+            previous.size == file_stat.st_size):
+        return previous
+
+    with open(file_name, "rb") as data_file:
+        data = data_file.read()
+    return make_fingerprint(file_name, data, file_stat)
+
+
+def make_fingerprint(file_name: str, data: bytes,
+                     file_stat: os.stat_result) -> Fingerprint:
+    """Return the fingerprint of file content read after a call to os.stat.
+    """
+    # Imported here, since the status command hashes no files.
+    import hashlib
+
+    return Fingerprint(os.path.abspath(file_name), file_stat.st_mtime_ns,
+                       file_stat.st_size, hashlib.sha1(data).hexdigest())
+
+
+def default_cache_folder(data_folder: str) -> str:
+    """Return the cache folder used for a data folder.
+    :param data_folder:  The data folder holding the month files.
+    """
+    import hashlib
+
+    cache_home = os.environ.get("XDG_CACHE_HOME",
+                                os.path.expanduser("~/.cache"))
+
+    folder_key = hashlib.sha1(
+        os.path.abspath(data_folder).encode('utf-8')).hexdigest()[:12]
+
+    return os.path.join(cache_home, "chrono", folder_key)
+
+
+def folder_snapshot(folder: str) -> Dict[str, tuple]:
+    """Return modification time and size of the data files in a folder, by
+    name.
+    """
+    snapshot = {}
+    with os.scandir(folder) as entries:
+        for entry in entries:
+            if ((entry.name in (USER_FILE, JOURNAL_FILE) or
+                 YEAR_FILE.match(entry.name) or
+                 MONTH_FILE.match(entry.name)) and entry.is_file()):
+                entry_stat = entry.stat()
+                snapshot[entry.name] = (entry_stat.st_mtime_ns,
+                                        entry_stat.st_size)
+    return snapshot
+
+
+class MonthCache(object):
+    """Persistent cache of tokenized month files.
+
+    Every month file gets a cache entry holding the file's fingerprint
+    (path, modification time, size and content hash) and the day records
+    parsed from it. An entry is trusted as long as modification time and size
+    are unchanged. If they differ the content hash decides, so touching a
+    file without editing it doesn't force a new parse.
+
+    The entries of all months are kept in one file, read on first use and
+    written by save. Loading a data folder reads one cache file and stats
+    the month files. Days are still built from the records, see
+    Month.load_records.
+    """
+    def __init__(self, cache_folder: str):
+        self.cache_folder = cache_folder
+        self.file_name = os.path.join(cache_folder, "months.pickle")
+        self.entries = None
+        self.changed = False
+
+    def load(self, file_name: str) -> Optional[list]:
+        """Return cached records for a month file or None if the cache entry
+        is missing or stale.
+        """
+        entry = self._entries().get(_month(file_name))
+        if (entry is None or
+                entry["fingerprint"].path != os.path.abspath(file_name)):
+            return None
+
+        fingerprint = file_fingerprint(file_name, entry["fingerprint"])
+        if fingerprint.digest != entry["fingerprint"].digest:
+            return None
+        if fingerprint != entry["fingerprint"]:
+            entry["fingerprint"] = fingerprint
+            self.changed = True
+        return entry["records"]
+
+    def store(self, file_name: str, records: list,
+              fingerprint: Fingerprint):
+        """Store records for a month file. The entry is written by save.
+        :param fingerprint:  Fingerprint of the content the records were
+                             parsed from.
+        """
+        self._entries()[_month(file_name)] = {"fingerprint": fingerprint,
+                                              "records": records}
+        self.changed = True
+
+    def save(self):
+        if not self.changed:
+            return
+        import pickle
+
+        os.makedirs(self.cache_folder, exist_ok=True)
+        temp_path = "{}.{}.tmp".format(self.file_name, os.getpid())
+        with open(temp_path, "wb") as entry_file:
+            pickle.dump({"version": CACHE_VERSION, "months": self.entries},
+                        entry_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.file_name)
+        self.changed = False
+
+    def _entries(self) -> dict:
+        if self.entries is None:
+            self.entries = self._read_entries()
+        return self.entries
+
+    def _read_entries(self) -> dict:
+        # Imported here, since the status command reads no cache entries.
+        import pickle
+
+        try:
+            with open(self.file_name, "rb") as entry_file:
+                content = pickle.load(entry_file)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError,
+                ImportError, IndexError, TypeError, ValueError):
+            return {}
+
+        if (not isinstance(content, dict) or
+                content.get("version") != CACHE_VERSION):
+            return {}
+        return content["months"]
+
+
+def _month(file_name: str) -> str:
+    month, _ = os.path.splitext(os.path.basename(file_name))
+    return month
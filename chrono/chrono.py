@@ -4,8 +4,13 @@
        chrono [options] week [<week> [<year>]]
        chrono [options] report (start | end) [<time>]
        chrono [options] report (lunch | deviation) <time>
-       chrono [options] flex
+       chrono [options] report --batch=<file>
+       chrono [options] report (vacation | sick) <period>
+       chrono [options] flex [<date>]
+       chrono [options] flex <from> <to>
        chrono [options] vacation
+       chrono [options] status
+       chrono [options] compact
        chrono [options] stats (start | end) [-w | -m | -y] [--hist [--height=<height>][--bin-width=<width>]]
        chrono [options] user
        chrono [options] edit [<month>]
@@ -16,30 +21,161 @@ Options:
 --bin-width=<width>           Width in minutes of each bin. [default: 5]
 --hist                        Print histogram
 --set-data-folder=<folder>
+--workers=<n>                 Number of processes parsing month files.
+                              [default: 1]
+--no-cache                    Parse all month files and sum all days
+                              instead of reusing cached results.
+--no-daemon                   Run the command in this process even if
+                              chronod is running.
 -v, --verbose
 """
 import os
 import sys
-from glob import glob
 import time
 import datetime
-import locale
-import statistics as st
 import configparser
-import subprocess
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, List, Optional
 
-import math
-from docopt import docopt
-
-from chrono.parser import Parser
-from chrono import writer
 from chrono.time_utilities import pretty_timedelta
 from chrono import errors
 
-
-def main():
+if TYPE_CHECKING:
+    from chrono.parser import Parser
+
+
+def main(argv: Optional[List[str]] = None):
+    # Modules only some commands need are imported where they're used, so
+    # that quick commands like status start fast.
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv == ["status"] and print_status():
+        return
+
+    import locale
+    from docopt import docopt
+    from chrono import daemon
+
+    arguments = docopt(__doc__, argv=argv)
+    # The daemon can't read this process' standard input or relative paths.
+    if (not arguments['--no-daemon'] and not arguments['edit'] and
+            not arguments['--set-data-folder'] and not arguments['--batch']):
+        status = daemon.forward(argv)
+        if status is not None:
+            sys.exit(status)
     locale.setlocale(locale.LC_ALL, '')
-    arguments = docopt(__doc__)
+    run(arguments)
+
+
+class Scope(Enum):
+    """What a command needs parsed from the data folder."""
+    user = 1
+    current_month = 2
+    current_year = 3
+    history = 4
+
+
+def command_scope(arguments: dict) -> Scope:
+    """Return what a parsed command line needs parsed. Commands printing
+    totals, like flex or vacation, need the whole history.
+    """
+    date = arguments['<date>']
+    if arguments['user'] or (arguments['edit'] and arguments['<month>']):
+        return Scope.user
+    elif (arguments['today'] or arguments['edit'] or
+          (arguments['day'] and (date is None or "-" not in date)) or
+          (arguments['report'] and not arguments['start'] and
+           not arguments['--batch'])):
+        return Scope.current_month
+    elif ((arguments['day'] and date.count("-") == 1) or
+          (arguments['year'] and date is None) or
+          (arguments['report'] and not arguments['--batch']) or
+          (arguments['stats'] and (arguments['-m'] or arguments['-y']))):
+        return Scope.current_year
+    else:
+        return Scope.history
+
+
+def print_status() -> bool:
+    """Print the status from the current month file and the balance summary
+    in the cache folder, see chrono.status.
+    :returns:  False if the data folder must be parsed to get the status.
+    """
+    from chrono import status
+
+    config = get_config(os.path.expanduser("~/.chrono"))
+    if 'Data' not in config['Paths']:
+        return False
+    data_folder = os.path.expanduser(config['Paths']['Data'])
+    status_line = status.read_status(
+        data_folder, get_cache_folder(data_folder, config))
+    if status_line is None:
+        return False
+    print(status_line)
+    return True
+
+
+def get_cache_folder(data_folder: str,
+                     config: configparser.ConfigParser) -> str:
+    if 'Cache' in config['Paths']:
+        return os.path.expanduser(config['Paths']['Cache'])
+    from chrono.cache import default_cache_folder
+
+    return default_cache_folder(data_folder)
+
+
+def open_cache(data_folder: str, config: configparser.ConfigParser,
+               arguments: dict) -> tuple:
+    """Return the month cache and ledger of a data folder, or None and None
+    if --no-cache is given.
+    """
+    from chrono.cache import MonthCache
+    from chrono.ledger import Ledger
+
+    if arguments['--no-cache']:
+        return None, None
+    cache_folder = get_cache_folder(data_folder, config)
+    return (MonthCache(cache_folder),
+            Ledger(os.path.join(cache_folder, "ledger.json")))
+
+
+def load_parser(data_folder: str, config: configparser.ConfigParser,
+                arguments: dict) -> "Parser":
+    """Parse what the command needs from a data folder, see command_scope,
+    using the month cache and ledger unless --no-cache is given.
+    """
+    from glob import glob
+    from chrono.parser import Parser
+
+    parser = Parser()
+    scope = command_scope(arguments)
+    if scope is Scope.user:
+        parser.parse_user_file(os.path.join(data_folder, "user.cfg"))
+        return parser
+
+    first_month = None
+    if scope is not Scope.history:
+        month_files = sorted(glob(os.path.join(
+            data_folder, "[1-2][0-9][0-9][0-9]-[0-1][0-9].txt")))
+        if month_files:
+            first_month = os.path.basename(month_files[-1])[:7]
+            if scope is Scope.current_year:
+                first_month = "{}-01".format(first_month[:4])
+    cache, ledger = open_cache(data_folder, config, arguments)
+    parser.parse_data_folder(data_folder, cache=cache, ledger=ledger,
+                             workers=int(arguments['--workers']),
+                             first_month=first_month)
+    return parser
+
+
+def run(arguments: dict,
+        load_parser: Callable[[str, configparser.ConfigParser, dict],
+                              "Parser"] = load_parser):
+    """Run a parsed command line.
+    :param load_parser:  Function returning the parsed data folder, given
+                         the data folder, the configuration and the
+                         arguments.
+    """
     if arguments['--verbose']:
         print(arguments)
     config_path = os.path.expanduser("~/.chrono")
@@ -60,23 +196,11 @@ def main():
         else:
             raise ValueError("Couln't find folder '{}'.".format(data_folder))
     else:
-        data_folder = os.path.expanduser(config['Paths']['Data'])
-        parser = Parser()
-        parser.parse_user_file(os.path.join(data_folder, "user.cfg"))
-        year_files = [f[:4] for f in os.listdir(data_folder)
-                      if f.endswith(".cfg") and len(os.path.basename(f)) == 8]
-
-        month_files = sorted(glob(os.path.join(
-            data_folder, "[1-2][0-9][0-9][0-9]-[0-1][0-9].txt")))
-
-        for month_file in month_files:
-            year = os.path.basename(month_file)[:4]
-            if year in year_files:
-                parser.parse_year_file(
-                    os.path.join(data_folder, "{}.cfg".format(year)))
+        from chrono import engine
 
-                year_files.remove(year)
-            parser.parse_month_file(month_file)
+        engine.select(config.get('Engine', 'Name', fallback='python'))
+        data_folder = os.path.expanduser(config['Paths']['Data'])
+        parser = load_parser(data_folder, config, arguments)
 
         # Handling CLI commands
         if arguments['today'] or arguments['day']:
@@ -85,38 +209,25 @@ def main():
             else:
                 date = arguments['<date>'].split("-")
                 if len(date) == 1:
-                    day = int(date[0])
-                    selected_day = [d for d in parser.user.current_month().days
-                                    if d.date.day == day][0]
-
+                    date_string = "{}-{:02d}-{:02d}".format(
+                        parser.user.current_month().year,
+                        parser.user.current_month().month, int(date[0]))
                 elif len(date) == 2:
-                    month, day = date
-                    month = int(month)
-                    day = int(day)
-                    selected_month = [
-                        m for m in parser.user.current_year().months
-                        if m.month == month][0]
-
-                    selected_day = [d for d in selected_month.days
-                                    if d.date.day == day][0]
-
+                    date_string = "{}-{:02d}-{:02d}".format(
+                        parser.user.current_year().year, int(date[0]),
+                        int(date[1]))
                 elif len(date) == 3:
-                    year, month, day = date
-                    year = int(year)
-                    month = int(month)
-                    day = int(day)
-                    selected_year = [y for y in parser.user.years
-                                     if y.year == year][0]
-
-                    selected_month = [m for m in selected_year.months
-                                      if m.month == month][0]
-
-                    selected_day = [d for d in selected_month.days
-                                    if d.date.day == day][0]
+                    date_string = "{:04d}-{:02d}-{:02d}".format(
+                        *(int(d) for d in date))
                 else:
                     raise errors.BadDateError(
                         "Date string must have between 1 and 3 elements.")
 
+                selected_day = parser.user.get_day(date_string)
+                if selected_day is None:
+                    raise errors.BadDateError(
+                        "No day reported for {}.".format(date_string))
+
             print(selected_day)
         elif arguments['week']:
             selected_week = parser.user.current_week()
@@ -133,11 +244,10 @@ def main():
                 else:
                     year = parser.user.current_year().year
                     month = int(arguments['<date>'])
-                selected_year = [y for y in parser.user.years
-                                 if y.year == year][0]
-
-                selected_month = [m for m in selected_year.months
-                                  if m.month == month][0]
+                selected_month = parser.user.get_month(year, month)
+                if selected_month is None:
+                    raise errors.BadDateError(
+                        "No days reported for {}-{:02d}.".format(year, month))
             else:
                 selected_month = parser.user.years[-1].months[-1]
             print(selected_month)
@@ -146,12 +256,30 @@ def main():
 
         elif arguments['year']:
             if arguments['<date>']:
-                selected_year = [year for year in parser.user.years
-                                 if str(year.year) == arguments['<date>']][0]
+                selected_year = parser.user.get_year(int(arguments['<date>']))
+                if selected_year is None:
+                    raise errors.BadDateError(
+                        "No days reported for {}.".format(arguments['<date>']))
             else:
                 selected_year = parser.user.years[-1]
             for month in selected_year.months:
                 print(month)
+        elif arguments['report'] and arguments['--batch']:
+            report_batch(
+                parser, data_folder, arguments['--batch'],
+                fsync=config.getboolean('Report', 'Fsync', fallback=False))
+        elif arguments['report'] and (arguments['vacation'] or
+                                      arguments['sick']):
+            from chrono.day import DayType
+
+            first_date, _, last_date = arguments['<period>'].partition("..")
+            months = parser.user.add_days_bulk(
+                first_date, last_date or first_date,
+                DayType.vacation if arguments['vacation'] else
+                DayType.sick_day)
+            write_months(
+                data_folder, months,
+                fsync=config.getboolean('Report', 'Fsync', fallback=False))
         elif arguments['report']:
             if arguments['start']:
                 start_time = (arguments['<time>'] or
@@ -168,11 +296,29 @@ def main():
                 parser.user.today().report_lunch_duration(arguments['<time>'])
             elif arguments["deviation"]:
                 parser.user.today().report_deviation(arguments['<time>'])
+
             today = parser.user.today()
-            month_file = os.path.join(
-                data_folder, "{}.txt".format(today.date.strftime("%Y-%m")))
+            fsync = config.getboolean('Report', 'Fsync', fallback=False)
+            if config.getboolean('Report', 'Journal', fallback=False):
+                from chrono import journal
+
+                field = next(field for field in ("start", "end", "lunch",
+                                                 "deviation")
+                             if arguments[field])
+                journal.append_event(data_folder,
+                                     journal.report_event(today, field),
+                                     fsync=fsync)
+            else:
+                from chrono import writer
 
-            writer.write_line(month_file, today.export())
+                month_file = os.path.join(
+                    data_folder,
+                    "{}.txt".format(today.date.strftime("%Y-%m")))
+                writer.write_line(month_file, today.export(), fsync=fsync)
+        elif arguments['compact']:
+            parser.compact_journal(
+                data_folder,
+                fsync=config.getboolean('Report', 'Fsync', fallback=False))
         elif arguments['user']:
             print()
             print(parser.user)
@@ -200,9 +346,32 @@ def main():
                     bin_width=int(arguments['--bin-width']),
                     height=int(arguments['--height']))
 
+        elif arguments['flex']:
+            if arguments['<from>']:
+                print("Flextime {} - {}: {}".format(
+                    arguments['<from>'], arguments['<to>'], pretty_timedelta(
+                        parser.user.flextime_between(arguments['<from>'],
+                                                     arguments['<to>']),
+                        signed=True)))
+            elif arguments['<date>']:
+                print("Flextime at {}: {}".format(
+                    arguments['<date>'], pretty_timedelta(
+                        parser.user.flextime_balance(arguments['<date>']),
+                        signed=True)))
+            else:
+                print("Total flextime: {}".format(pretty_timedelta(
+                    parser.user.calculate_flextime(), signed=True)))
         elif arguments['vacation']:
             print("Vacation left: {} / {}".format(
                 parser.user.vacation_left(), parser.user.payed_vacation))
+        elif arguments['status']:
+            from chrono import status
+
+            print(status.status_line(parser.user.today(),
+                                     parser.user.calculate_flextime()))
+            if not arguments['--no-cache']:
+                status.write_summary(parser.user, data_folder,
+                                     get_cache_folder(data_folder, config))
         elif arguments['edit']:
             if 'Editor' in config['Paths']:
                 if arguments['<month>']:
@@ -216,6 +385,8 @@ def main():
                     raise errors.BadDateError(
                         "Couldn't find month file '{}'".format(month_file))
 
+                import subprocess
+
                 command = [config['Paths']['Editor'], month_file]
                 subprocess.call(command)
             else:
@@ -225,6 +396,48 @@ def main():
         write_config(config, config_path)
 
 
+def report_batch(parser: "Parser", data_folder: str, file_name: str,
+                 fsync: bool = False):
+    """Report month file lines from a file, or standard input if the file
+    name is "-". Lines of other months than the current one are given
+    under YYYY-MM headers, like in an archive file. All lines are reported
+    before any month file is written, and each month file is written once.
+    """
+    from chrono.tokenizer import tokenize_months_string
+
+    if file_name == "-":
+        string = sys.stdin.read()
+    else:
+        with open(file_name, "r", encoding='utf-8') as batch_file:
+            string = batch_file.read()
+    current_month = parser.user.current_month()
+    if current_month is None:
+        month_string = parser.user.next_workday()[:7]
+    else:
+        month_string = "{}-{:02d}".format(current_month.year,
+                                          current_month.month)
+
+    months = []
+    for month_string, records in tokenize_months_string(string,
+                                                        month_string):
+        month = parser.report_records(records, month_string)
+        if month is not None:
+            months.append(month)
+    write_months(data_folder, months, fsync=fsync)
+
+
+def write_months(data_folder: str, months: list, fsync: bool = False):
+    """Write the days of months to their month files, each file once."""
+    from chrono import writer
+
+    month_files = {}
+    for month in months:
+        month_files["{}-{:02d}.txt".format(month.year, month.month)] = month
+    for file_name, month in sorted(month_files.items()):
+        writer.write_month(os.path.join(data_folder, file_name),
+                           [day.export() for day in month.days], fsync=fsync)
+
+
 def print_end_statistics(time_period, histogram=False, bin_width=5, height=20):
     evenings = [
         datetime.timedelta(hours=day.end_time.hour, minutes=day.end_time.minute)
@@ -256,6 +469,8 @@ def print_start_statistics(time_period, histogram=False, bin_width=5, height=20)
 
 
 def statistics_for_time_points(time_points: list, header: str) -> str:
+    import statistics as st
+
     time_in_seconds = [t.total_seconds() for t in time_points]
 
     mean_time = time.strftime('%H:%M', time.gmtime(st.mean(time_in_seconds)))
@@ -289,6 +504,8 @@ def statistics_for_time_points(time_points: list, header: str) -> str:
 
 
 def draw_histogram(time_points: list, bin_width: int = 5, height: int = 20, staple_character: str = '▌') -> str:
+    import math
+
     values = [t.total_seconds() // 60 for t in time_points]
 
     start_time = math.floor(min(time_points).seconds / 3600)
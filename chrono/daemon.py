@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""Usage: chronod [options]
+
+Keep the parsed data folder in memory and run chrono commands sent by the
+chrono command over a Unix domain socket.
+
+Options:
+--socket=<path>               Socket to listen on. Defaults to chrono.sock
+                              in $XDG_RUNTIME_DIR, or a per user socket in
+                              the temporary folder.
+--workers=<n>                 Number of processes parsing month files.
+                              [default: 1]
+--no-cache                    Parse all month files and sum all days
+                              instead of reusing cached results.
+"""
+from contextlib import redirect_stderr, redirect_stdout
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import traceback
+from typing import List, Optional
+
+FORWARD_TIMEOUT = 30
+
+
+def default_socket_path() -> str:
+    runtime_folder = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_folder:
+        return os.path.join(runtime_folder, "chrono.sock")
+    return os.path.join(tempfile.gettempdir(),
+                        "chrono-{}.sock".format(os.getuid()))
+
+
+def forward(argv: List[str], socket_path: Optional[str] = None
+            ) -> Optional[int]:
+    """Run a command line in a running daemon and print its output.
+    :returns:  The command's exit status, or None if no daemon is running
+               or it didn't reply.
+    """
+    socket_path = socket_path or default_socket_path()
+    if not os.path.exists(socket_path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(FORWARD_TIMEOUT)
+    try:
+        client.connect(socket_path)
+    except OSError:
+        client.close()
+        return None
+
+    with client:
+        try:
+            client.sendall(
+                json.dumps({"argv": argv}).encode('utf-8') + b"\n")
+            client.shutdown(socket.SHUT_WR)
+            with client.makefile("rb") as response_file:
+                response = json.loads(response_file.read().decode('utf-8'))
+        except (OSError, ValueError):
+            # The daemon stopped or timed out before it replied.
+            return None
+    sys.stdout.write(response["output"])
+    sys.stdout.flush()
+    return response["status"]
+
+
+class Daemon(socketserver.UnixStreamServer):
+    """Server running chrono commands on a parsed data folder kept in
+    memory.
+
+    Changes to the data folder are applied before each command, see
+    Watcher. The data folder is parsed again when the configured data
+    folder changes.
+    """
+    def __init__(self, socket_path: str, workers: int = 1,
+                 use_cache: bool = True):
+        self.socket_path = socket_path
+        self.workers = workers
+        self.use_cache = use_cache
+        self.watcher = None
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(socket_path, CommandHandler)
+        finally:
+            os.umask(old_umask)
+
+    def load_parser(self, data_folder: str, config, arguments: dict):
+        from chrono import chrono
+        from chrono.watcher import Watcher
+
+        if self.watcher is None or data_folder != self.watcher.data_folder:
+            self.watcher = None
+            cache, ledger = chrono.open_cache(
+                data_folder, config,
+                dict(arguments, **{'--no-cache': not self.use_cache}))
+            self.watcher = Watcher(data_folder, cache=cache, ledger=ledger,
+                                   workers=self.workers)
+        else:
+            self.watcher.poll()
+        return self.watcher.parser
+
+    def execute(self, argv: List[str]) -> tuple:
+        """Run a command line.
+        :returns:  The command's output and exit status.
+        """
+        from docopt import docopt
+        from chrono import chrono
+
+        output = io.StringIO()
+        status = 0
+        with redirect_stdout(output), redirect_stderr(output):
+            try:
+                arguments = docopt(chrono.__doc__, argv=argv)
+                chrono.run(arguments, load_parser=self.load_parser)
+            except SystemExit as exit_error:
+                if isinstance(exit_error.code, int):
+                    status = exit_error.code
+                elif exit_error.code is not None:
+                    print(exit_error.code)
+                    status = 1
+            except Exception:
+                traceback.print_exc()
+                status = 1
+                # A failed command may have changed the model half way.
+                self.watcher = None
+        # Files written by the command are read again before the next
+        # command, see Watcher.poll.
+        return output.getvalue(), status
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        request = json.loads(self.rfile.read().decode('utf-8'))
+        output, status = self.server.execute(request["argv"])
+        self.wfile.write(json.dumps(
+            {"output": output, "status": status}).encode('utf-8'))
+
+
+def main():
+    import locale
+    from docopt import docopt
+
+    locale.setlocale(locale.LC_ALL, '')
+    arguments = docopt(__doc__)
+    signal.signal(signal.SIGTERM, lambda signal_number, frame: sys.exit(0))
+    daemon = Daemon(arguments['--socket'] or default_socket_path(),
+                    workers=int(arguments['--workers']),
+                    use_cache=not arguments['--no-cache'])
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.server_close()
+
+
+if __name__ == '__main__':
+    main()
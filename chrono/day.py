@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
 
-from datetime import datetime, timedelta
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, time, timedelta
 from enum import Enum
 import re
 from typing import Optional
+import weakref
 
 from chrono import errors
-from chrono.time_utilities import pretty_timedelta
+from chrono.time_utilities import pretty_minutes, pretty_timedelta
 
 
 STANDARD_HOURS = 8
 
+# Marks an unreported time in the minute columns of a DayStore.
+MISSING = -32768
+
 
 class DayType(Enum):
     working_day = 1
@@ -19,36 +25,299 @@ class DayType(Enum):
     vacation = 4
     sick_day = 5
 
-    
+
+_DAY_TYPES = (None,) + tuple(DayType)
+_WORKING_DAY = DayType.working_day.value
+_WEEKEND = DayType.weekend.value
+
+
+def parse_date(date_string: str) -> date:
+    try:
+        return datetime.strptime(date_string, "%Y-%m-%d").date()
+    except ValueError:
+        raise errors.BadDateError("Bad date string: \"{}\"".format(
+            date_string))
+    except TypeError:
+        raise TypeError("Given date must be a string.")
+
+
+class DayStore(object):
+    """Column store of days.
+
+    Each day is a row with one array per field: date ordinal, day type
+    (DayType value), start and end in minutes since midnight, lunch and
+    deviation in minutes, and comment and info as ids into a table of
+    interned texts. Unreported times are MISSING. Rows are found by date
+    ordinal through a hash index.
+
+    The number of leading rows whose times and day types haven't changed
+    since it was last set is kept in unchanged, so that indexes built over
+    the rows only have to update the rows after it.
+
+    Months with a checkpoint are kept by their first row in checkpoints.
+    Touching one of their rows drops the checkpoint, see Month.checkpoint.
+    """
+    __slots__ = ('ordinals', 'day_types', 'starts', 'lunches', 'ends',
+                 'deviations', 'comments', 'infos', 'texts', '_text_ids',
+                 'views', 'unchanged', 'ordinal_rows', 'checkpoints',
+                 '_checkpoint_rows')
+
+    def __init__(self):
+        self.ordinals = array('i')
+        self.day_types = array('b')
+        self.starts = array('h')
+        self.lunches = array('h')
+        self.ends = array('h')
+        self.deviations = array('h')
+        self.comments = array('i')
+        self.infos = array('i')
+        self.texts = [None]
+        self._text_ids = {None: 0}
+        self.views = weakref.WeakValueDictionary()
+        self.unchanged = 0
+        self.ordinal_rows = {}
+        self.checkpoints = {}
+        self._checkpoint_rows = []
+
+    def __len__(self):
+        return len(self.ordinals)
+
+    def append_row(self, ordinal: int, day_type: DayType,
+                   start: Optional[int], lunch: Optional[int],
+                   end: Optional[int], deviation: Optional[int],
+                   comment: Optional[str], info: Optional[str]) -> int:
+        """Append a day with all fields given and return its row. Times
+        are minutes, None for unreported.
+        """
+        self.ordinal_rows[ordinal] = len(self.ordinals)
+        self.ordinals.append(ordinal)
+        self.day_types.append(day_type.value)
+        self.starts.append(MISSING if start is None else start)
+        self.lunches.append(MISSING if lunch is None else lunch)
+        self.ends.append(MISSING if end is None else end)
+        self.deviations.append(deviation or 0)
+        self.comments.append(self.text_id(comment))
+        self.infos.append(self.text_id(info))
+        return len(self.ordinals) - 1
+
+    def find(self, ordinal: int) -> Optional[int]:
+        """Return the row of a date ordinal or None if it isn't stored."""
+        return self.ordinal_rows.get(ordinal)
+
+    def touch(self, row: int):
+        """Mark a row as changed, see DayStore.unchanged, and drop the
+        checkpoint of the month of the row.
+        """
+        if row < self.unchanged:
+            self.unchanged = row
+        if self._checkpoint_rows:
+            index = bisect_right(self._checkpoint_rows, row) - 1
+            if index >= 0:
+                month = self.checkpoints[self._checkpoint_rows[index]]
+                if row in month.rows():
+                    month.checkpoint = None
+
+    def watch_checkpoint(self, month):
+        """Keep a month with a checkpoint, see DayStore.checkpoints."""
+        first = month.rows().start
+        if first not in self.checkpoints:
+            insort(self._checkpoint_rows, first)
+        self.checkpoints[first] = month
+
+    def forget_checkpoint(self, month):
+        first = month.rows().start
+        if self.checkpoints.get(first) is month:
+            del self.checkpoints[first]
+            self._checkpoint_rows.remove(first)
+
+    def truncate(self, row: int):
+        """Remove the rows from row onwards. Views of removed rows are
+        forgotten, and must not be used after rows are added again.
+        """
+        for ordinal in self.ordinals[row:]:
+            del self.ordinal_rows[ordinal]
+        for column in (self.ordinals, self.day_types, self.starts,
+                       self.lunches, self.ends, self.deviations,
+                       self.comments, self.infos):
+            del column[row:]
+        for view_row in [r for r in self.views.keys() if r >= row]:
+            del self.views[view_row]
+        self.touch(row)
+        index = bisect_left(self._checkpoint_rows, row)
+        for first in self._checkpoint_rows[index:]:
+            del self.checkpoints[first]
+        del self._checkpoint_rows[index:]
+
+    def append(self, ordinal: int) -> int:
+        """Append an unreported day and return its row."""
+        self.ordinal_rows[ordinal] = len(self.ordinals)
+        self.ordinals.append(ordinal)
+        if (ordinal - 1) % 7 < 5:
+            self.day_types.append(_WORKING_DAY)
+        else:
+            self.day_types.append(_WEEKEND)
+        self.starts.append(MISSING)
+        self.lunches.append(MISSING)
+        self.ends.append(MISSING)
+        self.deviations.append(0)
+        self.comments.append(0)
+        self.infos.append(0)
+        return len(self.ordinals) - 1
+
+    def text_id(self, text: Optional[str]) -> int:
+        text_id = self._text_ids.get(text)
+        if text_id is None:
+            text_id = len(self.texts)
+            self.texts.append(text)
+            self._text_ids[text] = text_id
+        return text_id
+
+    def complete(self, row: int) -> bool:
+        return (self.day_types[row] != _WORKING_DAY or
+                self.starts[row] != MISSING and
+                self.lunches[row] != MISSING and
+                self.ends[row] != MISSING)
+
+    def worked_minutes(self, row: int) -> int:
+        start = self.starts[row]
+        lunch = self.lunches[row]
+        end = self.ends[row]
+        if start == MISSING or lunch == MISSING or end == MISSING:
+            return 0
+        return end - start - lunch - self.deviations[row]
+
+    def flextime_minutes(self, first: int, stop: int) -> int:
+        """Sum flextime in minutes for the rows first to stop."""
+        expected = STANDARD_HOURS * 60
+        flextime = 0
+        for day_type, start, lunch, end, deviation in zip(
+                self.day_types[first:stop], self.starts[first:stop],
+                self.lunches[first:stop], self.ends[first:stop],
+                self.deviations[first:stop]):
+            reported = (start != MISSING and lunch != MISSING and
+                        end != MISSING)
+            if reported:
+                flextime += end - start - lunch - deviation
+                if day_type == _WORKING_DAY:
+                    flextime -= expected
+        return flextime
+
+    def count_type(self, first: int, stop: int, day_type: DayType) -> int:
+        """Count the rows first to stop with a day type."""
+        return self.day_types[first:stop].count(day_type.value)
+
+
 class Day(object):
-    def __init__(self, date_string: str):
-        try:
-            self.date = datetime.strptime(
-                date_string, "%Y-%m-%d").date()
+    """A view of a row in a DayStore.
 
-        except ValueError:
-            raise errors.BadDateError("Bad date string: \"{}\"".format(
-                date_string))
-        except TypeError:
-            raise TypeError("Given date must be a string.")
+    Days created directly get a store of their own. Days of a month, year
+    or user are views of the user's store, see Day.from_row.
+    """
+    __slots__ = ('_store', '_row', '__weakref__')
+
+    def __init__(self, date_string: str):
+        self._store = DayStore()
+        self._row = self._store.append(parse_date(date_string).toordinal())
 
-        self.start_time = None
-        self.lunch_duration = None
-        self.end_time = None
-        self.comment = None
-        self.info = None
-        self.deviation = timedelta()
+    @classmethod
+    def from_ordinal(cls, ordinal: int) -> "Day":
+        """Create a day from a proleptic Gregorian ordinal (see
+        datetime.date.toordinal).
+        """
+        store = DayStore()
+        return cls.from_row(store, store.append(ordinal))
 
-        if self.date.isoweekday() < 6:
-            self.day_type = DayType.working_day
-        else:
-            self.day_type = DayType.weekend
+    @classmethod
+    def from_row(cls, store: DayStore, row: int) -> "Day":
+        """Return the day of a store row. The same Day object is returned
+        for a row as long as it is referenced.
+        """
+        view = store.views.get(row)
+        if view is None:
+            view = cls.__new__(cls)
+            view._store = store
+            view._row = row
+            store.views[row] = view
+        return view
+
+    @property
+    def ordinal(self) -> int:
+        return self._store.ordinals[self._row]
+
+    @property
+    def date(self) -> date:
+        return date.fromordinal(self._store.ordinals[self._row])
+
+    @property
+    def day_type(self) -> DayType:
+        return _DAY_TYPES[self._store.day_types[self._row]]
+
+    @day_type.setter
+    def day_type(self, day_type: DayType):
+        self._set(self._store.day_types, day_type.value)
+
+    @property
+    def comment(self) -> Optional[str]:
+        return self._store.texts[self._store.comments[self._row]]
+
+    @comment.setter
+    def comment(self, comment: Optional[str]):
+        self._store.comments[self._row] = self._store.text_id(comment)
+
+    @property
+    def info(self) -> Optional[str]:
+        return self._store.texts[self._store.infos[self._row]]
+
+    @info.setter
+    def info(self, info: Optional[str]):
+        self._store.infos[self._row] = self._store.text_id(info)
+
+    @property
+    def start_time(self) -> Optional[datetime]:
+        return self._datetime(self._store.starts[self._row])
+
+    @start_time.setter
+    def start_time(self, start_time: Optional[datetime]):
+        self._set(self._store.starts, _datetime_to_minutes(start_time))
+
+    @property
+    def lunch_duration(self) -> Optional[timedelta]:
+        lunch = self._store.lunches[self._row]
+        if lunch == MISSING:
+            return None
+        return timedelta(minutes=lunch)
+
+    @lunch_duration.setter
+    def lunch_duration(self, lunch_duration: Optional[timedelta]):
+        self._set(self._store.lunches, _timedelta_to_minutes(lunch_duration))
+
+    @property
+    def end_time(self) -> Optional[datetime]:
+        return self._datetime(self._store.ends[self._row])
+
+    @end_time.setter
+    def end_time(self, end_time: Optional[datetime]):
+        self._set(self._store.ends, _datetime_to_minutes(end_time))
+
+    @property
+    def deviation(self) -> timedelta:
+        return timedelta(minutes=self._store.deviations[self._row])
+
+    @deviation.setter
+    def deviation(self, deviation: timedelta):
+        self._set(self._store.deviations, _timedelta_to_minutes(deviation))
+
+    def _set(self, column: array, value: int):
+        column[self._row] = value
+        self._store.touch(self._row)
+
+    def _datetime(self, minutes: int) -> Optional[datetime]:
+        if minutes == MISSING:
+            return None
+        return datetime.combine(self.date, time(minutes // 60, minutes % 60))
 
     def report_start_time(self, start_time: str):
-        if self.start_time is not None:
-            raise errors.ReportError("Date {} allready has a start time."
-                                     .format(self.date.isoformat()))
-
+        self._check_start_time()
         try:
             start_time = datetime.strptime(
                 start_time, "%H:%M").time()
@@ -56,38 +325,53 @@ class Day(object):
             raise errors.BadTimeError(
                 "Bad start time: \"{}\".".format(start_time))
 
-        self.start_time = datetime.combine(self.date, start_time)
+        self._set(self._store.starts, start_time.hour * 60 + start_time.minute)
 
-    def report_lunch_duration(self, lunch_duration: str):
-        if self.start_time is None:
-            raise errors.ReportError(
-                "Date {} must have a start time before a lunch duration can "
-                "be reported.".format(self.date.isoformat()))
+    def report_start_minutes(self, minutes: int):
+        """Report start time as minutes since midnight."""
+        self._check_start_time()
+        if not 0 <= minutes < 24 * 60:
+            raise errors.BadTimeError("Bad start time: \"{}\".".format(
+                pretty_minutes(minutes)))
+        self._set(self._store.starts, minutes)
 
-        if self.lunch_duration is not None:
-            raise errors.ReportError("Date {} allready has a lunch duration."
+    def _check_start_time(self):
+        if self._store.starts[self._row] != MISSING:
+            raise errors.ReportError("Date {} allready has a start time."
                                      .format(self.date.isoformat()))
 
+    def report_lunch_duration(self, lunch_duration: str):
+        self._check_lunch_duration()
         match = re.match("^(\d{1,2})(?::(\d{2}))?$", lunch_duration)
         if match:
-            self.lunch_duration = timedelta(
-                hours=int(match.group(1)), minutes=int(match.group(2) or 0))
+            self._set(self._store.lunches,
+                      int(match.group(1)) * 60 + int(match.group(2) or 0))
         else:
             raise errors.ReportError(
                 "Bad lunch duration for date {}: '{}'".format(self.date,
                                                               lunch_duration))
 
-    def report_end_time(self, end_time: str):
-        if self.start_time is None:
+    def report_lunch_minutes(self, minutes: int):
+        """Report lunch duration in minutes."""
+        self._check_lunch_duration()
+        if minutes < 0:
             raise errors.ReportError(
-                "Date {} must have a start time before an end time can be "
-                "reported.".format(self.date.isoformat()))
+                "Bad lunch duration for date {}: '{}'".format(
+                    self.date, pretty_minutes(minutes)))
+        self._set(self._store.lunches, minutes)
 
-        if self.lunch_duration is None:
+    def _check_lunch_duration(self):
+        if self._store.starts[self._row] == MISSING:
             raise errors.ReportError(
-                "Date {} must have a lunch duration before an end time can be "
-                "reported.".format(self.date.isoformat()))
+                "Date {} must have a start time before a lunch duration can "
+                "be reported.".format(self.date.isoformat()))
 
+        if self._store.lunches[self._row] != MISSING:
+            raise errors.ReportError("Date {} allready has a lunch duration."
+                                     .format(self.date.isoformat()))
+
+    def report_end_time(self, end_time: str):
+        self._check_end_time()
         try:
             end_time = datetime.strptime(
                 end_time, "%H:%M").time()
@@ -96,17 +380,43 @@ class Day(object):
             raise TypeError("Given end time must be a string.")
         except ValueError:
             raise errors.BadTimeError("Bad end time: \"{}\"".format(end_time))
-        self.end_time = datetime.combine(self.date, end_time)
+        self._set(self._store.ends, end_time.hour * 60 + end_time.minute)
+
+    def report_end_minutes(self, minutes: int):
+        """Report end time as minutes since midnight."""
+        self._check_end_time()
+        if not 0 <= minutes < 24 * 60:
+            raise errors.BadTimeError("Bad end time: \"{}\"".format(
+                pretty_minutes(minutes)))
+        self._set(self._store.ends, minutes)
+
+    def _check_end_time(self):
+        if self._store.starts[self._row] == MISSING:
+            raise errors.ReportError(
+                "Date {} must have a start time before an end time can be "
+                "reported.".format(self.date.isoformat()))
+
+        if self._store.lunches[self._row] == MISSING:
+            raise errors.ReportError(
+                "Date {} must have a lunch duration before an end time can be "
+                "reported.".format(self.date.isoformat()))
 
     def report_deviation(self, deviation: str):
         match = re.match("^(\d{1,2})(?::(\d{2}))?$", deviation)
         if match:
-            self.deviation = timedelta(
-                hours=int(match.group(1)), minutes=int(match.group(2) or 0))
+            self._set(self._store.deviations,
+                      int(match.group(1)) * 60 + int(match.group(2) or 0))
         else:
             raise errors.ReportError("Bad deviation for date {}: '{}'".format(
                 self.date, deviation))
 
+    def report_deviation_minutes(self, minutes: int):
+        """Report deviation in minutes."""
+        if minutes < 0:
+            raise errors.ReportError("Bad deviation for date {}: '{}'".format(
+                self.date, pretty_minutes(minutes)))
+        self._set(self._store.deviations, minutes)
+
     def report(self, start: str, lunch: str, end: str):
         self.report_start_time(start)
         self.report_lunch_duration(lunch)
@@ -116,12 +426,7 @@ class Day(object):
         self.day_type = day_type
 
     def complete(self) -> bool:
-        complete_status = (self.day_type != DayType.working_day or
-                           self.start_time is not None and
-                           self.lunch_duration is not None and
-                           self.end_time is not None)
-
-        return complete_status
+        return self._store.complete(self._row)
 
     def expected_hours(self) -> timedelta:
         if self.day_type == DayType.working_day:
@@ -137,13 +442,8 @@ class Day(object):
         :raises: errors.ChronoError
         """
         if end_time is None:
-            if (self.start_time is None or self.lunch_duration is None or
-                    self.end_time is None):
-                total_hours = timedelta()
-            else:
-                total_hours = self.end_time - self.start_time
-                total_hours -= self.lunch_duration
-                total_hours -= self.deviation
+            total_hours = timedelta(
+                minutes=self._store.worked_minutes(self._row))
         else:
             if self.start_time is None or self.complete():
                 raise errors.ChronoError("Custom end times can only be tried "
@@ -155,11 +455,8 @@ class Day(object):
         return total_hours
 
     def calculate_flextime(self) -> timedelta:
-        if self.complete():
-            flextime = self.worked_hours() - self.expected_hours()
-        else:
-            flextime = timedelta()
-        return flextime
+        return timedelta(minutes=self._store.flextime_minutes(
+            self._row, self._row + 1))
 
     def get_info(self) -> str:
         info = self.info
@@ -182,21 +479,28 @@ class Day(object):
         return combined
 
     def export(self) -> str:
+        """Return the day as a month file line."""
+        start = self._store.starts[self._row]
+        lunch = self._store.lunches[self._row]
+        deviation = self._store.deviations[self._row]
+        end = self._store.ends[self._row]
         string = "{:>2}.".format(self.date.day)
-        if self.start_time:
-            string += " {}:{}".format(
-                self.start_time.hour, self.start_time.strftime('%M'))
-
-        if self.lunch_duration:
-            string += " {}".format(pretty_timedelta(self.lunch_duration))
-        if self.deviation:
-            string += " {}".format(
-                pretty_timedelta(self.deviation, signed=True))
-
-        if self.end_time:
-            string += " {}".format(self.end_time.strftime('%H:%M'))
+        if start != MISSING:
+            string += " {}".format(pretty_minutes(start))
+        if lunch != MISSING:
+            string += " {}".format(pretty_minutes(lunch))
+        if deviation:
+            string += " {}{}".format("+" if deviation > 0 else "",
+                                     pretty_minutes(deviation))
+
+        if end != MISSING:
+            string += " {:02d}:{:02d}".format(*divmod(end, 60))
+        if self.day_type == DayType.vacation:
+            string += " V"
+        elif self.day_type == DayType.sick_day:
+            string += " S"
         if self.comment:
-            string += " {}".format(self.comment)
+            string += " \"{}\"".format(self.comment)
         return string
 
     def list_str(self) -> str:
@@ -272,13 +576,25 @@ class Day(object):
         return string
 
     def __lt__(self, other):
-        return self.date < other.date
+        return self.ordinal < other.ordinal
 
     def __gt__(self, other):
-        return self.date > other.date
+        return self.ordinal > other.ordinal
 
     def __le__(self, other):
-        return self.date <= other.date
+        return self.ordinal <= other.ordinal
 
     def __ge__(self, other):
-        return self.date >= other.date
+        return self.ordinal >= other.ordinal
+
+
+def _datetime_to_minutes(time_point: Optional[datetime]) -> int:
+    if time_point is None:
+        return MISSING
+    return time_point.hour * 60 + time_point.minute
+
+
+def _timedelta_to_minutes(duration: Optional[timedelta]) -> int:
+    if duration is None:
+        return MISSING
+    return int(duration.total_seconds()) // 60
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Aggregation of flextime, vacation and sick days over periods of days.
+
+Months, years, users and archives pass their months to the functions in
+this module. Months with a checkpoint contribute their recorded totals and
+the rows of the other months are summed by the current engine. The Python
+engine is the default. The NumPy engine is used when configured, see
+select, since importing NumPy takes longer than summing a long history row
+by row. NumPy is imported when first summed with.
+"""
+
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Iterable, List, Optional
+
+from chrono import errors
+from chrono.day import DayStore, DayType, MISSING, STANDARD_HOURS
+
+_numpy = False
+
+
+def import_numpy():
+    """Return the numpy module, or None if NumPy isn't installed."""
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = None
+    return _numpy
+
+
+def __getattr__(name):
+    if name == "numpy":
+        return import_numpy()
+    raise AttributeError(
+        "module {!r} has no attribute {!r}".format(__name__, name))
+
+
+class PythonEngine(object):
+    """Sums the columns of a DayStore row by row."""
+    name = "python"
+
+    def flextime_minutes(self, store: DayStore, ranges: List[range]) -> int:
+        return sum(store.flextime_minutes(rows.start, rows.stop)
+                   for rows in ranges)
+
+    def count_type(self, store: DayStore, ranges: List[range],
+                   day_type: DayType) -> int:
+        return sum(store.count_type(rows.start, rows.stop, day_type)
+                   for rows in ranges)
+
+
+class NumpyEngine(PythonEngine):
+    """Sums the columns of a DayStore as NumPy arrays.
+
+    The arrays share memory with the store's columns, so nothing is copied
+    before the vector expressions are evaluated.
+    """
+    name = "numpy"
+
+    def flextime_minutes(self, store: DayStore, ranges: List[range]) -> int:
+        ranges = [rows for rows in ranges if rows]
+        if not ranges:
+            return 0
+        numpy = import_numpy()
+        first, stop = self._bounds(ranges)
+        starts = self._column(store.starts, first, stop)
+        lunches = self._column(store.lunches, first, stop)
+        ends = self._column(store.ends, first, stop)
+        deviations = self._column(store.deviations, first, stop)
+        day_types = self._column(store.day_types, first, stop)
+
+        reported = ((starts != MISSING) & (lunches != MISSING) &
+                    (ends != MISSING))
+        expected = numpy.where(
+            day_types == DayType.working_day.value, STANDARD_HOURS * 60, 0)
+        flextime = numpy.where(
+            reported,
+            ends.astype(numpy.int64) - starts - lunches - deviations -
+            expected,
+            0)
+        return self._sum_ranges(flextime, ranges, first)
+
+    def count_type(self, store: DayStore, ranges: List[range],
+                   day_type: DayType) -> int:
+        ranges = [rows for rows in ranges if rows]
+        if not ranges:
+            return 0
+        numpy = import_numpy()
+        first, stop = self._bounds(ranges)
+        day_types = self._column(store.day_types, first, stop)
+        return self._sum_ranges(
+            (day_types == day_type.value).astype(numpy.int64), ranges, first)
+
+    @staticmethod
+    def _bounds(ranges: List[range]) -> tuple:
+        return (min(rows.start for rows in ranges),
+                max(rows.stop for rows in ranges))
+
+    @staticmethod
+    def _column(column, first: int, stop: int):
+        return import_numpy().frombuffer(
+            column, dtype=column.typecode)[first:stop]
+
+    @staticmethod
+    def _sum_ranges(values, ranges: List[range], first: int) -> int:
+        numpy = import_numpy()
+        prefix = numpy.zeros(len(values) + 1, dtype=numpy.int64)
+        numpy.cumsum(values, out=prefix[1:])
+        starts = numpy.array([rows.start - first for rows in ranges],
+                             dtype=numpy.intp)
+        stops = numpy.array([rows.stop - first for rows in ranges],
+                            dtype=numpy.intp)
+        return int((prefix[stops] - prefix[starts]).sum())
+
+
+ENGINES = {engine.name: engine for engine in (PythonEngine, NumpyEngine)}
+
+current = PythonEngine()
+
+
+def select(name: str):
+    """Make an engine the current engine.
+    :param name:  "python" or "numpy".
+    :raises: errors.ChronoError
+    """
+    global current
+    if name not in ENGINES:
+        raise errors.ChronoError("Unknown engine: \"{}\"".format(name))
+    if name == NumpyEngine.name and import_numpy() is None:
+        raise errors.ChronoError("The numpy engine requires NumPy.")
+    current = ENGINES[name]()
+
+
+def flextime(months: Iterable) -> timedelta:
+    """Sum flextime of months."""
+    minutes = 0
+    checkpoints = timedelta()
+    for store, ranges in _group(months).items():
+        if store is None:
+            checkpoints += sum((m.checkpoint.flextime for m in ranges),
+                               timedelta())
+        else:
+            minutes += current.flextime_minutes(store, ranges)
+    return checkpoints + timedelta(minutes=minutes)
+
+
+def used_vacation(months: Iterable, date_string: Optional[str] = None) -> int:
+    """Count vacation days of months.
+    :param date_string:  Only count vacation days up to and including this
+                         date.
+    """
+    vacation = 0
+    ranges = OrderedDict()
+    for month in months:
+        rows = month.vacation_rows(date_string)
+        if rows is None:
+            vacation += month.checkpoint.vacation
+        else:
+            ranges.setdefault(month.store, []).append(rows)
+    for store, store_ranges in ranges.items():
+        vacation += current.count_type(store, store_ranges, DayType.vacation)
+    return vacation
+
+
+def sick_days(months: Iterable) -> int:
+    """Count sick days of months."""
+    count = 0
+    for store, ranges in _group(months).items():
+        if store is None:
+            count += sum(m.checkpoint.sick_days for m in ranges)
+        else:
+            count += current.count_type(store, ranges, DayType.sick_day)
+    return count
+
+
+def _group(months: Iterable) -> OrderedDict:
+    """Group the row ranges of months by store. Months with a checkpoint
+    are grouped under None.
+    """
+    groups = OrderedDict()
+    for month in months:
+        if month.checkpoint is not None:
+            groups.setdefault(None, []).append(month)
+        else:
+            groups.setdefault(month.store, []).append(month.rows())
+    return groups
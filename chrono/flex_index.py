@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from bisect import bisect_right
+from datetime import date
+
+from chrono.day import DayStore
+
+
+class FlexIndex(object):
+    """Running flextime balance after each day of a DayStore.
+
+    The balances are kept in minutes, one per row, so the balance at a date
+    is a bisect of the store's ordinals. Rows added or changed since the
+    last lookup are summed again before the next one, which for a report
+    history only growing at the end means the newest day.
+    """
+    def __init__(self, store: DayStore):
+        self.store = store
+        self.balances = array('q')
+
+    def update(self):
+        store = self.store
+        first = min(store.unchanged, len(self.balances))
+        del self.balances[first:]
+        balance = self.balances[-1] if first > 0 else 0
+        for row in range(first, len(store)):
+            balance += store.flextime_minutes(row, row + 1)
+            self.balances.append(balance)
+        store.unchanged = len(store)
+
+    def minutes_at(self, at_date: date) -> int:
+        """Return flextime in minutes earned up to and including a date."""
+        self.update()
+        rows = bisect_right(self.store.ordinals, at_date.toordinal())
+        if rows == 0:
+            return 0
+        return self.balances[rows - 1]
+
+    def minutes_between(self, first_date: date, last_date: date) -> int:
+        """Return flextime in minutes earned from first_date up to and
+        including last_date.
+        """
+        self.update()
+        ordinals = self.store.ordinals
+        first = bisect_right(ordinals, first_date.toordinal() - 1)
+        stop = bisect_right(ordinals, last_date.toordinal())
+        if stop <= first:
+            return 0
+        return (self.balances[stop - 1] -
+                (self.balances[first - 1] if first > 0 else 0))
@@ -0,0 +1,213 @@
+# -*- coding: utf-8 -*-
+"""Append-only journal of report events.
+
+With journaling enabled a report appends one line to the journal in the data
+folder instead of rewriting a month file, e.g.:
+
+    2014-09-01 start 8:00
+    2014-09-01 lunch 0:45
+    2014-09-01 comment Dentist at ten.
+
+The parser applies the events on top of the month files. Compacting folds
+them into the month files, written from Day.export, and removes them from the
+journal. Appends and compaction lock the journal with flock, so reports can
+be appended while the journal is compacted.
+"""
+
+from collections import namedtuple
+import fcntl
+import os
+from typing import List, Optional, Tuple
+
+from chrono import errors
+from chrono.cache import JOURNAL_FILE
+from chrono.day import Day, DayType, parse_date
+from chrono.time_utilities import pretty_minutes
+from chrono import writer
+
+Event = namedtuple("Event", "date field value")
+
+FIELDS = ("start", "lunch", "end", "deviation", "type", "comment")
+
+
+def append_event(data_folder: str, event: Event, fsync: bool = False):
+    """Append a report event to the journal.
+    :param fsync:  Flush the journal to disk before returning.
+    :raises: errors.ReportError
+    """
+    if event.field not in FIELDS:
+        raise errors.ReportError("Bad journal field: \"{}\"".format(
+            event.field))
+    parse_date(event.date)
+    line = "{} {} {}\n".format(*event)
+    if "\n" in line[:-1]:
+        raise errors.ReportError("Journal values must be on one line.")
+
+    file_name = os.path.join(data_folder, JOURNAL_FILE)
+    while True:
+        file_descriptor = os.open(
+            file_name, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+        try:
+            fcntl.flock(file_descriptor, fcntl.LOCK_EX)
+            # A journal replaced by compact while waiting for the lock is
+            # opened again.
+            if os.fstat(file_descriptor).st_nlink > 0:
+                os.write(file_descriptor, line.encode('utf-8'))
+                if fsync:
+                    os.fsync(file_descriptor)
+                return
+        finally:
+            os.close(file_descriptor)
+
+
+def read_events(data_folder: str, start: int = 0,
+                stop: Optional[int] = None) -> Tuple[List[Event], int]:
+    """Read the events of the journal. A last line without newline is an
+    append in progress and isn't read.
+    :param start:  Offset in the journal to read from.
+    :param stop:  Offset in the journal to read to.
+    :returns:  The events and the offset after the last read event.
+    :raises: errors.ParseError
+    """
+    try:
+        with open(os.path.join(data_folder, JOURNAL_FILE),
+                  "rb") as journal_file:
+            journal_file.seek(start)
+            data = journal_file.read(-1 if stop is None else stop - start)
+    except FileNotFoundError:
+        return [], 0
+
+    lines = data.split(b"\n")[:-1]
+    events = []
+    for line in lines:
+        line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        event = Event(*(line.split(" ", 2) + [None, None])[:3])
+        if event.field not in FIELDS or event.value is None:
+            raise errors.ParseError("Bad journal line: \"{}\"".format(line))
+        try:
+            parse_date(event.date)
+        except errors.BadDateError:
+            raise errors.ParseError("Bad journal line: \"{}\"".format(line))
+        events.append(event)
+    return events, start + sum(len(line) + 1 for line in lines)
+
+
+def report_event(day: Day, field: str) -> Event:
+    """Return the event reporting a field of a day as it is now.
+    :param field:  One of FIELDS.
+    """
+    if field == "start":
+        value = day.start_time.strftime("%H:%M")
+    elif field == "end":
+        value = day.end_time.strftime("%H:%M")
+    elif field == "lunch":
+        value = pretty_minutes(day.lunch_duration.seconds // 60)
+    elif field == "deviation":
+        value = pretty_minutes(day.deviation.seconds // 60)
+    elif field == "type":
+        value = day.day_type.name
+    else:
+        value = day.comment
+    return Event(day.date.isoformat(), field, value)
+
+
+def apply_event(day: Day, event: Event):
+    """Report an event to a day. Times that are already reported with the
+    same value are left as they are, so events can be applied again to
+    month files they were compacted into.
+    :raises: errors.ChronoError
+    """
+    if event.field == "type":
+        if event.value not in DayType.__members__:
+            raise errors.ParseError("Bad day type for date {}: \"{}\"".format(
+                event.date, event.value))
+        day.set_type(DayType[event.value])
+    elif event.field == "comment":
+        day.comment = event.value
+    elif event.field == "deviation":
+        day.report_deviation(event.value)
+    elif (getattr(day, _PROPERTIES[event.field]) is None or
+          report_event(day, event.field) != _normalized(event)):
+        # A time reported with another value raises the report error.
+        _REPORT[event.field](day, event.value)
+
+
+_PROPERTIES = {"start": "start_time", "lunch": "lunch_duration",
+               "end": "end_time"}
+_REPORT = {"start": Day.report_start_time,
+           "lunch": Day.report_lunch_duration,
+           "end": Day.report_end_time}
+
+
+def _normalized(event: Event) -> Event:
+    """Return a time event as written by report_event."""
+    day = Day(event.date)
+    if event.field != "start":
+        day.report_start_minutes(0)
+    if event.field == "end":
+        day.report_lunch_minutes(0)
+    _REPORT[event.field](day, event.value)
+    return report_event(day, event.field)
+
+
+def apply_events(user, events: List[Event]):
+    """Report events to a user, adding the days that aren't reported.
+    Totals of the months are calculated again from their days.
+    """
+    for event in events:
+        day = user.get_day(event.date)
+        if day is None:
+            day = user.add_day(event.date)
+        apply_event(day, event)
+        day_date = day.date
+        user.get_month(day_date.year, day_date.month).checkpoint = None
+
+
+def compact(user, data_folder: str, stop: int,
+            fsync: bool = False) -> List[str]:
+    """Write the months of the journal's events to their month files and
+    remove the events from the journal.
+    :param user:  User parsed from the data folder, with the journal events
+                  up to stop applied.
+    :param stop:  Offset in the journal after the last applied event. Later
+                  events are kept in the journal.
+    :returns:  Paths of the written month files.
+    """
+    events, stop = read_events(data_folder, stop=stop)
+    month_files = []
+    for month_string in sorted({event.date[:7] for event in events}):
+        month = user.get_month(int(month_string[:4]), int(month_string[5:]))
+        month_file = os.path.join(data_folder, "{}.txt".format(month_string))
+        writer.write_month(month_file, [day.export() for day in month.days],
+                           fsync=fsync)
+        month_files.append(month_file)
+    _discard(data_folder, stop, fsync=fsync)
+    return month_files
+
+
+def _discard(data_folder: str, stop: int, fsync: bool = False):
+    """Remove the journal up to an offset."""
+    file_name = os.path.join(data_folder, JOURNAL_FILE)
+    try:
+        file_descriptor = os.open(file_name, os.O_RDONLY)
+    except FileNotFoundError:
+        return
+    try:
+        fcntl.flock(file_descriptor, fcntl.LOCK_EX)
+        with open(file_descriptor, "rb", closefd=False) as journal_file:
+            journal_file.seek(stop)
+            rest = journal_file.read()
+        if rest:
+            temp_name = "{}.{}.tmp".format(file_name, os.getpid())
+            with open(temp_name, "wb") as temp_file:
+                temp_file.write(rest)
+                temp_file.flush()
+                if fsync:
+                    os.fsync(temp_file.fileno())
+            os.replace(temp_name, file_name)
+        else:
+            os.remove(file_name)
+    finally:
+        os.close(file_descriptor)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+from datetime import timedelta
+import json
+import os
+from typing import Optional
+
+from chrono.cache import Fingerprint
+from chrono.month import Month, MonthTotals
+
+LEDGER_VERSION = 1
+
+
+class Ledger(object):
+    """Persisted flextime, vacation and sick day totals for complete months.
+
+    An entry is only valid for the month file content and the holidays it
+    was recorded from, so editing a month file or its year's holidays
+    invalidates it.
+    """
+    def __init__(self, file_name: str):
+        self.file_name = file_name
+        self.entries = {}
+        self.changed = False
+        try:
+            with open(file_name, "r", encoding='utf-8') as ledger_file:
+                content = json.load(ledger_file)
+        except (OSError, ValueError):
+            content = {}
+        if (isinstance(content, dict) and
+                content.get("version") == LEDGER_VERSION):
+            self.entries = content["months"]
+
+    def fingerprint(self, month_string: str) -> Optional[Fingerprint]:
+        """Return the month file fingerprint of a recorded month."""
+        entry = self.entries.get(month_string)
+        if entry is None:
+            return None
+        return Fingerprint(*entry["fingerprint"])
+
+    def checkpoint(self, month: Month,
+                   fingerprint: Fingerprint) -> Optional[MonthTotals]:
+        """Return the recorded totals for a month or None if there are no
+        valid totals.
+        :param fingerprint:  Fingerprint of the month's file.
+        """
+        entry = self.entries.get(self._key(month))
+        if (entry is None or
+                entry["fingerprint"][3] != fingerprint.digest or
+                entry["holidays"] != self._holidays(month)):
+            return None
+        return MonthTotals(timedelta(seconds=entry["flextime"]),
+                           entry["vacation"],
+                           entry["sick_days"])
+
+    def record(self, month: Month, fingerprint: Fingerprint):
+        """Record the totals of a complete month.
+        :param fingerprint:  Fingerprint of the month's file.
+        """
+        totals = month.totals()
+        self.entries[self._key(month)] = {
+            "fingerprint": list(fingerprint),
+            "holidays": self._holidays(month),
+            "flextime": int(totals.flextime.total_seconds()),
+            "vacation": totals.vacation,
+            "sick_days": totals.sick_days}
+        self.changed = True
+
+    def invalidate(self, month_string: str):
+        if self.entries.pop(month_string, None) is not None:
+            self.changed = True
+
+    def calculate_flextime(self) -> timedelta:
+        return timedelta(seconds=sum(
+            entry["flextime"] for entry in self.entries.values()))
+
+    def save(self):
+        if not self.changed:
+            return
+        folder = os.path.dirname(self.file_name)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        temp_name = "{}.{}.tmp".format(self.file_name, os.getpid())
+        with open(temp_name, "w", encoding='utf-8') as ledger_file:
+            json.dump({"version": LEDGER_VERSION, "months": self.entries},
+                      ledger_file, indent=1, sort_keys=True)
+        os.replace(temp_name, self.file_name)
+        self.changed = False
+
+    @staticmethod
+    def _key(month: Month) -> str:
+        return "{}-{:02d}".format(month.year, month.month)
+
+    @staticmethod
+    def _holidays(month: Month) -> list:
+        return sorted([date, name] for date, name in month.holidays.items())
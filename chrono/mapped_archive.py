@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+"""Archive files read through mmap.
+
+An archive file holds months of month file lines, each under a YYYY-MM
+header. Instead of reading and parsing the whole file like
+Parser.parse_archive_file, MappedArchive maps the file into memory and
+keeps an index of the byte ranges of its months. Months are parsed when
+they're accessed. Totals are computed month by month, so only one month's
+days are in memory at a time, and kept as three numbers per month. Only
+plain archives can be mapped, compressed archives are refused.
+
+The index and the totals are kept in a sidecar file next to the archive,
+"<archive>.idx", which is used as long as the archive's modification time
+and size are unchanged. Summing an indexed archive then parses nothing.
+"""
+
+from collections import OrderedDict
+from datetime import timedelta
+import json
+import mmap
+import os
+import re
+from typing import Iterator, List, Optional
+
+from chrono import engine, errors
+from chrono.archive import is_compressed
+from chrono.month import Month, MonthTotals
+from chrono.parser import Parser
+
+INDEX_VERSION = 1
+
+_MONTH_HEADER = re.compile(b"^([0-9]{4}-[01][0-9])\n", flags=re.MULTILINE)
+
+
+class MappedArchive(object):
+    """Read-only archive of an archive file, see the module documentation.
+    """
+    def __init__(self, file_name: str, index_file: Optional[str] = None):
+        """
+        :param index_file:  Sidecar file of the month index. Defaults to the
+                            archive's file name with ".idx" appended.
+        :raises: errors.ChronoError, errors.ParseError
+        """
+        if is_compressed(file_name):
+            raise errors.ChronoError(
+                "Compressed archives can't be mapped, parse them with "
+                "Parser.parse_archive_file: \"{}\"".format(file_name))
+        self.file_name = file_name
+        self.index_file = index_file or "{}.idx".format(file_name)
+        self._parsed = {}
+        self._totals = {}
+        with open(file_name, "rb") as archive_file:
+            file_stat = os.fstat(archive_file.fileno())
+            if file_stat.st_size == 0:
+                self._map = b""
+            else:
+                self._map = mmap.mmap(archive_file.fileno(), 0,
+                                      access=mmap.ACCESS_READ)
+        self._stat = [file_stat.st_mtime_ns, file_stat.st_size]
+        self.index = self._load_index()
+        if self.index is None:
+            try:
+                self.index = self._build_index()
+            except errors.ParseError:
+                self.close()
+                raise
+            self._save_index()
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+
+    def __enter__(self) -> "MappedArchive":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _build_index(self) -> OrderedDict:
+        """Return the byte range of each month's lines, by month string.
+        :raises: errors.ParseError
+        """
+        index = OrderedDict()
+        headers = list(_MONTH_HEADER.finditer(self._map))
+        leading = bytes(self._map[:headers[0].start() if headers else None])
+        if leading.strip():
+            line = next(line for line in leading.split(b"\n") if line.strip())
+            raise errors.ParseError(
+                "Archive lines must follow a month header (e.g. "
+                "\"YYYY-MM\"), got \"{}\"".format(
+                    line.decode('utf-8').rstrip("\r")))
+        for header, next_header in zip(headers, headers[1:] + [None]):
+            stop = (len(self._map) if next_header is None
+                    else next_header.start())
+            index[header.group(1).decode('ascii')] = (header.end(), stop)
+        return index
+
+    def _load_index(self) -> Optional[OrderedDict]:
+        try:
+            with open(self.index_file, "r", encoding='utf-8') as index_file:
+                content = json.load(index_file)
+        except (OSError, ValueError):
+            return None
+        if (not isinstance(content, dict) or
+                content.get("version") != INDEX_VERSION or
+                content.get("stat") != self._stat):
+            return None
+        index = OrderedDict()
+        for month_string, start, stop, totals in content["months"]:
+            index[month_string] = (start, stop)
+            if totals is not None:
+                self._totals[month_string] = MonthTotals(
+                    timedelta(seconds=totals[0]), totals[1], totals[2])
+        return index
+
+    def _save_index(self):
+        months = []
+        for month_string, (start, stop) in self.index.items():
+            totals = self._totals.get(month_string)
+            if totals is not None:
+                totals = [int(totals.flextime.total_seconds()),
+                          totals.vacation, totals.sick_days]
+            months.append([month_string, start, stop, totals])
+        content = {"version": INDEX_VERSION,
+                   "stat": self._stat,
+                   "months": months}
+        temp_name = "{}.{}.tmp".format(self.index_file, os.getpid())
+        try:
+            with open(temp_name, "w", encoding='utf-8') as index_file:
+                json.dump(content, index_file)
+            os.replace(temp_name, self.index_file)
+        except OSError:
+            # An archive in a read-only folder is indexed every time.
+            pass
+
+    def month_strings(self) -> List[str]:
+        return list(self.index)
+
+    def get_month(self, month_string: str) -> Optional[Month]:
+        """Return an archived month (e.g. "YYYY-MM") or None if it isn't
+        archived. Months are parsed on first access.
+        """
+        parsed_month = self._parsed.get(month_string)
+        if parsed_month is None and month_string in self.index:
+            parsed_month = self._parse(month_string)
+            self._parsed[month_string] = parsed_month
+        return parsed_month
+
+    @property
+    def months(self) -> List[Month]:
+        """All archived months. Parses every month, prefer get_month or the
+        totals for large archives.
+        """
+        return [self.get_month(month_string) for month_string in self.index]
+
+    def iter_months(self) -> Iterator[Month]:
+        """Parse the months one by one without keeping them."""
+        for month_string in self.index:
+            yield self._parsed.get(month_string) or self._parse(month_string)
+
+    def _parse(self, month_string: str) -> Month:
+        start, stop = self.index[month_string]
+        return Parser().parse_month_string(
+            bytes(self._map[start:stop]).decode('utf-8'), month_string)
+
+    def totals(self) -> List[MonthTotals]:
+        """Return flextime, used vacation and sick days of every month.
+        Months without saved totals are parsed one at a time.
+        """
+        missing = [month_string for month_string in self.index
+                   if month_string not in self._totals]
+        for month_string in missing:
+            parsed_month = (self._parsed.get(month_string) or
+                            self._parse(month_string))
+            self._totals[month_string] = MonthTotals(
+                engine.flextime([parsed_month]),
+                engine.used_vacation([parsed_month]),
+                engine.sick_days([parsed_month]))
+        if missing:
+            self._save_index()
+        return [self._totals[month_string] for month_string in self.index]
+
+    def calculate_flextime(self) -> timedelta:
+        return sum((totals.flextime for totals in self.totals()),
+                   timedelta())
+
+    def used_vacation(self) -> int:
+        return sum(totals.vacation for totals in self.totals())
+
+    def sick_days(self) -> int:
+        return sum(totals.sick_days for totals in self.totals())
+
+    def next_month(self) -> str:
+        if not self.index:
+            return ""
+        return Month(next(reversed(self.index))).next_month()
@@ -1,16 +1,29 @@
 # -*- coding: utf-8 -*-
 
-from datetime import datetime, timedelta
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import date, datetime, timedelta
 import re
-from typing import Optional
+import sys
+from typing import List, Optional
 
-from chrono import errors
-from chrono.day import Day, DayType
+from chrono import engine, errors
+from chrono.day import Day, DayStore, DayType, MISSING, parse_date
 from chrono.time_utilities import pretty_timedelta
+from chrono.workday_calendar import WorkdayCalendar
+
+MonthTotals = namedtuple("MonthTotals", "flextime vacation sick_days")
 
 
 class Month(object):
-    def __init__(self, month_string: str, user=None):
+    __slots__ = ('year', 'month', 'holidays', 'user', '_checkpoint', 'store',
+                 'calendar', '_first', '_count', '_next_ordinal',
+                 '_calendar_changes')
+
+    def __init__(self, month_string: str, user=None,
+                 store: Optional[DayStore] = None,
+                 calendar: Optional[WorkdayCalendar] = None):
         match = re.match("^(\d{4})-([0-1][0-9])$", month_string)
         if match:
             self.year = int(match.group(1))
@@ -18,58 +31,183 @@ class Month(object):
         else:
             raise errors.BadDateError("Bad date string: \"{}\"".format(
                 month_string))
-        self.days = []
         self.holidays = {}
         self.user = user
+        self._checkpoint = None
+        self.store = store if store is not None else DayStore()
+        if calendar is None:
+            calendar = WorkdayCalendar(self.year)
+        self.calendar = calendar
+        self._first = len(self.store)
+        self._count = 0
+        self._next_ordinal = None
+        self._calendar_changes = 0
+
+    @property
+    def checkpoint(self) -> Optional[MonthTotals]:
+        """Totals recorded for the month, used instead of summing its days.
+        The checkpoint is dropped when a day of the month changes.
+        """
+        return self._checkpoint
+
+    @checkpoint.setter
+    def checkpoint(self, totals: Optional[MonthTotals]):
+        if self._count > 0:
+            if totals is None:
+                self.store.forget_checkpoint(self)
+            else:
+                self.store.watch_checkpoint(self)
+        self._checkpoint = totals
+
+    @property
+    def days(self) -> List[Day]:
+        return [Day.from_row(self.store, row) for row in self.rows()]
+
+    def rows(self) -> range:
+        """Return the month's rows in its store."""
+        return range(self._first, self._first + self._count)
 
     def add_day(self, date_string: str) -> Day:
-        new_day = Day(date_string)
-        if new_day.date.year != self.year or new_day.date.month != self.month:
+        return self._add(parse_date(date_string).toordinal(), date_string)
+
+    def add_ordinal(self, ordinal: int) -> Day:
+        """Add a day given as a proleptic Gregorian ordinal."""
+        return self._add(ordinal, None)
+
+    def _add(self, ordinal: int, date_string: Optional[str]) -> Day:
+        new_date = date.fromordinal(ordinal)
+        if date_string is None:
+            date_string = new_date.isoformat()
+        if new_date.year != self.year or new_date.month != self.month:
             raise errors.ReportError("New date string didn't match month. "
                                      "{}-{:02d} doesn't include {}.".format(
                                          self.year, self.month, date_string))
 
-        for old_day in self.days:
-            if new_day.date == old_day.date:
+        store = self.store
+        if self._count > 0:
+            last_row = self._first + self._count - 1
+            if ordinal <= store.ordinals[last_row]:
+                if store.find(ordinal) in self.rows():
+                    raise errors.ReportError(
+                        "Date 2014-09-02 already added to month.")
                 raise errors.ReportError(
-                    "Date 2014-09-02 already added to month.")
-            if not old_day.complete():
+                    "New days must be added in date order. {} is before {}."
+                    .format(date_string, date.fromordinal(
+                        store.ordinals[last_row]).isoformat()))
+            if not store.complete(last_row):
                 raise errors.ReportError("New days can't be added while the "
                                          "report for a previous day is "
                                          "incomplete.")
 
-        next_workday = datetime.strptime(
-            self.next_workday(), "%Y-%m-%d").date()
-
-        if new_day.date > next_workday:
+        next_workday = self._next_workday_ordinal()
+        if ordinal > next_workday:
             raise errors.ReportError(
                 "New work days must be added consecutively. Expected {}, got "
-                "{}.".format(self.next_workday(), date_string))
+                "{}.".format(date.fromordinal(next_workday).isoformat(),
+                             date_string))
+
+        if self._count == 0:
+            self._first = len(store)
+        elif self._first + self._count != len(store):
+            raise errors.ReportError(
+                "Days can only be added to the last month of a store.")
+        row = store.append(ordinal)
+        self._count += 1
+        self._next_ordinal = None
 
-        if date_string in self.holidays:
-            new_day.day_type = DayType.holiday
-            new_day.info = self.holidays[date_string]
-        self.days.append(new_day)
-        return new_day
+        holiday = self.holidays.get(new_date.isoformat())
+        if holiday is not None:
+            store.day_types[row] = DayType.holiday.value
+            store.infos[row] = store.text_id(holiday)
+        self.checkpoint = None
+        return Day.from_row(store, row)
+
+    def load_records(self, records: list) -> bool:
+        """Add the days of parsed day records in one pass.
+
+        The records are checked as a whole before any day is added. If a
+        record would be rejected by add_ordinal and the report methods of
+        Day, nothing is added and False is returned, so that the caller can
+        report the records one by one to get the error.
+        :param records:  Day records as returned by
+                         tokenizer.tokenize_month_string.
+        """
+        store = self.store
+        if self._count > 0 and self._first + self._count != len(store):
+            return False
+        first_ordinal = date(self.year, self.month, 1).toordinal()
+        last_day = (date(self.year + self.month // 12, self.month % 12 + 1, 1)
+                    .toordinal() - first_ordinal)
+        if self._count > 0:
+            last_row = self._first + self._count - 1
+            previous = store.ordinals[last_row]
+            complete = store.complete(last_row)
+        else:
+            previous = first_ordinal - 1
+            complete = True
+
+        holidays = {}
+        for date_string, name in self.holidays.items():
+            holidays[parse_date(date_string).toordinal()] = name
+        rows = []
+        for record in records:
+            ordinal = first_ordinal + record.day - 1
+            if (not complete or not 1 <= record.day <= last_day or
+                    ordinal <= previous or
+                    ordinal > self.calendar.next_workday(previous + 1)):
+                return False
+            if record.day_type is not None:
+                day_type = record.day_type
+            elif ordinal in holidays:
+                day_type = DayType.holiday
+            elif (ordinal - 1) % 7 < 5:
+                day_type = DayType.working_day
+            else:
+                day_type = DayType.weekend
+
+            start, lunch, end = record.start, record.lunch, record.end
+            if ((start is not None and not 0 <= start < 24 * 60) or
+                    (lunch is not None and (start is None or lunch < 0)) or
+                    (end is not None and (
+                        lunch is None or not 0 <= end < 24 * 60)) or
+                    (record.deviation is not None and record.deviation < 0)):
+                return False
+            complete = (day_type != DayType.working_day or
+                        end is not None)
+            rows.append((ordinal, day_type, record, holidays.get(ordinal)))
+            previous = ordinal
+
+        if self._count == 0:
+            self._first = len(store)
+        for ordinal, day_type, record, holiday in rows:
+            store.append_row(ordinal, day_type, record.start, record.lunch,
+                             record.end, record.deviation, record.comment,
+                             holiday)
+        self._count += len(rows)
+        self._next_ordinal = None
+        self.checkpoint = None
+        return True
 
     def complete(self):
         date_string = "{}-{:02d}".format(self.year, self.month)
         return (not self.next_workday().startswith(date_string) and
-                self.days[-1].complete())
+                (self._count == 0 or
+                 self.store.complete(self._first + self._count - 1)))
 
     def next_workday(self) -> str:
-        if len(self.days) == 0:
-            next_day = Day("{}-{:02d}-01".format(self.year, self.month))
-        else:
-            next_day = Day((self.days[-1].date +
-                            timedelta(days=1)).isoformat())
-
-        while (next_day.day_type != DayType.working_day or
-               next_day.date.isoformat() in self.holidays):
-            next_day = Day((next_day.date +
-                            timedelta(days=1)).isoformat())
+        return date.fromordinal(self._next_workday_ordinal()).isoformat()
 
-        return next_day.date.isoformat()
+    def _next_workday_ordinal(self) -> int:
+        if (self._next_ordinal is None or
+                self._calendar_changes != self.calendar.changes):
+            if self._count == 0:
+                next_day = date(self.year, self.month, 1).toordinal()
+            else:
+                next_day = (
+                    self.store.ordinals[self._first + self._count - 1] + 1)
+            self._next_ordinal = self.calendar.next_workday(next_day)
+            self._calendar_changes = self.calendar.changes
+        return self._next_ordinal
 
     def next_month(self) -> str:
         next_year = self.year
@@ -80,33 +218,70 @@ class Month(object):
         return "{}-{:02d}".format(next_year, next_month)
 
     def calculate_flextime(self) -> timedelta:
-        flextime = timedelta()
-        for day in self.days:
-            flextime += day.calculate_flextime()
-        return flextime
+        return engine.flextime([self])
+
+    def freeze(self) -> "FrozenMonth":
+        """Return the month as a FrozenMonth."""
+        store = self.store
+        rows = self.rows()
+        times = array('h')
+        texts = []
+        for index, row in enumerate(rows):
+            times.extend((store.starts[row], store.lunches[row],
+                          store.ends[row], store.deviations[row]))
+            comment = store.texts[store.comments[row]]
+            info = store.texts[store.infos[row]]
+            if comment is not None or info is not None:
+                texts.append((index, _intern(comment), _intern(info)))
+        return FrozenMonth(
+            self.year, self.month,
+            bytes(date.fromordinal(store.ordinals[row]).day for row in rows),
+            store.day_types[rows.start:rows.stop].tobytes(),
+            times.tobytes(), tuple(texts), self.totals())
+
+    def totals(self) -> MonthTotals:
+        """Return flextime, used vacation and sick days for the month."""
+        if self.checkpoint is not None:
+            return self.checkpoint
+        return MonthTotals(self.calculate_flextime(), self.used_vacation(),
+                           self.sick_days())
 
     def add_holiday(self, date_string: str, name: str):
         self.holidays[date_string] = name
-        for day in self.days:
-            if day.date.isoformat() == date_string:
-                day.day_type = DayType.holiday
-                day.info = name
+        self.checkpoint = None
+        holiday = parse_date(date_string)
+        self.calendar.add_holiday(holiday)
+        ordinal = holiday.toordinal()
+        store = self.store
+        for row in self.rows():
+            if store.ordinals[row] == ordinal:
+                store.day_types[row] = DayType.holiday.value
+                store.infos[row] = store.text_id(name)
+                store.touch(row)
 
     def used_vacation(self, date_string: Optional[str] = None) -> int:
-        if date_string is not None:
-            date = datetime.strptime(date_string, "%Y-%m-%d").date()
-            vacation_days = [day for day in self.days
-                             if day.day_type == DayType.vacation
-                             and day.date <= date]
-        else:
-            vacation_days = [day for day in self.days
-                             if day.day_type == DayType.vacation]
+        return engine.used_vacation([self], date_string=date_string)
 
-        return len(vacation_days)
+    def vacation_rows(self, date_string: Optional[str] = None
+                      ) -> Optional[range]:
+        """Return the rows to count vacation days in, or None if the
+        checkpoint's vacation days should be used.
+        :param date_string:  Only include days up to and including this date.
+        """
+        if self.checkpoint is not None and (
+                date_string is None or
+                date_string >= "{}-{:02d}-31".format(self.year, self.month)):
+            return None
+        stop = self._first + self._count
+        if date_string is not None:
+            ordinal = datetime.strptime(
+                date_string, "%Y-%m-%d").date().toordinal()
+            stop = bisect_right(self.store.ordinals, ordinal,
+                                self._first, stop)
+        return range(self._first, stop)
 
     def sick_days(self) -> int:
-        return len([day for day in self.days
-                    if day.day_type == DayType.sick_day])
+        return engine.sick_days([self])
 
     def __str__(self):
         width = 40
@@ -121,4 +296,88 @@ class Month(object):
         string += "\n{:>{width}}\n".format(
             pretty_timedelta(self.calculate_flextime(), signed=True),
             width=width)
-        return string
\ No newline at end of file
+        return string
+
+
+def _intern(text: Optional[str]) -> Optional[str]:
+    return None if text is None else sys.intern(text)
+
+
+class FrozenMonth(object):
+    """An archived month that can't be changed.
+
+    The days are packed into bytes: one byte each for day of month and day
+    type, and start, lunch, end and deviation as four 16 bit minutes.
+    Comments and holiday names are interned and kept only for the days that
+    have them. Flextime, vacation and sick days are calculated when the
+    month is frozen, see Month.freeze.
+    """
+    __slots__ = ('year', 'month', 'totals', '_days', '_day_types', '_times',
+                 '_texts')
+
+    def __init__(self, year: int, month: int, days: bytes, day_types: bytes,
+                 times: bytes, texts: tuple, totals: MonthTotals):
+        for name, value in (('year', year), ('month', month),
+                            ('totals', totals), ('_days', days),
+                            ('_day_types', day_types), ('_times', times),
+                            ('_texts', texts)):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Frozen months can't be changed.")
+
+    def __len__(self):
+        return len(self._days)
+
+    @property
+    def days(self) -> List[Day]:
+        return self.thaw().days
+
+    def thaw(self) -> Month:
+        """Return the month as a Month with a store of its own."""
+        thawed = Month("{}-{:02d}".format(self.year, self.month))
+        store = thawed.store
+        texts = {index: (comment, info)
+                 for index, comment, info in self._texts}
+        times = memoryview(self._times).cast('h')
+        first_ordinal = date(self.year, self.month, 1).toordinal() - 1
+        for index, (day, day_type) in enumerate(zip(self._days,
+                                                    self._day_types)):
+            start, lunch, end, deviation = times[index * 4:index * 4 + 4]
+            comment, info = texts.get(index, (None, None))
+            store.append_row(first_ordinal + day, DayType(day_type),
+                             None if start == MISSING else start,
+                             None if lunch == MISSING else lunch,
+                             None if end == MISSING else end,
+                             deviation, comment, info)
+        thawed._count = len(store)
+        thawed.checkpoint = self.totals
+        return thawed
+
+    def complete(self) -> bool:
+        return True
+
+    def next_month(self) -> str:
+        if self.month == 12:
+            return "{}-01".format(self.year + 1)
+        return "{}-{:02d}".format(self.year, self.month + 1)
+
+    def calculate_flextime(self) -> timedelta:
+        return self.totals.flextime
+
+    def used_vacation(self, date_string: Optional[str] = None) -> int:
+        """
+        :param date_string:  Only count vacation days up to and including
+                             this date.
+        """
+        if date_string is None:
+            return self.totals.vacation
+        day_date = parse_date(date_string)
+        vacation = DayType.vacation.value
+        return sum(1 for day, day_type in zip(self._days, self._day_types)
+                   if day_type == vacation and
+                   (self.year, self.month, day) <=
+                   (day_date.year, day_date.month, day_date.day))
+
+    def sick_days(self) -> int:
+        return self.totals.sick_days
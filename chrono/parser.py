@@ -1,145 +1,376 @@
 # -*- coding: utf-8 -*-
 
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from glob import glob
 import re
 import os
+from typing import IO, Iterator, List, Optional
 
-from chrono.day import DayType
+from chrono.cache import MonthCache, file_fingerprint
+from chrono.ledger import Ledger
+from chrono import journal
 from chrono.month import Month
 from chrono.year import Year
-from chrono.archive import Archive
+from chrono.archive import Archive, open_archive_file
 from chrono.user import User
-from chrono.errors import ParseError
+from chrono.errors import BadDateError, ChronoError, ParseError
+from chrono.tokenizer import (DayRecord, date_string, tokenize_line,
+                              tokenize_lines_before_error,
+                              tokenize_month_file, tokenize_month_string)
+
+_MONTH_HEADER = re.compile("^[0-9]{4}-[01][0-9]$")
+
+
+def _minutes(time: Optional[datetime]) -> Optional[int]:
+    if time is None:
+        return None
+    return time.hour * 60 + time.minute
 
 
 class Parser(object):
     user = None
+    journal_end = 0
 
-    def parse_month_file(self, file_name: str) -> Month:
+    def parse_month_file(self, file_name: str,
+                         cache: Optional[MonthCache] = None) -> Month:
         month, _ = os.path.splitext(os.path.basename(file_name))
-        with open(file_name, "r", encoding='utf-8') as month_file:
-            string = month_file.read()
-        parsed_month = self.parse_month_string(string, month)
-        return parsed_month
+        records = None
+        if cache is not None:
+            records = cache.load(file_name)
+        if records is None:
+            try:
+                records, fingerprint = tokenize_month_file(file_name)
+            except ChronoError:
+                with open(file_name, "r", encoding='utf-8') as month_file:
+                    self._report_lines_before_error(month_file.read(), month)
+                raise
+            if cache is not None:
+                cache.store(file_name, records, fingerprint)
+        if cache is not None:
+            cache.save()
+        return self.add_month_records(records, month)
 
     def parse_month_string(self, string: str, month: str) -> Month:
-        parsed_month = Month(month)
-        empty_pattern = re.compile("^\s*$")
-        date_pattern = re.compile("^(\d{1,2})\.$")
-        time_pattern = re.compile("^(\d{1,2}:\d{2})$")
-        hour_pattern = re.compile("^(\d{1,2})$")
-        sick_pattern = re.compile("^[Ss]$")
-        vacation_pattern = re.compile("^[Vv]$")
-        comment_pattern = re.compile("([\"\'].*[\"\'])\s*$")
-
-        for line in string.split("\n"):
-            if empty_pattern.match(line):
-                continue
-            match = comment_pattern.search(line)
-            if match:
-                comment = match.group(1)
-
-                # remove comment
-                line = comment_pattern.sub("", line)
-            else:
-                comment = None
-            line_tokens = line.split()
-            token = line_tokens.pop(0)
-            day_match = date_pattern.match(token)
-            if day_match:
-                if self.user is None:
-                    parsed_day = parsed_month.add_day(
-                        "{m.year}-{m.month:02d}-{0:02d}".format(
-                            int(day_match.group(1)), m=parsed_month))
-                else:
-                    parsed_day = self.user.add_day(
-                        "{m.year}-{m.month:02d}-{0:02d}".format(
-                            int(day_match.group(1)), m=parsed_month))
+        try:
+            records = tokenize_month_string(string, month)
+        except ChronoError:
+            self._report_lines_before_error(string, month)
+            raise
+        return self.add_month_records(records, month)
+
+    def _report_lines_before_error(self, string: str, month: str):
+        """Report the lines of a month file string before its first line that
+        can't be tokenized.
+
+        The whole file is tokenized before any day is reported, so this
+        raises the error of an earlier line, e.g. a date reported twice,
+        before the tokenizer's error, as reporting line by line would.
+        """
+        records = tokenize_lines_before_error(string, month)
+        if records:
+            self.add_month_records(records, month)
+
+    def add_month_records(self, records: List[DayRecord], month: str) -> Month:
+        """Report a month's parsed day records, in order.
+
+        Records are first loaded in one pass (see Month.load_records). If
+        that is refused they are reported day by day, which raises the
+        error of the first bad record.
+        :param records:  Records as returned by tokenize_month_string.
+        :param month:  Month string (e.g. "YYYY-MM").
+        """
+        if self.user is None:
+            parsed_month = Month(month)
+            if parsed_month.load_records(records):
+                return parsed_month
+        else:
+            loaded_month = self.user.load_records(month, records)
+            if loaded_month is not None:
+                return loaded_month
+            parsed_month = Month(month)
+
+        for record in records:
+            try:
+                ordinal = date(parsed_month.year, parsed_month.month,
+                               record.day).toordinal()
+            except ValueError:
+                raise BadDateError("Bad date string: \"{}\"".format(
+                    date_string(parsed_month, record.day)))
+
+            if self.user is None:
+                parsed_day = parsed_month.add_ordinal(ordinal)
             else:
-                raise ParseError(
-                    "Could not parse date in {m.year}-{m.month:02}: \"{}\""
-                    .format(token, m=parsed_month))
-            while line_tokens:
-                token = line_tokens.pop(0)
-                if sick_pattern.match(token):
-                    parsed_day.set_type(DayType.sick_day)
-                elif vacation_pattern.match(token):
-                    parsed_day.set_type(DayType.vacation)
-                else:
-                    hour_match = hour_pattern.match(token)
-                    time_match = time_pattern.match(token)
-                    if hour_match:
-                        hours = hour_match.group(1)
-                        if parsed_day.start_time is None:
-                            raise ParseError(
-                                "Could not parse start time for date {}. Time "
-                                "must be given in hours and minutes, got "
-                                "\"{}\".".format(parsed_day.date, hours))
-
-                        elif parsed_day.lunch_duration is None:
-                            parsed_day.report_lunch_duration(hours)
-                        elif parsed_day.end_time is None:
-                            raise ParseError(
-                                "End time must be given with hours and "
-                                "minutes, was '{}'.".format(hours))
-                        else:
-                            parsed_day.report_deviation(hours)
-                    elif time_match:
-                        time = time_match.group(1)
-                        if parsed_day.start_time is None:
-                            parsed_day.report_start_time(time)
-                        elif parsed_day.lunch_duration is None:
-                            parsed_day.report_lunch_duration(time)
-                        elif parsed_day.end_time is None:
-                            parsed_day.report_end_time(time)
-                        else:
-                            parsed_day.report_deviation(time)
-                    else:
-                        if parsed_day.start_time is None:
-                            raise ParseError(
-                                "Could not parse start time for date "
-                                "{}: \"{}\"".format(parsed_day.date, token))
-
-                        elif parsed_day.lunch_duration is None:
-                            raise ParseError(
-                                "Could not parse lunch duration for date "
-                                "{}: \"{}\"".format(parsed_day.date, token))
-                        elif parsed_day.end_time is None:
-                            raise ParseError(
-                                "Could not parse end time for date "
-                                "{}: \"{}\"".format(parsed_day.date, token))
-                        else:
-                            raise ParseError(
-                                "Could not parse deviation for date "
-                                "{}: \"{}\"".format(parsed_day.date, token))
-
-                if comment:
-                    if comment[0] != comment[-1]:
-                        raise ParseError(
-                            "No endquote in comment for date {}.".format(
-                                parsed_day.date.isoformat()))
-
-                    parsed_day.comment = comment.strip("\"\'")
+                parsed_day = self.user.add_ordinal(ordinal)
+            if record.day_type is not None:
+                parsed_day.set_type(record.day_type)
+            if record.start is not None:
+                parsed_day.report_start_minutes(record.start)
+            if record.lunch is not None:
+                parsed_day.report_lunch_minutes(record.lunch)
+            if record.end is not None:
+                parsed_day.report_end_minutes(record.end)
+            if record.deviation is not None:
+                parsed_day.report_deviation_minutes(record.deviation)
+            if record.comment is not None:
+                parsed_day.comment = record.comment
         if self.user is None:
             return parsed_month
         else:
             return self.user.years[-1].months[-1]
 
+    def report_records(self, records: List[DayRecord],
+                       month: str) -> Optional[Month]:
+        """Report day records to the user, e.g. from chrono report --batch.
+
+        Unlike add_month_records, records may be for days that are already
+        reported, to complete them. Times already reported must have the
+        same value in the record.
+        :param month:  Month string (e.g. "YYYY-MM").
+        :returns:  The month of the records, or None if there are no
+                   records and no days reported in the month.
+        :raises: errors.ChronoError
+        """
+        parsed_month = Month(month)
+        for record in records:
+            try:
+                day_date = date(parsed_month.year, parsed_month.month,
+                                record.day)
+            except ValueError:
+                raise BadDateError("Bad date string: \"{}\"".format(
+                    date_string(parsed_month, record.day)))
+
+            reported_day = self.user.get_day(day_date.isoformat())
+            if reported_day is None:
+                reported_day = self.user.add_ordinal(day_date.toordinal())
+            if record.day_type is not None:
+                reported_day.set_type(record.day_type)
+            if (record.start is not None and
+                    _minutes(reported_day.start_time) != record.start):
+                reported_day.report_start_minutes(record.start)
+            if (record.lunch is not None and
+                    reported_day.lunch_duration !=
+                    timedelta(minutes=record.lunch)):
+                reported_day.report_lunch_minutes(record.lunch)
+            if (record.end is not None and
+                    _minutes(reported_day.end_time) != record.end):
+                reported_day.report_end_minutes(record.end)
+            if record.deviation is not None:
+                reported_day.report_deviation_minutes(record.deviation)
+            if record.comment is not None:
+                reported_day.comment = record.comment
+
+        reported_month = self.user.get_month(parsed_month.year,
+                                             parsed_month.month)
+        if reported_month is not None:
+            reported_month.checkpoint = None
+        return reported_month
+
+    def parse_data_folder(self, data_folder: str,
+                          cache: Optional[MonthCache] = None,
+                          ledger: Optional[Ledger] = None,
+                          workers: int = 1,
+                          first_month: Optional[str] = None) -> User:
+        """Parse the user file, year files and month files of a data folder.
+        :param data_folder:  Folder with user.cfg, <year>.cfg and
+                             <year>-<month>.txt files.
+        :param cache:  Month cache used to skip parsing unchanged month
+                       files.
+        :param ledger:  Ledger with totals for complete months. Complete
+                        months missing in the ledger are recorded.
+        :param workers:  Number of processes tokenizing month files. Months
+                         are still reported to the user one by one, in
+                         order.
+        :param first_month:  Only parse month files from this month (e.g.
+                             "YYYY-MM") onwards, see User.start_at.
+        """
+        self.parse_user_file(os.path.join(data_folder, "user.cfg"))
+        year_files = [f[:4] for f in os.listdir(data_folder)
+                      if f.endswith(".cfg") and len(os.path.basename(f)) == 8]
+
+        month_files = sorted(glob(os.path.join(
+            data_folder, "[1-2][0-9][0-9][0-9]-[0-1][0-9].txt")))
+        if first_month is not None:
+            month_files = [
+                month_file for month_file in month_files
+                if os.path.basename(month_file)[:7] >= first_month]
+            if month_files:
+                self.user.start_at(os.path.basename(month_files[0])[:7])
+        self.parse_month_files(month_files, year_files, cache=cache,
+                               ledger=ledger, workers=workers)
+        self.apply_journal(data_folder, first_month=first_month)
+        return self.user
+
+    def apply_journal(self, data_folder: str,
+                      first_month: Optional[str] = None, start: int = 0):
+        """Report the events of the data folder's journal to the user, see
+        chrono.journal. Events are applied again without changes, so events
+        already applied can be read again.
+        :param first_month:  Skip events before this month (e.g. "YYYY-MM").
+        :param start:  Offset in the journal to read events from.
+        """
+        events, self.journal_end = journal.read_events(data_folder, start)
+        if first_month is not None:
+            events = [event for event in events if event.date >= first_month]
+        journal.apply_events(self.user, events)
+
+    def compact_journal(self, data_folder: str,
+                        fsync: bool = False) -> List[str]:
+        """Write the applied journal events to the month files, see
+        journal.compact.
+        :returns:  Paths of the written month files.
+        """
+        month_files = journal.compact(self.user, data_folder,
+                                      self.journal_end, fsync=fsync)
+        self.journal_end = 0
+        return month_files
+
+    def parse_month_files(self, month_files: List[str], year_files: List[str],
+                          cache: Optional[MonthCache] = None,
+                          ledger: Optional[Ledger] = None,
+                          workers: int = 1):
+        """Report month files to the user, in order. See parse_data_folder.
+        :param month_files:  Paths of the month files.
+        :param year_files:  Years whose year file is parsed before the first
+                            of their month files.
+        """
+        year_files = list(year_files)
+        cached_records = {}
+        if cache is not None:
+            for month_file in month_files:
+                records = cache.load(month_file)
+                if records is not None:
+                    cached_records[month_file] = records
+        uncached_files = [month_file for month_file in month_files
+                          if month_file not in cached_records]
+
+        if workers > 1 and len(uncached_files) > 1:
+            executor = ProcessPoolExecutor(max_workers=workers)
+            tokenized_files = executor.map(
+                tokenize_month_file, uncached_files,
+                chunksize=len(uncached_files) // (workers * 4) + 1)
+        else:
+            executor = None
+            tokenized_files = map(tokenize_month_file, uncached_files)
+
+        try:
+            for month_file in month_files:
+                year = os.path.basename(month_file)[:4]
+                if year in year_files:
+                    self.parse_year_file(os.path.join(
+                        os.path.dirname(month_file), "{}.cfg".format(year)))
+
+                    year_files.remove(year)
+                month, _ = os.path.splitext(os.path.basename(month_file))
+                if month_file in cached_records:
+                    records = cached_records[month_file]
+                else:
+                    try:
+                        records, fingerprint = next(tokenized_files)
+                    except ChronoError:
+                        with open(month_file, "r",
+                                  encoding='utf-8') as month_data:
+                            self._report_lines_before_error(
+                                month_data.read(), month)
+                        raise
+                    if cache is not None:
+                        cache.store(month_file, records, fingerprint)
+                parsed_month = self.add_month_records(records, month)
+                if ledger is not None:
+                    self._checkpoint_month(parsed_month, month_file, ledger)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        if cache is not None:
+            cache.save()
+        if ledger is not None:
+            ledger.save()
+
+    @staticmethod
+    def _checkpoint_month(parsed_month: Month, file_name: str,
+                          ledger: Ledger):
+        month_string, _ = os.path.splitext(os.path.basename(file_name))
+        if (month_string != "{}-{:02d}".format(parsed_month.year,
+                                                parsed_month.month) or
+                len(parsed_month.days) == 0):
+            return
+
+        fingerprint = file_fingerprint(
+            file_name, ledger.fingerprint(month_string))
+
+        checkpoint = ledger.checkpoint(parsed_month, fingerprint)
+        if checkpoint is not None:
+            parsed_month.checkpoint = checkpoint
+        elif parsed_month.complete():
+            ledger.record(parsed_month, fingerprint)
+            parsed_month.checkpoint = parsed_month.totals()
+        else:
+            ledger.invalidate(month_string)
+
     def parse_archive_file(self, file_name: str) -> Archive:
+        """Parse an archive file. Archives ending with ".gz" or ".xz" are
+        decompressed while they're parsed.
+        """
         parsed_archive = Archive()
-        with open(file_name, "r") as month_file:
-            archive_string = month_file.read()
-        month_pattern = re.compile("^([0-9]{4}-[01][0-9])\n",
-                                   flags=re.MULTILINE)
-
-        month_tokens = [string for string in
-                        month_pattern.split(archive_string) if string]
-
-        month_tokens = zip(*(iter(month_tokens),) * 2)
-        for month, month_string in month_tokens:
-            parsed_month = self.parse_month_string(month_string, month)
-            parsed_archive.archive_month(parsed_month)
+        with open_archive_file(file_name) as archive_file:
+            for parsed_month in self.iter_archive_months(archive_file):
+                parsed_archive.archive_month(parsed_month)
         return parsed_archive
 
+    def iter_month_records(self, month_file: IO,
+                           month: Optional[str] = None
+                           ) -> Iterator[DayRecord]:
+        """Read the day records of a month file line by line.
+        :param month_file:  Text or binary file object, e.g. standard input
+                            or a gzip file.
+        :param month:  Month string (e.g. "YYYY-MM"). Defaults to the month
+                       of the file object's name, and is required if the
+                       name doesn't start with one.
+        :raises: errors.ParseError
+        """
+        if month is None:
+            name = str(getattr(month_file, "name", ""))
+            month = os.path.basename(name)[:7]
+            if not _MONTH_HEADER.match(month):
+                raise ParseError(
+                    "Month of month file \"{}\" is unknown, it must be given "
+                    "as \"YYYY-MM\".".format(name))
+        parsed_month = Month(month)
+        for line in month_file:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            record = tokenize_line(line.rstrip("\r\n"), parsed_month)
+            if record is not None:
+                yield record
+
+    def iter_archive_months(self, archive_file: IO) -> Iterator[Month]:
+        """Read the months of an archive file line by line. Each month is
+        yielded when its last line is read, so only one month's lines are
+        kept in memory.
+        :param archive_file:  Text or binary file object, e.g. standard
+                              input or a gzip file.
+        :raises: errors.ParseError
+        """
+        month = None
+        lines = []
+        for line in archive_file:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            line = line.rstrip("\r\n")
+            if _MONTH_HEADER.match(line):
+                if month is not None:
+                    yield self.parse_month_string("\n".join(lines), month)
+                month = line
+                lines = []
+            elif month is not None:
+                lines.append(line)
+            elif line and not line.isspace():
+                raise ParseError(
+                    "Archive lines must follow a month header (e.g. "
+                    "\"YYYY-MM\"), got \"{}\"".format(line))
+        if month is not None:
+            yield self.parse_month_string("\n".join(lines), month)
+
     def parse_year_file(self, file_name: str) -> Year:
         year = os.path.splitext(os.path.basename(file_name))[0]
         if self.user is not None:
@@ -149,6 +380,10 @@ class Parser(object):
 
             elif len(self.user.years) == 0:
                 raise Exception
+            elif self.user.get_year(int(year)) is not None:
+                # Keep the start of a history added with User.start_at.
+                parsed_year = Year(year, start_date=self.user.get_year(
+                    int(year)).force_start_date)
             else:
                 parsed_year = Year(year)
         else:
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""Worked hours today and flextime balance, for the status command.
+
+The status is meant to be printed often, e.g. in a shell prompt, so it's
+read from the current month file, the journal and a balance summary kept in
+the cache folder instead of parsing the data folder. The summary is written
+whenever the whole data folder is parsed for the status command. It holds the
+flextime earned before the current month, the current month's holidays and
+the modification time and size of every other data file. Reporting to the
+current month, in its month file or in the journal, keeps the summary valid,
+any other change to the data folder means it must be parsed again.
+"""
+
+from datetime import date, datetime, timedelta
+import json
+import os
+from typing import TYPE_CHECKING, Optional
+
+from chrono.cache import JOURNAL_FILE, MONTH_FILE, folder_snapshot
+from chrono.errors import ChronoError
+from chrono.time_utilities import pretty_timedelta
+from chrono.tokenizer import tokenize_month_string
+
+if TYPE_CHECKING:
+    from chrono.day import Day
+
+SUMMARY_VERSION = 1
+SUMMARY_FILE = "status.json"
+
+
+def status_line(last_day: Optional["Day"], flextime: timedelta) -> str:
+    """Return worked hours today and the flextime balance.
+    :param last_day:  The last reported day.
+    """
+    worked_hours = "0:00"
+    if last_day is not None and last_day.date == date.today():
+        if last_day.complete():
+            worked_hours = pretty_timedelta(last_day.worked_hours())
+        elif last_day.start_time is not None:
+            worked_hours = "{} ...".format(pretty_timedelta(
+                last_day.worked_hours(end_time=datetime.now())))
+    return "Today: {} | Flextime: {}".format(
+        worked_hours, pretty_timedelta(flextime, signed=True))
+
+
+def write_summary(user, data_folder: str, cache_folder: str):
+    """Record the balance summary of a parsed data folder.
+    :param user:  The user parsed from the data folder.
+    """
+    current_month = user.current_month()
+    if current_month is None:
+        return
+    month_string = "{}-{:02d}".format(current_month.year, current_month.month)
+    snapshot = folder_snapshot(data_folder)
+    if snapshot.pop("{}.txt".format(month_string), None) is None:
+        return
+    snapshot.pop(JOURNAL_FILE, None)
+
+    previous_flextime = (user.calculate_flextime() -
+                         current_month.calculate_flextime())
+    summary = {"version": SUMMARY_VERSION,
+               "month": month_string,
+               "flextime": int(previous_flextime.total_seconds()),
+               "holidays": current_month.holidays,
+               "files": snapshot}
+    os.makedirs(cache_folder, exist_ok=True)
+    file_name = os.path.join(cache_folder, SUMMARY_FILE)
+    temp_name = "{}.{}.tmp".format(file_name, os.getpid())
+    with open(temp_name, "w", encoding='utf-8') as summary_file:
+        json.dump(summary, summary_file, sort_keys=True)
+    os.replace(temp_name, file_name)
+
+
+def read_status(data_folder: str, cache_folder: str) -> Optional[str]:
+    """Return the status line from the current month file and the balance
+    summary, or None if the summary is missing or out of date.
+    """
+    try:
+        with open(os.path.join(cache_folder, SUMMARY_FILE), "r",
+                  encoding='utf-8') as summary_file:
+            summary = json.load(summary_file)
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(summary, dict) or
+            summary.get("version") != SUMMARY_VERSION):
+        return None
+
+    snapshot = folder_snapshot(data_folder)
+    month_file = "{}.txt".format(summary["month"])
+    month_files = [name for name in snapshot if MONTH_FILE.match(name)]
+    if month_file not in snapshot or max(month_files) != month_file:
+        return None
+    del snapshot[month_file]
+    journal_size = snapshot.pop(JOURNAL_FILE, (0, 0))[1]
+    if snapshot != {name: tuple(stat)
+                    for name, stat in summary["files"].items()}:
+        return None
+
+    with open(os.path.join(data_folder, month_file), "r",
+              encoding='utf-8') as current_file:
+        string = current_file.read()
+    try:
+        records = tokenize_month_string(string, summary["month"])
+    except ChronoError:
+        return None
+
+    from chrono.day import Day, parse_date
+    from chrono.month import Month
+
+    current_month = Month(summary["month"])
+    for date_string, name in summary["holidays"].items():
+        current_month.add_holiday(date_string, name)
+    # Bad records and months not starting on their first workday, like the
+    # month of the employed date, are left to the full parse.
+    if not current_month.load_records(records):
+        return None
+    if journal_size:
+        from chrono import journal
+
+        try:
+            events, _ = journal.read_events(data_folder)
+            for event in events:
+                # Events of other months may not be in the summary.
+                if not event.date.startswith(summary["month"]):
+                    return None
+                row = current_month.store.find(
+                    parse_date(event.date).toordinal())
+                if row is None:
+                    day = current_month.add_day(event.date)
+                else:
+                    day = Day.from_row(current_month.store, row)
+                journal.apply_event(day, event)
+        except ChronoError:
+            return None
+
+    rows = current_month.rows()
+    flextime = timedelta(
+        seconds=summary["flextime"],
+        minutes=current_month.store.flextime_minutes(rows.start, rows.stop))
+    last_day = None
+    if rows:
+        last_day = Day.from_row(current_month.store, rows.stop - 1)
+    return status_line(last_day, flextime)
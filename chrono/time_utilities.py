@@ -26,3 +26,12 @@ def pretty_timedelta(timedelta: timedelta, signed: bool = False) -> str:
 
     formated_timedelta = "{}{}:{:02}".format(sign, hours, minutes)
     return formated_timedelta
+
+
+def pretty_minutes(minutes: int) -> str:
+    """Format minutes as hours and minutes (e.g. "8:05").
+    :param int minutes:
+    :return string:
+    """
+    sign = "-" if minutes < 0 else ""
+    return "{}{}:{:02}".format(sign, abs(minutes) // 60, abs(minutes) % 60)
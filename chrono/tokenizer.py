@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+from collections import namedtuple
+import os
+import re
+from typing import List, Optional, Tuple
+
+from chrono.cache import Fingerprint, make_fingerprint
+from chrono.day import DayType
+from chrono.errors import BadDateError, BadTimeError, ChronoError, ParseError
+
+DayRecord = namedtuple(
+    "DayRecord", "day start lunch end deviation day_type comment")
+
+# Year and month of the lines of a month file. The tokenizer doesn't import
+# chrono.month, so that the status command can tokenize the current month
+# without it.
+MonthKey = namedtuple("MonthKey", "year month")
+
+
+_COMMENT_PATTERN = re.compile("([\"\'].*[\"\'])\\s*$")
+
+
+def tokenize_month_string(string: str, month: str) -> List[DayRecord]:
+    """Split a month file string into one record per reported day.
+
+    Records only depend on the file content so they can be cached and
+    reported to a user later with Parser.add_month_records. Times are given
+    in minutes: start and end since midnight, lunch and deviation as
+    durations.
+    :param string:  Content of a month file.
+    :param month:  Month string (e.g. "YYYY-MM").
+    :raises: errors.ParseError, errors.BadTimeError
+    """
+    parsed_month = month_key(month)
+    records = []
+    for line in string.split("\n"):
+        record = tokenize_line(line, parsed_month)
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def tokenize_lines_before_error(string: str, month: str) -> List[DayRecord]:
+    """Return the records of the lines of a month file string before the
+    first line that can't be tokenized, see tokenize_month_string.
+    """
+    parsed_month = month_key(month)
+    records = []
+    for line in string.split("\n"):
+        try:
+            record = tokenize_line(line, parsed_month)
+        except ChronoError:
+            break
+        if record is not None:
+            records.append(record)
+    return records
+
+
+def month_key(month: str) -> MonthKey:
+    """Return year and month of a month string (e.g. "YYYY-MM").
+    :raises: errors.BadDateError
+    """
+    match = re.match("^(\\d{4})-([0-1][0-9])$", month)
+    if not match:
+        raise BadDateError("Bad date string: \"{}\"".format(month))
+    return MonthKey(int(match.group(1)), int(match.group(2)))
+
+
+def tokenize_line(line: str, parsed_month: MonthKey) -> Optional[DayRecord]:
+    """Tokenize one line of a month file, see tokenize_month_string.
+    :param parsed_month:  Month of the line, e.g. a MonthKey or a Month.
+    :returns:  The line's record, or None for a blank line.
+    :raises: errors.ParseError, errors.BadTimeError
+    """
+    if not line or line.isspace():
+        return None
+    comment = None
+    if "\"" in line or "\'" in line:
+        match = _COMMENT_PATTERN.search(line)
+        if match:
+            comment = match.group(1)
+            line = line[:match.start()]
+
+    line_tokens = line.split()
+    token = line_tokens[0] if line_tokens else ""
+    if (2 <= len(token) <= 3 and token[-1] == "." and
+            token[:-1].isdecimal()):
+        day = int(token[:-1])
+    else:
+        raise ParseError(
+            "Could not parse date in {m.year}-{m.month:02}: \"{}\""
+            .format(token, m=parsed_month))
+
+    bad_comment = comment is not None and comment[0] != comment[-1]
+    start = lunch = end = deviation = day_type = None
+    position = 0
+    for token in line_tokens[1:]:
+        length = len(token)
+        if length == 1 and token in "SsVv":
+            if token in "Ss":
+                day_type = DayType.sick_day
+            else:
+                day_type = DayType.vacation
+        elif (4 <= length <= 5 and token[-3] == ":" and
+                token[-2:].isdecimal() and token[:-3].isdecimal()):
+            hours = int(token[:-3])
+            minutes = int(token[-2:])
+            if position == 0:
+                if hours > 23 or minutes > 59:
+                    raise BadTimeError(
+                        "Bad start time: \"{}\".".format(token))
+                start = hours * 60 + minutes
+            elif position == 1:
+                lunch = hours * 60 + minutes
+            elif position == 2:
+                if hours > 23 or minutes > 59:
+                    raise BadTimeError(
+                        "Bad end time: \"{}\"".format(token))
+                end = hours * 60 + minutes
+            else:
+                deviation = hours * 60 + minutes
+            position += 1
+        elif length <= 2 and token.isdecimal():
+            if position == 0:
+                raise ParseError(
+                    "Could not parse start time for date {}. Time "
+                    "must be given in hours and minutes, got "
+                    "\"{}\".".format(date_string(parsed_month, day), token))
+
+            elif position == 1:
+                lunch = int(token) * 60
+            elif position == 2:
+                raise ParseError(
+                    "End time must be given with hours and "
+                    "minutes, was '{}'.".format(token))
+            else:
+                deviation = int(token) * 60
+            position += 1
+        elif (position >= 2 and 5 <= length <= 6 and token[0] == "+" and
+                token[-3] == ":" and token[-2:].isdecimal() and
+                token[1:-3].isdecimal()):
+            # A signed deviation, as written by Day.export, can be given
+            # after the lunch duration, before the end time.
+            deviation = int(token[1:-3]) * 60 + int(token[-2:])
+        else:
+            raise ParseError(_BAD_TOKEN_MESSAGES[min(position, 3)].format(
+                date_string(parsed_month, day), token))
+
+        if bad_comment:
+            raise ParseError("No endquote in comment for date {}.".format(
+                date_string(parsed_month, day)))
+
+    if comment is not None and len(line_tokens) > 1:
+        comment = comment.strip("\"\'")
+    else:
+        comment = None
+    return DayRecord(day, start, lunch, end, deviation, day_type, comment)
+
+
+_MONTH_HEADER = re.compile("^([0-9]{4}-[01][0-9])\n", flags=re.MULTILINE)
+
+
+def tokenize_months_string(string: str, month: str
+                           ) -> List[Tuple[str, List[DayRecord]]]:
+    """Split lines of several months, under YYYY-MM headers like in an
+    archive file, into day records.
+    :param month:  Month string (e.g. "YYYY-MM") of lines before the first
+                   header.
+    :returns:  Month strings and their records, in order.
+    :raises: errors.ParseError, errors.BadTimeError
+    """
+    tokens = _MONTH_HEADER.split(string)
+    months = []
+    if tokens[0].strip():
+        months.append((month, tokenize_month_string(tokens[0], month)))
+    for month_string, month_lines in zip(tokens[1::2], tokens[2::2]):
+        months.append((month_string,
+                       tokenize_month_string(month_lines, month_string)))
+    return months
+
+
+_BAD_TOKEN_MESSAGES = (
+    "Could not parse start time for date {}: \"{}\"",
+    "Could not parse lunch duration for date {}: \"{}\"",
+    "Could not parse end time for date {}: \"{}\"",
+    "Could not parse deviation for date {}: \"{}\"")
+
+
+def date_string(month: MonthKey, day: int) -> str:
+    """Return the date string (e.g. "YYYY-MM-DD") of a day of a month.
+    :param month:  E.g. a MonthKey or a Month.
+    """
+    return "{m.year}-{m.month:02d}-{0:02d}".format(day, m=month)
+
+
+def tokenize_month_file(file_name: str) -> Tuple[List[DayRecord],
+                                                 Fingerprint]:
+    """Tokenize a month file.
+    :returns: The day records and the fingerprint of the tokenized content.
+    :raises: errors.ParseError
+    """
+    month, _ = os.path.splitext(os.path.basename(file_name))
+    file_stat = os.stat(file_name)
+    with open(file_name, "rb") as month_file:
+        data = month_file.read()
+    records = tokenize_month_string(data.decode('utf-8'), month)
+    return records, make_fingerprint(file_name, data, file_stat)
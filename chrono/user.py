@@ -1,15 +1,19 @@
 # -*- coding: utf-8 -*-
 
+from bisect import bisect_left, bisect_right
 from datetime import datetime
 from datetime import timedelta
 from datetime import date
 from typing import Optional, List
 
-from chrono.day import Day, DayType
+from chrono.day import Day, DayStore, DayType, parse_date
 from chrono import month
 from chrono import year
+from chrono import engine
 from chrono import errors
 from chrono import week
+from chrono.flex_index import FlexIndex
+from chrono.tokenizer import DayRecord
 
 
 class User(object):
@@ -21,13 +25,18 @@ class User(object):
                  extra_vacation: int = 0):
         self.name = name
         self.years = []
+        self.store = DayStore()
+        self.flex_index = FlexIndex(self.store)
+        self.year_index = {}
         if employed_date is not None:
             self.employed_date = datetime.strptime(
                 employed_date, "%Y-%m-%d").date()
 
             self.years.append(year.Year(
                 str(self.employed_date.year),
-                start_date=self.employed_date.isoformat()))
+                start_date=self.employed_date.isoformat(),
+                store=self.store))
+            self.year_index[self.employed_date.year] = self.years[-1]
         else:
             self.employed_date = None
         self.employment = employment
@@ -42,13 +51,93 @@ class User(object):
         :type date_string string:  The new date
         :rtype: Day
         """
+        self._start_next_year()
+        new_day = self.current_year().add_day(date_string)
+        return new_day
+
+    def add_ordinal(self, ordinal: int) -> Day:
+        """Add a day given as a proleptic Gregorian ordinal.
+        :rtype: Day
+        """
+        self._start_next_year()
+        return self.current_year().add_ordinal(ordinal)
+
+    def load_records(self, month_string: str,
+                     records: list) -> Optional[month.Month]:
+        """Add the days of a month's parsed day records in one pass, see
+        Month.load_records. Returns the month, or None if the records must
+        be added one by one.
+        """
+        if not records:
+            return None
+        self._start_next_year()
+        return self.current_year().load_records(month_string, records)
+
+    def add_days_bulk(self, first_date_string: str, last_date_string: str,
+                      day_type: DayType) -> List[month.Month]:
+        """Add the workdays between two dates, both included, as days of a
+        type, e.g. a vacation. Weekends and holidays are skipped. The days
+        of each month are added in one pass, see Month.load_records.
+        :returns:  The months the days were added to.
+        :raises: errors.ReportError
+        """
+        ordinal = parse_date(first_date_string).toordinal()
+        last = parse_date(last_date_string).toordinal()
+        if last < ordinal:
+            raise errors.BadDateError(
+                "Last date {} is before first date {}.".format(
+                    last_date_string, first_date_string))
+
+        months = []
+        while True:
+            self._start_next_year()
+            calendar = self.current_year().calendar
+            ordinal = calendar.next_workday(ordinal)
+            if ordinal > last:
+                return months
+            first_date = date.fromordinal(ordinal)
+            month_string = first_date.strftime("%Y-%m")
+            records = []
+            while (ordinal <= last and
+                   date.fromordinal(ordinal).month == first_date.month):
+                records.append(DayRecord(
+                    date.fromordinal(ordinal).day, None, None, None, None,
+                    day_type, None))
+                ordinal = calendar.next_workday(ordinal + 1)
+
+            added_month = self.load_records(month_string, records)
+            if added_month is None:
+                # Raises the error of the first day that can't be added.
+                for record in records:
+                    self.add_ordinal(first_date.replace(
+                        day=record.day).toordinal()).set_type(day_type)
+                added_month = self.current_month()
+            months.append(added_month)
+
+    def _start_next_year(self):
         if self.next_workday()[:4] == self.next_year():
-            new_year = year.Year(self.next_year())
+            new_year = year.Year(self.next_year(), store=self.store)
             for date, name in self.holidays.items():
-                new_year.add_holiday(date, name)
+                if date.startswith(self.next_year()):
+                    new_year.add_holiday(date, name)
             self.years.append(new_year)
-        new_day = self.current_year().add_day(date_string)
-        return new_day
+            self.year_index[new_year.year] = new_year
+
+    def start_at(self, month_string: str):
+        """Start the reported history at a month instead of at the employed
+        date, to add only recent months. Flextime and vacation then only
+        count days from the month onwards. Must be called before any day is
+        added.
+        :param month_string:  Month string (e.g. "YYYY-MM").
+        """
+        if (self.employed_date is not None and
+                month_string <= self.employed_date.isoformat()[:7]):
+            return
+        start_year = year.Year(month_string[:4],
+                               start_date="{}-01".format(month_string),
+                               store=self.store)
+        self.years = [start_year]
+        self.year_index = {start_year.year: start_year}
 
     def add_year(self, year_object: year.Year):
         if len(year_object.months) != 0:
@@ -62,12 +151,33 @@ class User(object):
                 "Previous year ({}) must be completed first.".format(
                     self.current_year().year))
 
+        year_object.store = self.store
         if (len(self.years) > 0 and
                 year_object.year == self.current_year().year):
             self.years[-1] = year_object
         else:
             year_object.start_date = self.employed_date
             self.years.append(year_object)
+        self.year_index[year_object.year] = year_object
+
+    def truncate(self, month_string: str):
+        """Remove the months from a month onwards, with their days, so they
+        can be added again. Years after the month are removed, the month's
+        own year is kept.
+        :param month_string:  Month string (e.g. "YYYY-MM").
+        """
+        year_number = int(month_string[:4])
+        removed = []
+        while self.years and self.years[-1].year > year_number:
+            removed_year = self.years.pop()
+            del self.year_index[removed_year.year]
+            removed[:0] = removed_year.months
+        if self.years and self.years[-1].year == year_number:
+            removed[:0] = self.years[-1].remove_months(int(month_string[5:7]))
+        rows = [month_object.rows() for month_object in removed
+                if month_object.rows()]
+        if rows:
+            self.store.truncate(rows[0].start)
 
     def add_holiday(self, date_string: str, name: str):
         date = datetime.strptime(date_string, "%Y-%m-%d").date()
@@ -106,15 +216,13 @@ class User(object):
         if self.current_month() is None:
             return None
 
-        all_days = [day for year in self.years
-                    for month in year.months
-                    for day in month.days]
         weekdays = []
         earliest_weekday = 6
-        for day in reversed(all_days):
-            if day.date.weekday() < earliest_weekday:
-                earliest_weekday = day.date.weekday()
-                weekdays.append(day)
+        for row in self._reversed_rows():
+            weekday = (self.store.ordinals[row] - 1) % 7
+            if weekday < earliest_weekday:
+                earliest_weekday = weekday
+                weekdays.append(Day.from_row(self.store, row))
             else:
                 break
         tmp_week = week.Week.from_days(*weekdays)
@@ -126,6 +234,34 @@ class User(object):
         return tmp_week
 
 
+    def get_year(self, year_number: int) -> Optional[year.Year]:
+        return self.year_index.get(year_number)
+
+    def get_month(self, year_number: int,
+                  month_number: int) -> Optional[month.Month]:
+        """Return a month or None if it has no reported days."""
+        year_object = self.year_index.get(year_number)
+        if year_object is None:
+            return None
+        return year_object.get_month(month_number)
+
+    def get_day(self, date_string: str) -> Optional[Day]:
+        """Return a reported day or None if the date isn't reported."""
+        row = self.store.find(parse_date(date_string).toordinal())
+        if row is None:
+            return None
+        return Day.from_row(self.store, row)
+
+    def get_days(self, first_date_string: str,
+                 last_date_string: str) -> List[Day]:
+        """Return the reported days between two dates, both included."""
+        ordinals = self.store.ordinals
+        first = bisect_left(ordinals,
+                            parse_date(first_date_string).toordinal())
+        stop = bisect_right(ordinals,
+                            parse_date(last_date_string).toordinal())
+        return [Day.from_row(self.store, row) for row in range(first, stop)]
+
     def today(self) -> Day:
         """Return the last added day.
         """
@@ -136,13 +272,33 @@ class User(object):
 
     def calculate_flextime(self) -> timedelta:
         flextime = self.flextime
-        for year in self.years:
-            flextime += year.calculate_flextime()
-        return flextime
+        for year_object in self.years:
+            flextime += year_object.flextime
+        return flextime + engine.flextime(self._months())
+
+    def flextime_balance(self, date_string: Optional[str] = None
+                         ) -> timedelta:
+        """Return the flextime balance at the end of a date.
+        :param date_string:  The date. Defaults to the last added day.
+        """
+        if date_string is None:
+            return self.calculate_flextime()
+        at_date = parse_date(date_string)
+        flextime = self.flextime
+        for year_object in self.years:
+            if year_object.year <= at_date.year:
+                flextime += year_object.flextime
+        return flextime + timedelta(
+            minutes=self.flex_index.minutes_at(at_date))
+
+    def flextime_between(self, first_date_string: str,
+                         last_date_string: str) -> timedelta:
+        """Return flextime earned between two dates, both included."""
+        return timedelta(minutes=self.flex_index.minutes_between(
+            parse_date(first_date_string), parse_date(last_date_string)))
 
     def used_vacation(self, date_string: Optional[str] = None):
-        return sum([year.used_vacation(date_string=date_string)
-                    for year in self.years])
+        return engine.used_vacation(self._months(), date_string=date_string)
 
     def vacation_left(self, date_string: Optional[str] = None):
         if date_string is None:
@@ -179,9 +335,20 @@ class User(object):
         return int(unused_vacation_days)
 
     def all_days(self) -> List[Day]:
-        return [day for year in self.years
-                for month in year.months
-                for day in month.days]
+        return [Day.from_row(self.store, row) for row in self._rows()]
+
+    def _months(self):
+        for year_object in self.years:
+            yield from year_object.months
+
+    def _rows(self):
+        for month_object in self._months():
+            yield from month_object.rows()
+
+    def _reversed_rows(self):
+        for year_object in reversed(self.years):
+            for month_object in reversed(year_object.months):
+                yield from reversed(month_object.rows())
 
     def __str__(self):
         user_string = """{user.name}
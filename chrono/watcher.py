@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""Keep a parsed data folder up to date with the files in it.
+
+The standard library has no binding for inotify, so changes are found by
+comparing the modification time and size of the data files, which costs one
+scandir of the data folder per poll.
+"""
+
+import os
+from typing import Dict, Optional, Set
+
+from chrono.cache import (JOURNAL_FILE, MONTH_FILE, USER_FILE, YEAR_FILE,
+                          MonthCache, folder_snapshot)
+from chrono.ledger import Ledger
+from chrono.parser import Parser
+
+
+class Watcher(object):
+    """Parser of a data folder that follows changes to its files.
+
+    When a month file is added, removed or modified, the user's months from
+    that month onwards are removed and reported again, which for an edit of
+    the current month means only that month. Later months are usually
+    reported from cached records. A changed year file does the same from
+    the first month of its year. Events appended to the journal are applied
+    to the user. Changes to the user file, a removed year file or a
+    compacted journal parse the whole data folder again.
+    """
+    def __init__(self, data_folder: str, cache: Optional[MonthCache] = None,
+                 ledger: Optional[Ledger] = None, workers: int = 1):
+        self.data_folder = data_folder
+        self.cache = cache
+        self.ledger = ledger
+        self.workers = workers
+        self.parser = None
+        self.snapshot = {}
+        self.reload()
+
+    def reload(self):
+        """Parse the whole data folder."""
+        snapshot = folder_snapshot(self.data_folder)
+        parser = Parser()
+        parser.parse_data_folder(self.data_folder, cache=self.cache,
+                                 ledger=self.ledger, workers=self.workers)
+        self.parser = parser
+        self.snapshot = snapshot
+
+    def poll(self) -> Set[str]:
+        """Apply changes to the data folder since the last poll.
+        :returns:  Names of the changed files.
+        """
+        snapshot = folder_snapshot(self.data_folder)
+        changed = {name for name in set(snapshot) | set(self.snapshot)
+                   if snapshot.get(name) != self.snapshot.get(name)}
+        if changed:
+            self.refresh(changed, snapshot)
+        return changed
+
+    def accept(self):
+        """Take the data folder as it is now as up to date, e.g. after a
+        report written from the parsed model.
+        """
+        self.snapshot = folder_snapshot(self.data_folder)
+
+    def refresh(self, changed: Set[str], snapshot: Dict[str, tuple]):
+        """Report the changed files again. If that fails the user is left
+        half reported and the data folder must be reloaded.
+        :param changed:  Names of the changed files.
+        :param snapshot:  The folder snapshot the changes were found in.
+        """
+        removed_year_files = [name for name in changed
+                              if YEAR_FILE.match(name) and
+                              name not in snapshot]
+        # A journal that shrunk has been compacted into the month files.
+        journal_size = snapshot.get(JOURNAL_FILE, (0, 0))[1]
+        if (USER_FILE in changed or removed_year_files or
+                journal_size < self.parser.journal_end):
+            self.reload()
+            return
+
+        month_strings = sorted(name[:7] for name in snapshot
+                               if MONTH_FILE.match(name))
+        first_months = []
+        for name in changed:
+            if MONTH_FILE.match(name):
+                first_months.append(name[:7])
+            elif YEAR_FILE.match(name):
+                year_months = [month_string for month_string in month_strings
+                               if month_string.startswith(name[:4])]
+                if year_months:
+                    first_months.append(year_months[0])
+        if first_months:
+            first_month = min(first_months)
+            year_files = {name[:4] for name in snapshot
+                          if YEAR_FILE.match(name)}
+            year_files.difference_update(
+                month_string[:4] for month_string in month_strings
+                if month_string < first_month)
+
+            self.parser.user.truncate(first_month)
+            self.parser.parse_month_files(
+                [os.path.join(self.data_folder, "{}.txt".format(m))
+                 for m in month_strings if m >= first_month],
+                sorted(year_files), cache=self.cache, ledger=self.ledger,
+                workers=self.workers)
+            journal_end = self.parser.journal_end
+            self.parser.apply_journal(self.data_folder,
+                                      first_month=first_month)
+            if JOURNAL_FILE in changed:
+                self.parser.apply_journal(self.data_folder,
+                                          start=journal_end)
+        elif JOURNAL_FILE in changed:
+            self.parser.apply_journal(self.data_folder,
+                                      start=self.parser.journal_end)
+        self.snapshot = snapshot
+
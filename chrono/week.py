@@ -10,17 +10,19 @@ from chrono.time_utilities import pretty_timedelta
 
 
 class Week:
+    __slots__ = ('_week', 'number', 'year', 'monday', 'tuesday', 'wednesday',
+                 'thursday', 'friday', 'saturday', 'sunday')
+
     def __init__(self, year: int, week_number: int):
         self._week = isoweek.Week(year, week_number)
         self.number = week_number
         self.year = year
-        self.monday = day.Day(self._week.monday().isoformat())
-        self.tuesday = day.Day(self._week.tuesday().isoformat())
-        self.wednesday = day.Day(self._week.wednesday().isoformat())
-        self.thursday = day.Day(self._week.thursday().isoformat())
-        self.friday = day.Day(self._week.friday().isoformat())
-        self.saturday = day.Day(self._week.saturday().isoformat())
-        self.sunday = day.Day(self._week.sunday().isoformat())
+        store = day.DayStore()
+        ordinal = self._week.monday().toordinal()
+        (self.monday, self.tuesday, self.wednesday, self.thursday,
+         self.friday, self.saturday, self.sunday) = [
+             day.Day.from_row(store, store.append(ordinal + weekday))
+             for weekday in range(7)]
 
     @classmethod
     def from_days(cls, *args):
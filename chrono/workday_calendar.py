@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+from array import array
+from datetime import date
+
+_WEEK = b"\x01\x01\x01\x01\x01\x00\x00"
+
+
+class WorkdayCalendar(object):
+    """Workdays of a year as a bytearray over date ordinals.
+
+    A day is a workday if it's a weekday and not a holiday. Dates after the
+    year only skip weekends, since the holidays of the next year aren't
+    known. The number of added holidays is kept in changes, so users of
+    the calendar can tell if a cached workday is still valid.
+    """
+    __slots__ = ('year', 'first', 'workdays', 'changes', '_counts')
+
+    def __init__(self, year: int):
+        self.year = year
+        self.first = date(year, 1, 1).toordinal()
+        length = date(year + 1, 1, 1).toordinal() - self.first
+        weekday = (self.first - 1) % 7
+        self.workdays = bytearray(
+            _WEEK[weekday:] + _WEEK * 53)[:length]
+        self.changes = 0
+        self._counts = None
+
+    def add_holiday(self, holiday: date):
+        """Mark a date as a holiday. Dates outside the year are ignored."""
+        if holiday.year == self.year:
+            self.workdays[holiday.toordinal() - self.first] = 0
+            self.changes += 1
+            self._counts = None
+
+    def is_workday(self, ordinal: int) -> bool:
+        index = ordinal - self.first
+        if 0 <= index < len(self.workdays):
+            return self.workdays[index] == 1
+        return (ordinal - 1) % 7 < 5
+
+    def next_workday(self, ordinal: int) -> int:
+        """Return the first workday on or after a date ordinal."""
+        index = ordinal - self.first
+        if 0 <= index < len(self.workdays):
+            index = self.workdays.find(1, index)
+            if index != -1:
+                return self.first + index
+            ordinal = self.first + len(self.workdays)
+        while (ordinal - 1) % 7 >= 5:
+            ordinal += 1
+        return ordinal
+
+    def workdays_between(self, first: int, last: int) -> int:
+        """Count the workdays between two date ordinals of the year, both
+        included.
+        """
+        if self._counts is None:
+            self._counts = array('H', [0])
+            count = 0
+            for workday in self.workdays:
+                count += workday
+                self._counts.append(count)
+        start = min(max(first - self.first, 0), len(self.workdays))
+        stop = min(max(last - self.first + 1, 0), len(self.workdays))
+        if stop <= start:
+            return 0
+        return self._counts[stop] - self._counts[start]
+
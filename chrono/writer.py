@@ -1,37 +1,123 @@
 # -*- coding: utf-8 -*-
 import os
 import re
+from typing import List
 
 from chrono import errors
 
+_BLOCK_SIZE = 4096
 
-def write_line(file_path: str, date_string: str):
-    file_match = re.match("^[1-2][0-9]{3}-[0-2][0-9]\.txt",
-                          os.path.basename(file_path))
-    if not file_match:
-        raise errors.ReportError(
-            "File name is not a month file: \"{}\"".format(file_path))
 
+def write_line(file_path: str, date_string: str, fsync: bool = False):
+    """Write a report line to a month file.
+
+    The last line of the file is replaced if it's for the same date,
+    otherwise the line is appended. Blank lines at the end of the file are
+    removed. A new line is appended with O_APPEND. A replaced line, or
+    removed blank lines, are written to a temporary file that is renamed to
+    the month file, so an interrupted write never leaves a torn line. This
+    copies the file, so replacing costs O(file) while appending is O(1).
+    Month files are at most 31 lines.
+    :param fsync:  Flush the file to disk before returning.
+    """
+    _check_month_file(file_path)
     date_match = re.match("^\s*(\d+)\.\s+.*$", date_string)
     if not date_match:
         raise errors.ReportError("Bad report string: \"{}\"".format(
             date_string))
 
     date = date_match.group(1)
-    date_string = date_string.strip()
-
-    if os.path.exists(file_path):
-        with open(file_path, 'r') as text_file:
-            lines = text_file.readlines()
-        lines = [l.rstrip("\n") for l in lines if l.rstrip()]
-    else:
-        lines = []
-
-    if lines and lines[-1].startswith(date + "."):
-        lines[-1] = date_string
-    else:
-        lines.append(date_string)
-
-    lines = "\n".join(lines)
-    with open(file_path, 'w') as text_file:
-        text_file.write(lines)
+    line = date_string.strip().encode('utf-8')
+
+    try:
+        with open(file_path, 'rb') as month_file:
+            line_start, line_end, size = _last_line(month_file)
+            month_file.seek(line_start)
+            last_line = month_file.read(line_end - line_start)
+            tail = month_file.read()
+            month_file.seek(0)
+            if last_line.startswith(date.encode('utf-8') + b"."):
+                content = month_file.read(line_start) + line
+            elif line_end > 0 and tail in (b"", b"\n"):
+                content = None
+                if not tail:
+                    line = b"\n" + line
+            elif line_end > 0:
+                content = month_file.read(line_end) + b"\n" + line
+            else:
+                content = line if size > 0 else None
+    except FileNotFoundError:
+        content = None
+    if content is not None:
+        _replace(file_path, content, fsync)
+        return
+
+    file_descriptor = os.open(file_path,
+                              os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+    try:
+        os.write(file_descriptor, line)
+        if fsync:
+            os.fsync(file_descriptor)
+    finally:
+        os.close(file_descriptor)
+
+
+def write_month(file_path: str, lines: List[str], fsync: bool = False):
+    """Replace the content of a month file with report lines.
+
+    The lines are written to a temporary file that is renamed to the month
+    file, so the month file is never left half written.
+    :param fsync:  Flush the file to disk before returning.
+    """
+    _check_month_file(file_path)
+    _replace(file_path, "".join("{}\n".format(line.strip())
+                                for line in lines).encode('utf-8'), fsync)
+
+
+def _replace(file_path: str, content: bytes, fsync: bool):
+    """Replace a file through a temporary file."""
+    temp_path = "{}.{}.tmp".format(file_path, os.getpid())
+    with open(temp_path, "wb") as temp_file:
+        temp_file.write(content)
+        temp_file.flush()
+        if fsync:
+            os.fsync(temp_file.fileno())
+    os.replace(temp_path, file_path)
+
+
+def _check_month_file(file_path: str):
+    file_match = re.match("^[1-2][0-9]{3}-[0-2][0-9]\.txt",
+                          os.path.basename(file_path))
+    if not file_match:
+        raise errors.ReportError(
+            "File name is not a month file: \"{}\"".format(file_path))
+
+
+def _last_line(month_file) -> tuple:
+    """Return start and end offset of the last line that isn't blank, and
+    the size of the file. Start and end are 0 if all lines are blank.
+    """
+    size = month_file.seek(0, os.SEEK_END)
+    tail = b""
+    tail_start = size
+    last = None
+    while tail_start > 0:
+        block_start = max(0, tail_start - _BLOCK_SIZE)
+        month_file.seek(block_start)
+        tail = month_file.read(tail_start - block_start) + tail
+        tail_start = block_start
+        if last is None:
+            content = tail.rstrip()
+            if not content:
+                continue
+            last = len(content) - 1 + tail_start
+
+        newline = tail.rfind(b"\n", 0, last - tail_start)
+        if newline != -1 or tail_start == 0:
+            line_end = tail.find(b"\n", last - tail_start)
+            if line_end == -1:
+                line_end = size
+            else:
+                line_end += tail_start
+            return tail_start + newline + 1, line_end, size
+    return 0, 0, size
@@ -1,17 +1,23 @@
 # -*- coding: utf-8 -*-
 
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import re
-from typing import Optional
+from typing import List, Optional
 
 from chrono import month
 from chrono import day
+from chrono import engine
 from chrono import errors
+from chrono.workday_calendar import WorkdayCalendar
 
 
 class Year(object):
+    __slots__ = ('year', 'months', 'flextime', 'force_start_date', 'holidays',
+                 'start_date', 'store', 'month_index', 'calendar')
+
     def __init__(self, year_string: str, flextime: Optional[timedelta] = None,
-                 start_date: Optional[str] = None):
+                 start_date: Optional[str] = None,
+                 store: Optional[day.DayStore] = None):
         if not isinstance(year_string, str):
             raise errors.BadDateError(
                 "Argument year_string must be a string, was \"{}\".".format(
@@ -41,8 +47,12 @@ class Year(object):
 
         self.year = int(year_string)
         self.months = []
+        self.month_index = {}
         self.flextime = flextime or timedelta()
         self.force_start_date = start_date
+        self.start_date = None
+        self.store = store if store is not None else day.DayStore()
+        self.calendar = WorkdayCalendar(self.year)
         self.holidays = {"{}-{:02d}".format(self.year, m): {}
                          for m in range(1, 13)}
 
@@ -57,14 +67,12 @@ class Year(object):
     def next_workday(self) -> str:
         if len(self.months) == 0:
             if self.force_start_date is None:
-                tmp_month_string = "{}-01".format(self.year)
+                first_day = date(self.year, 1, 1)
             else:
-                tmp_month_string = self.force_start_date[:7]
-            tmp_month = month.Month(tmp_month_string)
-            month_holidays = self.holidays[tmp_month_string].items()
-            for date_string, holiday in month_holidays:
-                tmp_month.add_holiday(date_string, holiday)
-            next_workday = tmp_month.next_workday()
+                first_day = datetime.strptime(
+                    self.force_start_date[:7], "%Y-%m").date()
+            next_workday = date.fromordinal(self.calendar.next_workday(
+                first_day.toordinal())).isoformat()
         else:
             next_workday = self.months[-1].next_workday()
         return next_workday
@@ -83,41 +91,79 @@ class Year(object):
         return str(self.year + 1)
 
     def calculate_flextime(self) -> timedelta:
-        flextime = self.flextime
-        for month in self.months:
-            flextime += month.calculate_flextime()
-        return flextime
+        return self.flextime + engine.flextime(self.months)
 
     def sick_days(self) -> int:
-        sick_days = 0
-        for month in self.months:
-            sick_days += month.sick_days()
-        return sick_days
+        return engine.sick_days(self.months)
 
     def used_vacation(self, date_string: Optional[str] = None) -> int:
-        used_vacation = 0
-        for month in self.months:
-            used_vacation += month.used_vacation(date_string=date_string)
-        return used_vacation
+        return engine.used_vacation(self.months, date_string=date_string)
 
     def add_day(self, date_string: str) -> day.Day:
-        new_day = day.Day(date_string)
-        if new_day.date.year != self.year:
+        if day.parse_date(date_string).year != self.year:
             raise errors.ReportError(
                 "New date string didn't match year. {} doesn't include {}."
                 .format(self.year, date_string))
 
+        return self._current_month().add_day(date_string)
+
+    def add_ordinal(self, ordinal: int) -> day.Day:
+        """Add a day given as a proleptic Gregorian ordinal."""
+        new_date = date.fromordinal(ordinal)
+        if new_date.year != self.year:
+            raise errors.ReportError(
+                "New date string didn't match year. {} doesn't include {}."
+                .format(self.year, new_date.isoformat()))
+
+        return self._current_month().add_ordinal(ordinal)
+
+    def load_records(self, month_string: str,
+                     records: list) -> Optional[month.Month]:
+        """Add the days of a month's parsed day records in one pass, see
+        Month.load_records. Returns the month, or None if the records must
+        be added one by one.
+        """
+        if not records or month_string[:4] != str(self.year):
+            return None
+        current_month = self._current_month()
+        if ("{}-{:02d}".format(current_month.year, current_month.month) !=
+                month_string or not current_month.load_records(records)):
+            return None
+        return current_month
+
+    def _current_month(self) -> month.Month:
+        """Return the month the next workday belongs to, adding it if
+        needed.
+        """
         if self.next_workday()[:7] == self.next_month():
-            new_month = month.Month(self.next_month())
-            for date, name in self.holidays[self.next_month()].items():
-                new_month.add_holiday(date, name)
+            new_month = month.Month(self.next_month(), store=self.store,
+                                    calendar=self.calendar)
+            for date_string, name in self.holidays[self.next_month()].items():
+                new_month.add_holiday(date_string, name)
             self.months.append(new_month)
-        day_1 = self.months[-1].add_day(date_string)
-        return day_1
+            self.month_index[new_month.month] = new_month
+        return self.months[-1]
+
+    def remove_months(self, month_number: int) -> List[month.Month]:
+        """Remove the months from month_number onwards and return them.
+        Their days are left in the store, see User.truncate.
+        """
+        removed = [month_object for month_object in self.months
+                   if month_object.month >= month_number]
+        del self.months[len(self.months) - len(removed):]
+        for month_object in removed:
+            del self.month_index[month_object.month]
+        return removed
+
+    def get_month(self, month_number: int) -> Optional[month.Month]:
+        """Return a month of the year or None if it has no reported days.
+        """
+        return self.month_index.get(month_number)
 
     def add_holiday(self, date_string: str, name: str):
         date = datetime.strptime(date_string, "%Y-%m-%d").date()
         self.holidays[date_string[:7]][date_string] = name
+        self.calendar.add_holiday(date)
         for month in self.months:
             if date.month == month.month:
                 month.add_holiday(date_string, name)
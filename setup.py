@@ -10,6 +10,8 @@ setup(
     author='Jonatan Lindström',
     author_email='jonatanlindstromd@gmail.com',
     install_requires=["docopt", "nose", 'isoweek'],
+    extras_require={"numpy": ["numpy"]},
     packages=["chrono"],
-    entry_points={"console_scripts": ["chrono = chrono.chrono:main"]}
+    entry_points={"console_scripts": ["chrono = chrono.chrono:main",
+                                      "chronod = chrono.daemon:main"]}
 )
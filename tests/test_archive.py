@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 
 import datetime
+import os
+import tempfile
 
 import nose.tools as nt
 
@@ -8,6 +10,7 @@ from chrono import archive
 from chrono import month
 from chrono import errors
 from chrono.day import DayType
+from chrono.parser import Parser
 
 
 class TestArchive(object):
@@ -28,7 +31,10 @@ class TestArchive(object):
             month_1.add_day(next_day).report("8:00", "1:00", "17:00")
             next_day = month_1.next_workday()
         month_archive.archive_month(month_1)
-        nt.assert_true(month_1 in month_archive.months)
+        frozen_month = month_archive.months[-1]
+        nt.assert_is_instance(frozen_month, month.FrozenMonth)
+        nt.assert_equal([day.export() for day in frozen_month.days],
+                        [day.export() for day in month_1.days])
 
     def test_calculate_flextime_one_month(self):
         month_archive = archive.Archive()
@@ -154,3 +160,76 @@ class TestArchive(object):
                                 month_archive.archive_month,
                                 month_2)
 
+
+    def test_write_and_parse_compressed_archives(self):
+        month_1 = month.Month("2014-09")
+        next_day = month_1.next_workday()
+        while next_day.startswith("2014-09-"):
+            month_1.add_day(next_day).report("8:00", "1:00", "17:05")
+            next_day = month_1.next_workday()
+        month_1.days[0].comment = "Fika"
+
+        with tempfile.TemporaryDirectory() as folder:
+            for extension in (".txt", ".txt.gz", ".txt.xz"):
+                file_name = os.path.join(folder, "archive" + extension)
+                with archive.open_archive_file(file_name, "w") as archive_file:
+                    archive.write_archive_months(archive_file, [month_1])
+                archive_1 = Parser().parse_archive_file(file_name)
+                nt.assert_equal(
+                    [day.export() for day in archive_1.months[0].days],
+                    [day.export() for day in month_1.days])
+                nt.assert_equal(archive_1.calculate_flextime(),
+                                len(month_1.days) *
+                                datetime.timedelta(minutes=5))
+
+    def test_write_and_append_month(self):
+        month_archive = archive.Archive()
+        months = []
+        for month_string in ("2014-09", "2014-10", "2014-11"):
+            month_1 = month.Month(month_string)
+            next_day = month_1.next_workday()
+            while next_day.startswith(month_string):
+                month_1.add_day(next_day).report("8:00", "1:00", "17:01")
+                next_day = month_1.next_workday()
+            months.append(month_1)
+        month_archive.archive_month(months[0])
+
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, "archive.txt")
+            month_archive.write(file_name)
+            with open(file_name) as archive_file:
+                written = archive_file.read()
+            month_archive.append_month(file_name, months[1])
+            nt.assert_raises(errors.ReportError, month_archive.append_month,
+                             file_name, months[1])
+            with open(file_name) as archive_file:
+                appended = archive_file.read()
+            nt.assert_equal(
+                appended,
+                written + "2014-10\n" + "".join(
+                    "{}\n".format(day.export()) for day in months[1].days))
+            month_archive.append_month(file_name, months[2])
+
+            archive_1 = Parser().parse_archive_file(file_name)
+            nt.assert_equal(archive_1.next_month(), "2014-12")
+            nt.assert_equal(archive_1.calculate_flextime(),
+                            month_archive.calculate_flextime())
+
+    def test_failed_append_month(self):
+        month_archive = archive.Archive()
+        month_1 = month.Month("2014-09")
+        next_day = month_1.next_workday()
+        while next_day.startswith("2014-09-"):
+            month_1.add_day(next_day).report("8:00", "1:00", "17:01")
+            next_day = month_1.next_workday()
+
+        with tempfile.TemporaryDirectory() as folder:
+            file_name = os.path.join(folder, "missing", "archive.txt")
+            nt.assert_raises(OSError, month_archive.append_month,
+                             file_name, month_1)
+        nt.assert_equal(month_archive.next_month(), "")
+        nt.assert_equal(month_archive.months, [])
+        nt.assert_equal(month_archive.calculate_flextime(),
+                        datetime.timedelta())
+        month_archive.archive_month(month_1)
+        nt.assert_equal(month_archive.next_month(), "2014-10")
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+
+import nose.tools as nt
+
+from chrono.cache import MonthCache, file_fingerprint
+from chrono.parser import Parser, tokenize_month_string
+
+
+def save_month_file(string, file_name, folder):
+    full_path = os.path.join(folder, file_name)
+    with open(full_path, "w") as month_file:
+        month_file.write(string)
+    return full_path
+
+
+class TestMonthCache(object):
+    def setup(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = tempfile.TemporaryDirectory()
+
+    def teardown(self):
+        pass
+
+    def test_load_missing_entry(self):
+        cache = MonthCache(self.cache_dir.name)
+        file_name = save_month_file(
+            "1. 8:00 1:00 17:00\n", "2014-09.txt", self.temp_dir.name)
+
+        nt.assert_is_none(cache.load(file_name))
+
+    def test_store_and_load(self):
+        cache = MonthCache(self.cache_dir.name)
+        file_parser = Parser()
+        file_name = save_month_file(
+            "1. 8:00 1:00 17:00\n2. V\n", "2014-09.txt", self.temp_dir.name)
+
+        file_parser.parse_month_file(file_name, cache=cache)
+        nt.assert_equal(cache.load(file_name), tokenize_month_string(
+            "1. 8:00 1:00 17:00\n2. V\n", "2014-09"))
+
+    def test_cached_month_is_not_parsed(self):
+        cache = MonthCache(self.cache_dir.name)
+        file_name = save_month_file(
+            "1. 8:00 1:00 17:00\n", "2014-09.txt", self.temp_dir.name)
+
+        Parser().parse_month_file(file_name, cache=cache)
+        records = cache.load(file_name)
+        records[0] = records[0]._replace(end=18 * 60)
+        cache.store(file_name, records, file_fingerprint(file_name))
+        cache.save()
+
+        month_1 = Parser().parse_month_file(file_name, cache=cache)
+        nt.assert_equal(month_1.days[0].end_time.hour, 18)
+
+    def test_changed_file_is_parsed_again(self):
+        cache = MonthCache(self.cache_dir.name)
+        file_name = save_month_file(
+            "1. 8:00 1:00 17:00\n", "2014-09.txt", self.temp_dir.name)
+
+        Parser().parse_month_file(file_name, cache=cache)
+        save_month_file(
+            "1. 8:00 1:00 17:30\n", "2014-09.txt", self.temp_dir.name)
+
+        month_1 = Parser().parse_month_file(file_name, cache=cache)
+        nt.assert_equal(month_1.days[0].end_time.minute, 30)
+        nt.assert_equal(cache.load(file_name)[0].end, 17 * 60 + 30)
+
+    def test_touched_file_keeps_entry(self):
+        cache = MonthCache(self.cache_dir.name)
+        file_name = save_month_file(
+            "1. 8:00 1:00 17:00\n", "2014-09.txt", self.temp_dir.name)
+
+        Parser().parse_month_file(file_name, cache=cache)
+        stat = os.stat(file_name)
+        os.utime(file_name, ns=(stat.st_atime_ns,
+                                stat.st_mtime_ns + 10 ** 9))
+
+        nt.assert_equal(cache.load(file_name)[0].end, 17 * 60)
+
+    def test_corrupt_entry_is_ignored(self):
+        cache = MonthCache(self.cache_dir.name)
+        file_name = save_month_file(
+            "1. 8:00 1:00 17:00\n", "2014-09.txt", self.temp_dir.name)
+
+        with open(cache.file_name, "wb") as entry_file:
+            entry_file.write(b"not a pickle")
+        nt.assert_is_none(cache.load(file_name))
+        month_1 = Parser().parse_month_file(file_name, cache=cache)
+        nt.assert_equal(len(month_1.days), 1)
+
+    def test_months_are_read_from_one_file(self):
+        file_names = [save_month_file("1. 8:00 1:00 17:00\n",
+                                      "{}.txt".format(month),
+                                      self.temp_dir.name)
+                      for month in ("2014-09", "2014-10")]
+        Parser().parse_month_files(file_names, [],
+                                   cache=MonthCache(self.cache_dir.name))
+        nt.assert_equal(os.listdir(self.cache_dir.name), ["months.pickle"])
+
+        cache = MonthCache(self.cache_dir.name)
+        for file_name in file_names:
+            nt.assert_equal(cache.load(file_name)[0].end, 17 * 60)
+        nt.assert_false(cache.changed)
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+from contextlib import redirect_stdout
+import io
+import os
+import socket
+import tempfile
+import threading
+
+from docopt import docopt
+import nose.tools as nt
+
+from chrono import chrono
+from chrono import daemon
+
+
+def run_in_process(argv):
+    output = io.StringIO()
+    with redirect_stdout(output):
+        chrono.run(docopt(chrono.__doc__, argv=argv))
+    return output.getvalue()
+
+
+def forward(argv, socket_path):
+    output = io.StringIO()
+    with redirect_stdout(output):
+        status = daemon.forward(argv, socket_path=socket_path)
+    return output.getvalue(), status
+
+
+class TestDaemon(object):
+    def setup(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.home = os.environ.get("HOME")
+        os.environ["HOME"] = self.temp_dir.name
+        self.data_folder = os.path.join(self.temp_dir.name, "data")
+        os.mkdir(self.data_folder)
+        with open(os.path.join(self.temp_dir.name, ".chrono"),
+                  "w") as config_file:
+            config_file.write("[Paths]\nData = {}\nCache = {}\n".format(
+                self.data_folder, os.path.join(self.temp_dir.name, "cache")))
+        with open(os.path.join(self.data_folder, "user.cfg"),
+                  "w") as user_file:
+            user_file.write("Name: Jane Doe\nEmployed date: 2014-09-01\n")
+        self.write_month("1. 8:00 1:00 17:30\n2. 8:00 1:00 17:00\n")
+
+        self.socket_path = os.path.join(self.temp_dir.name, "chrono.sock")
+        self.daemon = daemon.Daemon(self.socket_path)
+        self.thread = threading.Thread(target=self.daemon.serve_forever)
+        self.thread.start()
+
+    def teardown(self):
+        self.daemon.shutdown()
+        self.thread.join()
+        self.daemon.server_close()
+        if self.home is None:
+            del os.environ["HOME"]
+        else:
+            os.environ["HOME"] = self.home
+        self.temp_dir.cleanup()
+
+    def write_month(self, string):
+        with open(os.path.join(self.data_folder, "2014-09.txt"),
+                  "w") as month_file:
+            month_file.write(string)
+
+    def test_forward(self):
+        for argv in (["flex"], ["month"], ["day", "2014-09-01"], ["user"]):
+            nt.assert_equal(forward(argv, self.socket_path),
+                            (run_in_process(argv), 0))
+
+    def test_no_daemon(self):
+        nt.assert_is_none(daemon.forward(
+            ["flex"], socket_path=os.path.join(self.temp_dir.name, "none")))
+
+    def test_no_reply(self):
+        socket_path = os.path.join(self.temp_dir.name, "closing.sock")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(socket_path)
+            server.listen(1)
+
+            def close_connection():
+                connection, _ = server.accept()
+                connection.close()
+
+            thread = threading.Thread(target=close_connection)
+            thread.start()
+            nt.assert_is_none(daemon.forward(["flex"],
+                                             socket_path=socket_path))
+            thread.join()
+
+    def test_error(self):
+        output, status = forward(["day", "2014-09-05"], self.socket_path)
+        nt.assert_equal(status, 1)
+        nt.assert_in("No day reported for 2014-09-05.", output)
+        output, status = forward(["no-such-command"], self.socket_path)
+        nt.assert_equal(status, 1)
+        nt.assert_in("Usage:", output)
+
+    def test_changed_data_folder(self):
+        nt.assert_equal(forward(["flex"], self.socket_path),
+                        ("Total flextime: +0:30\n", 0))
+        self.write_month("1. 8:00 1:00 17:30\n2. 8:00 1:00 17:15\n")
+        nt.assert_equal(forward(["flex"], self.socket_path),
+                        ("Total flextime: +0:45\n", 0))
+
+    def test_report(self):
+        forward(["report", "start", "8:00"], self.socket_path)
+        forward(["report", "lunch", "0:30"], self.socket_path)
+        nt.assert_equal(forward(["day", "3"], self.socket_path),
+                        (run_in_process(["day", "3"]), 0))
+        with open(os.path.join(self.data_folder, "2014-09.txt")) as month_file:
+            nt.assert_equal(month_file.read().split("\n")[-1], "3. 8:00 0:30")
+
+    def test_report_to_complete_month(self):
+        self.write_month("".join("{}. 8:00 1:00 17:00\n".format(day)
+                                 for day in (1, 2, 3, 4, 5,
+                                             8, 9, 10, 11, 12,
+                                             15, 16, 17, 18, 19,
+                                             22, 23, 24, 25, 26,
+                                             29, 30)))
+        nt.assert_equal(forward(["flex"], self.socket_path),
+                        ("Total flextime: 0:00\n", 0))
+        nt.assert_equal(forward(["report", "deviation", "1"],
+                                self.socket_path)[1], 0)
+        nt.assert_equal(forward(["flex"], self.socket_path),
+                        ("Total flextime: -1:00\n", 0))
+        nt.assert_equal(forward(["flex"], self.socket_path),
+                        (run_in_process(["flex"]), 0))
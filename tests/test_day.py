@@ -6,6 +6,7 @@ import nose.tools as nt
 
 from chrono import day
 from chrono import errors
+from chrono.tokenizer import DayRecord, tokenize_month_string
 
 
 class TestDay(object):
@@ -202,6 +203,83 @@ class TestDay(object):
             day_1.report_end_time,
             "17:00:00")
 
+    def test_from_ordinal(self):
+        day_1 = day.Day.from_ordinal(datetime.date(2014, 9, 6).toordinal())
+        nt.assert_equal(day_1.date, datetime.date(2014, 9, 6))
+        nt.assert_equal(day_1.day_type, day.DayType.weekend)
+        nt.assert_is_none(day_1.start_time)
+        nt.assert_equal(day_1.deviation, datetime.timedelta())
+
+    def test_report_minutes(self):
+        day_1 = day.Day("2014-09-01")
+        nt.assert_raises_regexp(
+            errors.ReportError,
+            "^Date 2014-09-01 must have a start time before a lunch duration "
+            "can be reported.$",
+            day_1.report_lunch_minutes,
+            60)
+
+        day_1.report_start_minutes(8 * 60 + 5)
+        day_1.report_lunch_minutes(45)
+        day_1.report_end_minutes(17 * 60)
+        day_1.report_deviation_minutes(30)
+        nt.assert_equal(day_1.start_time, datetime.datetime(2014, 9, 1, 8, 5))
+        nt.assert_equal(day_1.lunch_duration, datetime.timedelta(minutes=45))
+        nt.assert_equal(day_1.end_time, datetime.datetime(2014, 9, 1, 17))
+        nt.assert_equal(day_1.deviation, datetime.timedelta(minutes=30))
+        nt.assert_raises_regexp(errors.ReportError,
+                                "^Date 2014-09-01 allready has a start time.$",
+                                day_1.report_start_minutes,
+                                480)
+
+    def test_time_properties(self):
+        day_1 = day.Day("2014-09-01")
+        nt.assert_false(hasattr(day_1, "__dict__"))
+        day_1.start_time = datetime.datetime(2014, 9, 1, 7, 45)
+        day_1.lunch_duration = datetime.timedelta(minutes=50)
+        day_1.end_time = datetime.datetime(2014, 9, 1, 16, 35)
+        day_1.deviation = datetime.timedelta(hours=1)
+        nt.assert_equal(day_1.start_time,
+                        datetime.datetime(2014, 9, 1, 7, 45))
+        nt.assert_equal(day_1.lunch_duration, datetime.timedelta(minutes=50))
+        nt.assert_equal(day_1.end_time, datetime.datetime(2014, 9, 1, 16, 35))
+        nt.assert_equal(day_1.worked_hours(), datetime.timedelta(hours=7))
+        nt.assert_equal(day_1.export(), " 1. 7:45 0:50 +1:00 16:35")
+
+        day_1.end_time = None
+        nt.assert_is_none(day_1.end_time)
+        nt.assert_false(day_1.complete())
+
+    def test_export_is_a_month_file_line(self):
+        day_1 = day.Day("2014-09-01")
+        day_1.report_start_time("7:45")
+        day_1.report_lunch_duration("0")
+        day_1.report_deviation("1:00")
+        day_1.report_end_time("16:35")
+        day_1.comment = "Late train."
+        nt.assert_equal(day_1.export(),
+                        " 1. 7:45 0:00 +1:00 16:35 \"Late train.\"")
+        nt.assert_equal(tokenize_month_string(day_1.export(), "2014-09"),
+                        [DayRecord(1, 465, 0, 995, 60, None, "Late train.")])
+
+        day_2 = day.Day("2014-09-02")
+        day_2.set_type(day.DayType.sick_day)
+        nt.assert_equal(day_2.export(), " 2. S")
+
+    def test_report_bad_minutes(self):
+        day_1 = day.Day("2014-09-01")
+        nt.assert_raises_regexp(errors.BadTimeError,
+                                "^Bad start time: \"24:00\".$",
+                                day_1.report_start_minutes,
+                                24 * 60)
+
+        day_1.report_start_minutes(480)
+        day_1.report_lunch_minutes(60)
+        nt.assert_raises_regexp(errors.BadTimeError,
+                                "^Bad end time: \"-0:01\"$",
+                                day_1.report_end_minutes,
+                                -1)
+
     def test_worked_hours(self):
         day_1 = day.Day("2014-09-01")
         nt.assert_equal(day_1.worked_hours(), datetime.timedelta())
@@ -424,3 +502,64 @@ The answer is blowing in the wind"""
         any_sick_day.comment = "Poor me."
         nt.assert_equal(any_sick_day.list_str(),
                         "Mon 23.  Sickday         Poor me.")
+
+
+class TestDayStore(object):
+    def setup(self):
+        pass
+
+    def teardown(self):
+        pass
+
+    def test_append(self):
+        store = day.DayStore()
+        monday = datetime.date(2014, 9, 1).toordinal()
+        nt.assert_equal(store.append(monday), 0)
+        nt.assert_equal(store.append(monday + 5), 1)
+        nt.assert_equal(len(store), 2)
+        nt.assert_equal(store.day_types[0], day.DayType.working_day.value)
+        nt.assert_equal(store.day_types[1], day.DayType.weekend.value)
+        nt.assert_equal(store.starts[0], day.MISSING)
+        nt.assert_false(store.complete(0))
+        nt.assert_true(store.complete(1))
+
+    def test_row_views(self):
+        store = day.DayStore()
+        row = store.append(datetime.date(2014, 9, 1).toordinal())
+        day_1 = day.Day.from_row(store, row)
+        nt.assert_is(day.Day.from_row(store, row), day_1)
+        nt.assert_equal(day_1.date, datetime.date(2014, 9, 1))
+
+        day_1.report("8:00", "1:00", "17:15")
+        nt.assert_equal(store.starts[row], 8 * 60)
+        nt.assert_equal(store.lunches[row], 60)
+        nt.assert_equal(store.ends[row], 17 * 60 + 15)
+        nt.assert_equal(store.worked_minutes(row), 8 * 60 + 15)
+
+    def test_interned_texts(self):
+        store = day.DayStore()
+        day_1 = day.Day.from_row(store, store.append(735477))
+        day_2 = day.Day.from_row(store, store.append(735478))
+        day_1.comment = "Meeting."
+        day_2.comment = "Meeting."
+        nt.assert_equal(store.comments[0], store.comments[1])
+        nt.assert_equal(len(store.texts), 2)
+        day_2.comment = None
+        nt.assert_is_none(day_2.comment)
+        nt.assert_equal(day_1.comment, "Meeting.")
+
+    def test_flextime_minutes(self):
+        store = day.DayStore()
+        monday = datetime.date(2014, 9, 1).toordinal()
+        for weekday in range(7):
+            store.append(monday + weekday)
+        day.Day.from_row(store, 0).report("8:00", "1:00", "17:30")
+        day.Day.from_row(store, 1).report("8:00", "1:00", "16:00")
+        day.Day.from_row(store, 2).set_type(day.DayType.vacation)
+        day.Day.from_row(store, 3).report_start_time("8:00")
+        day.Day.from_row(store, 5).report("10:00", "0:00", "12:00")
+
+        nt.assert_equal(store.flextime_minutes(0, 7), 30 - 60 + 120)
+        nt.assert_equal(store.flextime_minutes(1, 2), -60)
+        nt.assert_equal(store.count_type(0, 7, day.DayType.vacation), 1)
+        nt.assert_equal(store.count_type(0, 7, day.DayType.weekend), 2)
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+import nose.tools as nt
+from nose.plugins.skip import SkipTest
+
+from chrono import archive
+from chrono import errors
+from chrono import engine
+from chrono import month
+from chrono import user
+from chrono.day import DayType
+
+
+def report_history(user_1, last_date):
+    """Report varied days up to and including last_date."""
+    current_date = datetime.datetime.strptime(
+        user_1.next_workday(), "%Y-%m-%d").date()
+    i = 0
+    while current_date <= last_date:
+        i += 1
+        if current_date.weekday() >= 5:
+            if (i % 9 == 0 and current_date.isoformat()[:7] ==
+                    user_1.next_workday()[:7]):
+                user_1.add_day(current_date.isoformat()).report(
+                    "10:00", "0:00", "12:{:02d}".format(i % 60))
+        elif current_date.isoformat() == user_1.next_workday():
+            new_day = user_1.add_day(current_date.isoformat())
+            if i % 17 == 0:
+                new_day.set_type(DayType.vacation)
+            elif i % 29 == 0:
+                new_day.set_type(DayType.sick_day)
+            elif new_day.day_type == DayType.working_day:
+                new_day.report("8:{:02d}".format(i % 60), "0:45",
+                               "16:{:02d}".format((i * 7) % 60))
+                if i % 5 == 0:
+                    new_day.report_deviation("0:30")
+        current_date += datetime.timedelta(days=1)
+
+
+class TestEngine(object):
+    def setup(self):
+        self.engine = engine.current
+        self.user_1 = user.User(employed_date="2013-03-04")
+        self.user_1.add_holiday("2014-01-01", "New Year's Day")
+        self.user_1.add_holiday("2014-12-24", "Christmas Eve")
+        report_history(self.user_1, datetime.date(2014, 12, 18))
+        self.user_1.add_day(self.user_1.next_workday()).report_start_time(
+            "8:00")
+
+    def teardown(self):
+        engine.current = self.engine
+
+    def object_flextime(self):
+        return sum((day_1.calculate_flextime()
+                    for day_1 in self.user_1.all_days()),
+                   datetime.timedelta())
+
+    def object_count(self, day_type, last_date=None):
+        return len([day_1 for day_1 in self.user_1.all_days()
+                    if day_1.day_type == day_type and
+                    (last_date is None or day_1.date <= last_date)])
+
+    def assert_parity(self):
+        nt.assert_equal(self.user_1.calculate_flextime(),
+                        self.object_flextime())
+        nt.assert_equal(self.user_1.used_vacation(),
+                        self.object_count(DayType.vacation))
+        nt.assert_equal(
+            self.user_1.used_vacation(date_string="2014-07-15"),
+            self.object_count(DayType.vacation, datetime.date(2014, 7, 15)))
+        nt.assert_equal(sum(year_1.sick_days()
+                            for year_1 in self.user_1.years),
+                        self.object_count(DayType.sick_day))
+        for month_1 in self.user_1.years[1].months:
+            nt.assert_equal(month_1.calculate_flextime(),
+                            sum((day_1.calculate_flextime()
+                                 for day_1 in month_1.days),
+                                datetime.timedelta()))
+
+    def test_python_engine(self):
+        engine.current = engine.PythonEngine()
+        self.assert_parity()
+
+    def test_numpy_engine(self):
+        if engine.numpy is None:
+            raise SkipTest("NumPy is not installed.")
+        engine.current = engine.NumpyEngine()
+        self.assert_parity()
+
+    def test_numpy_engine_with_checkpoint(self):
+        if engine.numpy is None:
+            raise SkipTest("NumPy is not installed.")
+        engine.current = engine.PythonEngine()
+        expected_flextime = self.user_1.calculate_flextime()
+        expected_vacation = self.user_1.used_vacation()
+
+        month_1 = self.user_1.years[1].months[2]
+        month_1.checkpoint = month_1.totals()
+        engine.current = engine.NumpyEngine()
+        nt.assert_equal(self.user_1.calculate_flextime(), expected_flextime)
+        nt.assert_equal(self.user_1.used_vacation(), expected_vacation)
+
+    def test_select(self):
+        nt.assert_equal(self.engine.name, "python")
+        nt.assert_raises_regexp(errors.ChronoError,
+                                "^Unknown engine: \"fortran\"$",
+                                engine.select, "fortran")
+        engine.select("python")
+        nt.assert_is_instance(engine.current, engine.PythonEngine)
+        if engine.numpy is not None:
+            engine.select("numpy")
+            nt.assert_equal(engine.current.name, "numpy")
+
+    def test_archive(self):
+        month_archive = archive.Archive()
+        for month_string in ("2014-09", "2014-10"):
+            month_1 = month.Month(month_string)
+            while month_1.next_workday().startswith(month_string):
+                month_1.add_day(month_1.next_workday()).report(
+                    "8:00", "1:00", "17:03")
+            month_1.days[3].set_type(DayType.vacation)
+            month_archive.archive_month(month_1)
+
+        for current in (engine.PythonEngine(), engine.NumpyEngine()):
+            if current.name == "numpy" and engine.numpy is None:
+                continue
+            engine.current = current
+            nt.assert_equal(month_archive.calculate_flextime(),
+                            datetime.timedelta(minutes=43 * 3 + 2 * 483))
+            nt.assert_equal(month_archive.used_vacation(), 2)
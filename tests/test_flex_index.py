@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+import nose.tools as nt
+
+from chrono.day import Day, DayStore, DayType
+from chrono.flex_index import FlexIndex
+
+
+class TestFlexIndex(object):
+    def setup(self):
+        self.store = DayStore()
+        self.index = FlexIndex(self.store)
+        monday = datetime.date(2014, 9, 1).toordinal()
+        for weekday in range(5):
+            row = self.store.append(monday + weekday)
+            Day.from_row(self.store, row).report(
+                "8:00", "1:00", "17:{:02d}".format(weekday * 10))
+
+    def teardown(self):
+        pass
+
+    def test_minutes_at(self):
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 8, 31)), 0)
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 1)), 0)
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 3)), 30)
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 30)), 100)
+
+    def test_minutes_between(self):
+        nt.assert_equal(self.index.minutes_between(
+            datetime.date(2014, 9, 2), datetime.date(2014, 9, 4)), 60)
+        nt.assert_equal(self.index.minutes_between(
+            datetime.date(2014, 9, 5), datetime.date(2014, 9, 10)), 40)
+        nt.assert_equal(self.index.minutes_between(
+            datetime.date(2014, 9, 4), datetime.date(2014, 9, 2)), 0)
+
+    def test_appended_day(self):
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 8)), 100)
+        row = self.store.append(datetime.date(2014, 9, 8).toordinal())
+        new_day = Day.from_row(self.store, row)
+        new_day.report_start_time("7:00")
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 8)), 100)
+        new_day.report_lunch_duration("0:30")
+        new_day.report_end_time("16:00")
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 8)), 130)
+
+    def test_changed_day(self):
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 5)), 100)
+        Day.from_row(self.store, 1).set_type(DayType.vacation)
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 5)), 100 + 480)
+        Day.from_row(self.store, 3).report_deviation("1:00")
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 5)), 100 + 420)
+        nt.assert_equal(
+            self.index.minutes_at(datetime.date(2014, 9, 1)), 0)
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+import os
+import tempfile
+
+import nose.tools as nt
+
+from chrono import errors
+from chrono import journal
+from chrono.day import DayType
+from chrono.journal import Event
+from chrono.parser import Parser
+
+
+class TestJournal(object):
+    def setup(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_folder = self.temp_dir.name
+        self.write_file("user.cfg",
+                        "Name: Jane Doe\nEmployed date: 2014-09-01\n")
+        self.write_file("2014-09.txt", "1. 8:00 1:00 17:00\n"
+                                       "2. 8:00 1:00 17:00\n"
+                                       "3. 8:00\n")
+
+    def teardown(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name, string):
+        with open(os.path.join(self.data_folder, name), "w") as data_file:
+            data_file.write(string)
+
+    def read_file(self, name):
+        with open(os.path.join(self.data_folder, name), "r") as data_file:
+            return data_file.read()
+
+    def test_append_and_read_events(self):
+        journal.append_event(self.data_folder,
+                             Event("2014-09-03", "lunch", "0:45"))
+        journal.append_event(self.data_folder,
+                             Event("2014-09-03", "comment", "Dentist."),
+                             fsync=True)
+        nt.assert_equal(journal.read_events(self.data_folder),
+                        ([Event("2014-09-03", "lunch", "0:45"),
+                          Event("2014-09-03", "comment", "Dentist.")], 50))
+        nt.assert_equal(journal.read_events(self.data_folder, start=22),
+                        ([Event("2014-09-03", "comment", "Dentist.")], 50))
+
+    def test_read_events_without_journal(self):
+        nt.assert_equal(journal.read_events(self.data_folder), ([], 0))
+
+    def test_append_in_progress_is_not_read(self):
+        self.write_file("journal.log", "2014-09-03 lunch 0:45\n2014-09-03 e")
+        nt.assert_equal(journal.read_events(self.data_folder),
+                        ([Event("2014-09-03", "lunch", "0:45")], 22))
+
+    def test_bad_events(self):
+        nt.assert_raises_regexp(errors.ReportError,
+                                "^Bad journal field: \"break\"$",
+                                journal.append_event, self.data_folder,
+                                Event("2014-09-03", "break", "0:45"))
+        nt.assert_raises(errors.ReportError, journal.append_event,
+                         self.data_folder,
+                         Event("2014-09-03", "comment", "Two\nlines"))
+        self.write_file("journal.log", "2014-09-31 lunch 0:45\n")
+        nt.assert_raises_regexp(errors.ParseError,
+                                "^Bad journal line: \"2014-09-31 lunch "
+                                "0:45\"$",
+                                journal.read_events, self.data_folder)
+
+    def test_parse_data_folder_applies_journal(self):
+        self.write_file("journal.log", "2014-09-03 lunch 0:45\n"
+                                       "2014-09-03 end 17:00\n"
+                                       "2014-09-04 type vacation\n"
+                                       "2014-09-05 start 7:30\n"
+                                       "2014-09-05 comment Early bus.\n")
+        parser = Parser()
+        user_1 = parser.parse_data_folder(self.data_folder)
+        nt.assert_equal(parser.journal_end, 120)
+        nt.assert_equal(user_1.get_day("2014-09-03").end_time,
+                        datetime.datetime(2014, 9, 3, 17))
+        nt.assert_equal(user_1.get_day("2014-09-04").day_type,
+                        DayType.vacation)
+        nt.assert_equal(user_1.today().start_time,
+                        datetime.datetime(2014, 9, 5, 7, 30))
+        nt.assert_equal(user_1.today().comment, "Early bus.")
+        nt.assert_equal(user_1.calculate_flextime(),
+                        datetime.timedelta(minutes=15))
+
+    def test_apply_event_again(self):
+        self.write_file("journal.log", "2014-09-03 start 08:00\n"
+                                       "2014-09-03 lunch 0:45\n")
+        user_1 = Parser().parse_data_folder(self.data_folder)
+        nt.assert_equal(user_1.today().lunch_duration,
+                        datetime.timedelta(minutes=45))
+        nt.assert_raises_regexp(
+            errors.ReportError,
+            "^Date 2014-09-03 allready has a start time.$",
+            journal.apply_event, user_1.today(),
+            Event("2014-09-03", "start", "9:00"))
+
+    def test_compact(self):
+        self.write_file("journal.log", "2014-09-03 lunch 0:45\n"
+                                       "2014-09-03 end 17:00\n"
+                                       "2014-09-04 type vacation\n"
+                                       "2014-09-05 start 7:30\n"
+                                       "2014-09-05 comment Early bus.\n")
+        parser = Parser()
+        user_1 = parser.parse_data_folder(self.data_folder)
+        journal.append_event(self.data_folder,
+                             Event("2014-09-05", "lunch", "1:00"))
+        nt.assert_equal(
+            parser.compact_journal(self.data_folder),
+            [os.path.join(self.data_folder, "2014-09.txt")])
+        nt.assert_equal(parser.journal_end, 0)
+        nt.assert_equal(self.read_file("2014-09.txt"),
+                        "1. 8:00 1:00 17:00\n"
+                        "2. 8:00 1:00 17:00\n"
+                        "3. 8:00 0:45 17:00\n"
+                        "4. V\n"
+                        "5. 7:30 \"Early bus.\"\n")
+        # Events appended after the journal was parsed are kept.
+        nt.assert_equal(self.read_file("journal.log"),
+                        "2014-09-05 lunch 1:00\n")
+
+        user_2 = Parser().parse_data_folder(self.data_folder)
+        nt.assert_equal([day.export() for day in user_2.all_days()],
+                        [day.export() for day in user_1.all_days()[:-1]] +
+                        [" 5. 7:30 1:00 \"Early bus.\""])
+        parser = Parser()
+        parser.parse_data_folder(self.data_folder)
+        parser.compact_journal(self.data_folder)
+        nt.assert_false(os.path.exists(
+            os.path.join(self.data_folder, "journal.log")))
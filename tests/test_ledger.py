@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+import os
+import tempfile
+
+import nose.tools as nt
+
+from chrono.cache import file_fingerprint
+from chrono.ledger import Ledger
+from chrono.month import Month, MonthTotals
+from chrono.parser import Parser
+
+
+def save_file(string, file_name, folder):
+    full_path = os.path.join(folder, file_name)
+    with open(full_path, "w") as data_file:
+        data_file.write(string)
+    return full_path
+
+
+def complete_month(month_string, end_time="17:00"):
+    month_1 = Month(month_string)
+    while month_1.next_workday().startswith(month_string):
+        month_1.add_day(month_1.next_workday()).report(
+            "8:00", "1:00", end_time)
+    return month_1
+
+
+class TestLedger(object):
+    def setup(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def teardown(self):
+        pass
+
+    def test_record_and_checkpoint(self):
+        ledger_name = os.path.join(self.temp_dir.name, "ledger.json")
+        month_file = save_file("1.\n", "2014-09.txt", self.temp_dir.name)
+        fingerprint = file_fingerprint(month_file)
+        month_1 = complete_month("2014-09", end_time="17:05")
+
+        ledger_1 = Ledger(ledger_name)
+        ledger_1.record(month_1, fingerprint)
+        ledger_1.save()
+
+        ledger_2 = Ledger(ledger_name)
+        nt.assert_equal(ledger_2.fingerprint("2014-09"), fingerprint)
+        nt.assert_equal(
+            ledger_2.checkpoint(Month("2014-09"), fingerprint),
+            MonthTotals(datetime.timedelta(minutes=5 * 22), 0, 0))
+
+        nt.assert_equal(ledger_2.calculate_flextime(),
+                        datetime.timedelta(minutes=5 * 22))
+
+    def test_changed_file_invalidates_checkpoint(self):
+        ledger_1 = Ledger(os.path.join(self.temp_dir.name, "ledger.json"))
+        month_file = save_file("1.\n", "2014-09.txt", self.temp_dir.name)
+        ledger_1.record(complete_month("2014-09"), file_fingerprint(month_file))
+        save_file("1. V\n", "2014-09.txt", self.temp_dir.name)
+        nt.assert_is_none(ledger_1.checkpoint(
+            Month("2014-09"), file_fingerprint(month_file)))
+
+    def test_changed_holidays_invalidates_checkpoint(self):
+        ledger_1 = Ledger(os.path.join(self.temp_dir.name, "ledger.json"))
+        fingerprint = file_fingerprint(
+            save_file("1.\n", "2014-09.txt", self.temp_dir.name))
+
+        ledger_1.record(complete_month("2014-09"), fingerprint)
+        month_1 = Month("2014-09")
+        month_1.add_holiday("2014-09-01", "Unbirthday")
+        nt.assert_is_none(ledger_1.checkpoint(month_1, fingerprint))
+
+    def test_parse_data_folder_uses_checkpoints(self):
+        save_file("Name: Jane Doe\nEmployed date: 2014-09-01\n",
+                  "user.cfg", self.temp_dir.name)
+
+        month_string = "\n".join("{}. 8:00 1:00 17:01".format(n) for n in (
+            1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 15, 16, 17, 18, 19,
+            22, 23, 24, 25, 26, 29, 30))
+
+        save_file(month_string, "2014-09.txt", self.temp_dir.name)
+        save_file("1. 8:00 1:00 17:00\n2. 8:00", "2014-10.txt",
+                  self.temp_dir.name)
+
+        ledger_name = os.path.join(self.temp_dir.name, "ledger.json")
+        user_1 = Parser().parse_data_folder(
+            self.temp_dir.name, ledger=Ledger(ledger_name))
+
+        ledger_1 = Ledger(ledger_name)
+        nt.assert_equal(sorted(ledger_1.entries), ["2014-09"])
+        nt.assert_equal(ledger_1.calculate_flextime(),
+                        datetime.timedelta(minutes=22))
+
+        user_2 = Parser().parse_data_folder(
+            self.temp_dir.name, ledger=ledger_1)
+
+        nt.assert_is_not_none(user_2.years[0].months[0].checkpoint)
+        nt.assert_is_none(user_2.years[0].months[1].checkpoint)
+        nt.assert_equal(user_2.calculate_flextime(),
+                        user_1.calculate_flextime())
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+import gzip
+import json
+import os
+import tempfile
+
+import nose.tools as nt
+
+from chrono import errors
+from chrono.mapped_archive import MappedArchive
+from chrono.parser import Parser
+
+
+def month_string(month, end_time="17:00", vacation_days=()):
+    current_date = datetime.datetime.strptime(month, "%Y-%m").date()
+    lines = []
+    while current_date.isoformat().startswith(month):
+        if current_date.weekday() < 5:
+            if current_date.day in vacation_days:
+                lines.append("{}. V".format(current_date.day))
+            else:
+                lines.append("{}. 8:00 1:00 {}".format(current_date.day,
+                                                       end_time))
+        current_date += datetime.timedelta(days=1)
+    return "\n".join(lines)
+
+
+class TestMappedArchive(object):
+    def setup(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.temp_dir.name, "archive.txt")
+        self.write_archive(
+            "2014-11\n{}\n\n2014-12\n{}\n\n2015-01\n{}".format(
+                month_string("2014-11", end_time="17:05"),
+                month_string("2014-12", vacation_days=(24, 31)),
+                month_string("2015-01", end_time="16:50")))
+
+    def teardown(self):
+        self.temp_dir.cleanup()
+
+    def write_archive(self, string):
+        with open(self.file_name, "w") as archive_file:
+            archive_file.write(string)
+
+    def test_totals(self):
+        archive_1 = Parser().parse_archive_file(self.file_name)
+        with MappedArchive(self.file_name) as archive_2:
+            nt.assert_equal(archive_2.month_strings(),
+                            ["2014-11", "2014-12", "2015-01"])
+            nt.assert_equal(archive_2.calculate_flextime(),
+                            archive_1.calculate_flextime())
+            nt.assert_equal(archive_2.calculate_flextime(),
+                            datetime.timedelta(minutes=5 * 20 - 10 * 22))
+            nt.assert_equal(archive_2.used_vacation(), 2)
+            nt.assert_equal(archive_2.sick_days(), 0)
+            nt.assert_equal(archive_2.next_month(), "2015-02")
+
+    def test_months_are_parsed_on_access(self):
+        with MappedArchive(self.file_name) as archive_1:
+            nt.assert_equal(archive_1._parsed, {})
+            month_1 = archive_1.get_month("2014-12")
+            nt.assert_equal((month_1.year, month_1.month), (2014, 12))
+            nt.assert_equal(len(month_1.days), 23)
+            nt.assert_is(archive_1.get_month("2014-12"), month_1)
+            nt.assert_is_none(archive_1.get_month("2015-02"))
+            nt.assert_equal(list(archive_1._parsed), ["2014-12"])
+            nt.assert_equal([(m.year, m.month) for m in archive_1.months],
+                            [(2014, 11), (2014, 12), (2015, 1)])
+
+    def test_index_file(self):
+        MappedArchive(self.file_name).close()
+        with open(self.file_name + ".idx", "r") as index_file:
+            index = json.load(index_file)
+        nt.assert_equal([month[0] for month in index["months"]],
+                        ["2014-11", "2014-12", "2015-01"])
+        nt.assert_equal([month[3] for month in index["months"]],
+                        [None, None, None])
+
+        with MappedArchive(self.file_name) as archive_1:
+            archive_1.calculate_flextime()
+        with open(self.file_name + ".idx", "r") as index_file:
+            index = json.load(index_file)
+        nt.assert_equal([month[3] for month in index["months"]],
+                        [[6000, 0, 0], [0, 2, 0], [-13200, 0, 0]])
+
+        # An unchanged archive is read with the saved index and totals.
+        index["months"] = index["months"][:1]
+        index["months"][0][3] = [60, 1, 0]
+        with open(self.file_name + ".idx", "w") as index_file:
+            json.dump(index, index_file)
+        with MappedArchive(self.file_name) as archive_1:
+            nt.assert_equal(archive_1.month_strings(), ["2014-11"])
+            nt.assert_equal(archive_1.calculate_flextime(),
+                            datetime.timedelta(minutes=1))
+            nt.assert_equal(archive_1.used_vacation(), 1)
+
+        self.write_archive("2014-11\n{}\n".format(month_string("2014-11")))
+        with MappedArchive(self.file_name) as archive_1:
+            nt.assert_equal(archive_1.month_strings(), ["2014-11"])
+            nt.assert_equal(archive_1.calculate_flextime(),
+                            datetime.timedelta())
+
+    def test_empty_archive(self):
+        self.write_archive("")
+        with MappedArchive(self.file_name) as archive_1:
+            nt.assert_equal(archive_1.month_strings(), [])
+            nt.assert_equal(archive_1.calculate_flextime(),
+                            datetime.timedelta())
+            nt.assert_equal(archive_1.next_month(), "")
+
+    def test_compressed_archive(self):
+        file_name = os.path.join(self.temp_dir.name, "archive.txt.gz")
+        with gzip.open(file_name, "wt") as archive_file:
+            archive_file.write("2014-11\n{}\n".format(
+                month_string("2014-11", end_time="17:05")))
+        nt.assert_raises_regexp(errors.ChronoError,
+                                "^Compressed archives can't be mapped",
+                                MappedArchive, file_name)
+        nt.assert_false(os.path.exists(file_name + ".idx"))
+
+    def test_lines_before_first_month(self):
+        for string in ("1. 8:00 1:00 17:00\n", "\n1. V\n\n2014-11\n1. V\n"):
+            self.write_archive(string)
+            nt.assert_raises_regexp(errors.ParseError,
+                                    "^Archive lines must follow a month "
+                                    "header",
+                                    MappedArchive, self.file_name)
+            nt.assert_raises_regexp(errors.ParseError,
+                                    "^Archive lines must follow a month "
+                                    "header",
+                                    Parser().parse_archive_file,
+                                    self.file_name)
+        self.write_archive("\n\n2014-11\n{}\n".format(
+            month_string("2014-11")))
+        with MappedArchive(self.file_name) as archive_1:
+            nt.assert_equal(archive_1.month_strings(), ["2014-11"])
@@ -6,7 +6,8 @@ import nose.tools as nt
 
 from chrono import month
 from chrono import errors
-from chrono.day import DayType
+from chrono.day import DayStore, DayType
+from chrono.parser import tokenize_month_string
 
 
 class TestMonth(object):
@@ -173,3 +174,125 @@ class TestMonth(object):
         nt.assert_equal(month_1.used_vacation(date_string="2014-08-31"), 0)
         nt.assert_equal(month_1.used_vacation(date_string="2014-09-01"), 1)
         nt.assert_equal(month_1.used_vacation(date_string="2014-09-02"), 2)
+
+    def test_checkpoint(self):
+        month_1 = month.Month("2014-09")
+        month_1.add_day("2014-09-01").set_type(DayType.vacation)
+        month_1.checkpoint = month.MonthTotals(
+            datetime.timedelta(hours=1), 2, 3)
+
+        nt.assert_equal(month_1.calculate_flextime(),
+                        datetime.timedelta(hours=1))
+        nt.assert_equal(month_1.used_vacation(), 2)
+        nt.assert_equal(month_1.used_vacation(date_string="2014-09-01"), 1)
+        nt.assert_equal(month_1.sick_days(), 3)
+
+        month_1.add_day("2014-09-02")
+        nt.assert_is_none(month_1.checkpoint)
+        nt.assert_equal(month_1.totals(),
+                        month.MonthTotals(datetime.timedelta(), 1, 0))
+
+    def test_checkpoint_dropped_when_day_changes(self):
+        store = DayStore()
+        month_1 = month.Month("2014-09", store=store)
+        month_1.load_records(tokenize_month_string(
+            "1. 8:00 1:00 17:00\n2. 8:00 1:00 17:00\n", "2014-09"))
+        month_2 = month.Month("2014-10", store=store)
+        month_2.load_records(tokenize_month_string(
+            "1. 8:00 1:00 17:00\n", "2014-10"))
+        month_1.checkpoint = month_1.totals()
+        month_2.checkpoint = month_2.totals()
+
+        month_1.days[1].report_deviation("1:00")
+        nt.assert_is_none(month_1.checkpoint)
+        nt.assert_is_not_none(month_2.checkpoint)
+        nt.assert_equal(month_1.calculate_flextime(),
+                        datetime.timedelta(hours=-1))
+
+        month_2.days[0].set_type(DayType.vacation)
+        nt.assert_is_none(month_2.checkpoint)
+        nt.assert_equal(month_2.used_vacation(), 1)
+
+    def test_shared_store(self):
+        store = DayStore()
+        month_1 = month.Month("2014-09", store=store)
+        month_1.add_day("2014-09-01")
+        month_1.days[0].report("8:00", "1:00", "17:00")
+        month_2 = month.Month("2014-10", store=store)
+        month_2.add_day("2014-10-01")
+        nt.assert_equal(len(store), 2)
+        nt.assert_equal(list(month_2.rows()), [1])
+        nt.assert_equal(month_2.days[0].date.isoformat(), "2014-10-01")
+        nt.assert_raises(errors.ReportError, month_1.add_day, "2014-09-02")
+
+    def test_complete_without_days(self):
+        store = DayStore()
+        month_1 = month.Month("2014-08", store=store)
+        month_1.add_day("2014-08-01").report_start_time("8:00")
+        month_2 = month.Month("2014-09", store=store)
+        nt.assert_false(month_2.complete())
+        for day in range(1, 31):
+            month_2.add_holiday("2014-09-{:02d}".format(day), "Holiday")
+        nt.assert_true(month_2.complete())
+
+    def test_add_day_before_last_day(self):
+        month_1 = month.Month("2014-11")
+        month_1.add_day("2014-11-03").report("8:00", "1:00", "17:00")
+        nt.assert_raises_regexp(errors.ReportError,
+                                "^New days must be added in date order. "
+                                "2014-11-01 is before 2014-11-03.$",
+                                month_1.add_day, "2014-11-01")
+
+    def test_load_records(self):
+        month_1 = month.Month("2014-09")
+        month_1.add_holiday("2014-09-03", "Holiday")
+        records = tokenize_month_string(
+            "1. 8:00 1:00 17:00\n2. V\n3.\n4. 8:00 0:30 17:00 \"Note\"\n"
+            "5. S\n6. 10:00 0:00 12:00\n", "2014-09")
+        nt.assert_true(month_1.load_records(records))
+
+        nt.assert_equal([d.date.day for d in month_1.days],
+                        [1, 2, 3, 4, 5, 6])
+        nt.assert_equal(month_1.days[1].day_type, DayType.vacation)
+        nt.assert_equal(month_1.days[2].day_type, DayType.holiday)
+        nt.assert_equal(month_1.days[2].info, "Holiday")
+        nt.assert_equal(month_1.days[3].comment, "Note")
+        nt.assert_equal(month_1.days[4].day_type, DayType.sick_day)
+        nt.assert_equal(month_1.days[5].day_type, DayType.weekend)
+        nt.assert_equal(month_1.calculate_flextime(),
+                        datetime.timedelta(minutes=30 + 120))
+        nt.assert_equal(month_1.next_workday(), "2014-09-08")
+
+    def test_freeze(self):
+        month_1 = month.Month("2014-09")
+        month_1.add_holiday("2014-09-03", "Holiday")
+        month_1.load_records(tokenize_month_string(
+            "1. 8:00 1:00 17:00\n2. V\n3.\n4. 8:00 0:30 17:00 \"Note\"\n"
+            "5. S\n6. 10:00 0:00 12:00\n", "2014-09"))
+        frozen_month = month_1.freeze()
+        nt.assert_equal(len(frozen_month), 6)
+        nt.assert_equal(frozen_month.totals, month_1.totals())
+        nt.assert_equal(frozen_month.calculate_flextime(),
+                        datetime.timedelta(minutes=30 + 120))
+        nt.assert_equal(frozen_month.used_vacation("2014-09-01"), 0)
+        nt.assert_equal(frozen_month.used_vacation(), 1)
+        nt.assert_equal(frozen_month.sick_days(), 1)
+        nt.assert_equal(frozen_month.next_month(), "2014-10")
+        nt.assert_raises(AttributeError, setattr, frozen_month, "month", 10)
+
+        thawed_month = frozen_month.thaw()
+        nt.assert_equal([day.export() for day in thawed_month.days],
+                        [day.export() for day in month_1.days])
+        nt.assert_equal(thawed_month.days[2].info, "Holiday")
+        nt.assert_equal(thawed_month.next_workday(), "2014-09-08")
+
+    def test_load_records_refused(self):
+        for month_string in ("1. 8:00\n2. 8:00 1:00 17:00\n",
+                             "1. 8:00 1:00 17:00\n3. 8:00 1:00 17:00\n",
+                             "2. 8:00 1:00 17:00\n1. 8:00 1:00 17:00\n",
+                             "1. V\n1. V\n",
+                             "31. 8:00 1:00 17:00\n"):
+            month_1 = month.Month("2014-09")
+            records = tokenize_month_string(month_string, "2014-09")
+            nt.assert_false(month_1.load_records(records))
+            nt.assert_equal(month_1.days, [])
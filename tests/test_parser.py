@@ -1,12 +1,17 @@
 # -*- coding: utf-8 -*-
 
+import gzip
+import io
 import os
 import datetime
 import tempfile
 
 import nose.tools as nt
 
-from chrono.parser import Parser
+from chrono import archive
+from chrono.day import DayType
+from chrono.parser import DayRecord, Parser, tokenize_month_string
+from chrono.tokenizer import tokenize_months_string
 from chrono import errors
 
 
@@ -365,6 +370,148 @@ class TestParserMonthFile(object):
             file_name)
         
 
+    def test_errors_in_file_order(self):
+        file_parser = Parser()
+        file_content = "2. 8:00 1 17:00\n1. 8:00 1 17:00\n3. 8.00\n"
+        file_name = save_month_file(
+            file_content, "2017-02.txt", self.temp_dir.name)
+
+        nt.assert_raises_regexp(
+            errors.ReportError,
+            "New work days must be added consecutively. Expected "
+            "2017-02-01, got 2017-02-02.",
+            file_parser.parse_month_file,
+            file_name)
+        nt.assert_raises_regexp(
+            errors.ReportError,
+            "New work days must be added consecutively. Expected "
+            "2017-02-01, got 2017-02-02.",
+            file_parser.parse_month_string,
+            file_content, "2017-02")
+
+
+class TestTokenizeMonthString(object):
+    def test_records(self):
+        records = tokenize_month_string(
+            "1. 8:00 1:00 17:00\n"
+            "\n"
+            "2. 8:15 0 16:45 1 \"Dentist\"\n"
+            "3. s 'Fever'\n"
+            "4. 8:00 0:30 17:00 0:15 V\n", "2014-09")
+
+        nt.assert_equal(records, [
+            DayRecord(1, 480, 60, 1020, None, None, None),
+            DayRecord(2, 495, 0, 1005, 60, None, "Dentist"),
+            DayRecord(3, None, None, None, None, DayType.sick_day, "Fever"),
+            DayRecord(4, 480, 30, 1020, 15, DayType.vacation, None)])
+
+    def test_comment_without_tokens_is_ignored(self):
+        records = tokenize_month_string("1. \"Only a comment\"", "2014-09")
+        nt.assert_is_none(records[0].comment)
+
+    def test_line_without_date(self):
+        nt.assert_raises_regexp(errors.ParseError,
+                                "Could not parse date in 2014-09: \"\"",
+                                tokenize_month_string,
+                                "\"Only a comment\"",
+                                "2014-09")
+
+    def test_bad_tokens(self):
+        nt.assert_raises_regexp(
+            errors.ParseError,
+            "^Could not parse lunch duration for date 2014-09-01: \"1:0\"$",
+            tokenize_month_string, "1. 8:00 1:0", "2014-09")
+
+        nt.assert_raises_regexp(
+            errors.ParseError,
+            "^End time must be given with hours and minutes, was '17'.$",
+            tokenize_month_string, "1. 8:00 1:00 17", "2014-09")
+
+        nt.assert_raises_regexp(
+            errors.ParseError,
+            "^Could not parse deviation for date 2014-09-01: \"-1:00\"$",
+            tokenize_month_string, "1. 8:00 1:00 17:00 -1:00", "2014-09")
+
+    def test_signed_deviation_before_lunch(self):
+        nt.assert_raises_regexp(
+            errors.ParseError,
+            "^Could not parse start time for date 2014-09-02: \"\\+1:00\"$",
+            tokenize_month_string, "2. +1:00", "2014-09")
+        nt.assert_raises_regexp(
+            errors.ParseError,
+            "^Could not parse lunch duration for date 2014-09-02: "
+            "\"\\+0:30\"$",
+            tokenize_month_string, "2. 8:00 +0:30 1:00", "2014-09")
+        nt.assert_equal(
+            tokenize_month_string("2. 8:00 1:00 +0:30 17:00", "2014-09")[0]
+            .deviation, 30)
+
+    def test_bad_times(self):
+        nt.assert_raises_regexp(
+            errors.BadTimeError,
+            "^Bad start time: \"24:00\".$",
+            tokenize_month_string, "1. 24:00", "2014-09")
+
+        nt.assert_raises_regexp(
+            errors.BadTimeError,
+            "^Bad end time: \"17:60\"$",
+            tokenize_month_string, "1. 8:00 1:00 17:60", "2014-09")
+
+    def test_months(self):
+        nt.assert_equal(
+            tokenize_months_string("30. 8:00 1:00 17:00\n"
+                                   "2014-10\n"
+                                   "1. V\n"
+                                   "2014-11\n", "2014-09"),
+            [("2014-09", [DayRecord(30, 480, 60, 1020, None, None, None)]),
+             ("2014-10", [DayRecord(1, None, None, None, None,
+                                    DayType.vacation, None)]),
+             ("2014-11", [])])
+
+    def test_bad_day_of_month(self):
+        nt.assert_raises_regexp(errors.BadDateError,
+                                "^Bad date string: \"2014-09-31\"$",
+                                Parser().parse_month_string,
+                                "31. V",
+                                "2014-09")
+
+
+class TestParserReportRecords(object):
+    def setup(self):
+        self.parser = Parser()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with open(os.path.join(self.temp_dir.name, "user.cfg"), "w") as f:
+            f.write("Name: Jane Doe\nEmployed date: 2014-09-01\n")
+        save_month_file("1. 8:00 1:00 17:00\n2. 8:00\n", "2014-09.txt",
+                        self.temp_dir.name)
+        self.parser.parse_data_folder(self.temp_dir.name)
+
+    def teardown(self):
+        self.temp_dir.cleanup()
+
+    def test_report_records(self):
+        month_1 = self.parser.report_records(
+            tokenize_month_string("2. 8:00 1:00 17:30\n"
+                                  "3. 8:00 0:30 17:00 0:30 \"Dentist\"\n"
+                                  "4. V", "2014-09"), "2014-09")
+        nt.assert_is(month_1, self.parser.user.get_month(2014, 9))
+        nt.assert_equal([day.export() for day in month_1.days],
+                        [" 1. 8:00 1:00 17:00",
+                         " 2. 8:00 1:00 17:30",
+                         " 3. 8:00 0:30 +0:30 17:00 \"Dentist\"",
+                         " 4. V"])
+        nt.assert_equal(self.parser.user.calculate_flextime(),
+                        datetime.timedelta(minutes=30))
+
+    def test_report_records_with_other_time(self):
+        nt.assert_raises_regexp(
+            errors.ReportError,
+            "^Date 2014-09-02 allready has a start time.$",
+            self.parser.report_records,
+            tokenize_month_string("2. 8:15 1:00 17:30", "2014-09"),
+            "2014-09")
+
+
 class TestParserArchiveFile(object):
     def setup(self):
         self.temp_dir = tempfile.TemporaryDirectory()
@@ -425,6 +572,74 @@ class TestParserArchiveFile(object):
 
         nt.assert_true(archive_1.next_month, "2015-02")
 
+    def test_iter_archive_months(self):
+        archive_file = io.StringIO("2014-11\n3. 8:00 1:00 17:05\n\n"
+                                   "2014-12\n1. 8:00 1:00 17:00\n")
+        months = list(Parser().iter_archive_months(archive_file))
+        nt.assert_equal([(month.year, month.month) for month in months],
+                        [(2014, 11), (2014, 12)])
+        nt.assert_equal(months[0].days[0].export(), " 3. 8:00 1:00 17:05")
+
+    def test_iter_gzip_archive_months(self):
+        file_name = os.path.join(self.temp_dir.name, "archive.txt.gz")
+        with gzip.open(file_name, "wt") as archive_file:
+            archive_file.write("2014-11\n3. 8:00 1:00 17:05\n\n"
+                               "2014-12\n1. 8:00 1:00 17:00\n"
+                               "x. 8:00\n")
+        with gzip.open(file_name, "rb") as archive_file:
+            months = Parser().iter_archive_months(archive_file)
+            nt.assert_equal(next(months).month, 11)
+            nt.assert_raises(errors.ParseError, next, months)
+
+    def test_parse_appended_xz_archive(self):
+        file_name = os.path.join(self.temp_dir.name, "archive.txt.xz")
+        for month, days in (("2014-11", (3, 4, 5, 6, 7,
+                                         10, 11, 12, 13, 14,
+                                         17, 18, 19, 20, 21,
+                                         24, 25, 26, 27, 28)),
+                            ("2014-12", (1, 2, 3, 4, 5,
+                                         8, 9, 10, 11, 12,
+                                         15, 16, 17, 18, 19,
+                                         22, 23, 24, 25, 26,
+                                         29, 30, 31))):
+            with archive.open_archive_file(file_name, "a") as archive_file:
+                archive_file.write(month + "\n")
+                for n in days:
+                    archive_file.write("{}. 8:00 1:00 17:01\n".format(n))
+        archive_1 = Parser().parse_archive_file(file_name)
+        nt.assert_equal(archive_1.next_month(), "2015-01")
+        nt.assert_equal(archive_1.calculate_flextime(),
+                        datetime.timedelta(minutes=43))
+
+    def test_iter_archive_months_without_header(self):
+        nt.assert_raises_regexp(
+            errors.ParseError,
+            "^Archive lines must follow a month header",
+            list, Parser().iter_archive_months(io.StringIO("1. 8:00\n")))
+
+    def test_iter_month_records(self):
+        month_file = io.BytesIO(b"1. 8:00 1:00 17:00\r\n\n2. V\n")
+        month_file.name = "/data/2014-09.txt"
+        nt.assert_equal(
+            list(Parser().iter_month_records(month_file)),
+            tokenize_month_string("1. 8:00 1:00 17:00\n2. V", "2014-09"))
+
+    def test_iter_month_records_without_month(self):
+        month_file = io.BytesIO(b"1. 8:00 1:00 17:00\n")
+        nt.assert_raises_regexp(
+            errors.ParseError,
+            "Month of month file \"\" is unknown, it must be given as "
+            "\"YYYY-MM\".",
+            list, Parser().iter_month_records(month_file))
+        month_file.name = "<stdin>"
+        nt.assert_raises_regexp(
+            errors.ParseError,
+            "Month of month file \"<stdin>\" is unknown",
+            list, Parser().iter_month_records(month_file))
+        nt.assert_equal(
+            list(Parser().iter_month_records(month_file, month="2014-09")),
+            tokenize_month_string("1. 8:00 1:00 17:00", "2014-09"))
+
 
 class TestParserYearConfiguration(object):
     def setup(self):
@@ -569,3 +784,100 @@ Employed date: 2014-06-01"""
         file_name_1 = save_user_file(user_string, self.temp_dir.name)
         user_1 = file_parser.parse_user_file(file_name_1)
         nt.assert_equal(user_1.vacation_left(), 30)
+
+
+class TestParserDataFolder(object):
+    def setup(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def teardown(self):
+        pass
+
+    def _save_history(self, first_year, last_year):
+        with open(os.path.join(self.temp_dir.name, "user.cfg"), "w") as f:
+            f.write("Name: Jane Doe\nEmployed date: {}-01-01\n".format(
+                first_year))
+        date = datetime.date(first_year, 1, 1)
+        lines = {}
+        while date.year <= last_year:
+            if date.weekday() < 5:
+                if date.toordinal() % 17 == 0:
+                    line = "{}. V".format(date.day)
+                else:
+                    line = "{}. 8:{:02d} 0:45 17:{:02d} \"Day {}\"".format(
+                        date.day, date.toordinal() % 60,
+                        date.toordinal() * 7 % 60, date.toordinal())
+                lines.setdefault(date.strftime("%Y-%m"), []).append(line)
+            date += datetime.timedelta(days=1)
+        for month, month_lines in lines.items():
+            save_month_file("\n".join(month_lines), month + ".txt",
+                            self.temp_dir.name)
+
+    def test_parse_data_folder_in_parallel(self):
+        self._save_history(2013, 2014)
+        user_1 = Parser().parse_data_folder(self.temp_dir.name)
+        user_2 = Parser().parse_data_folder(self.temp_dir.name, workers=3)
+        nt.assert_equal([d.export() for d in user_1.all_days()],
+                        [d.export() for d in user_2.all_days()])
+        nt.assert_equal(user_1.calculate_flextime(),
+                        user_2.calculate_flextime())
+
+    def test_parse_data_folder_in_parallel_raises_in_order(self):
+        self._save_history(2014, 2014)
+        save_month_file("1. 8:00\n", "2014-03.txt", self.temp_dir.name)
+        save_month_file("1. 8.00\n", "2014-07.txt", self.temp_dir.name)
+        nt.assert_raises_regexp(
+            errors.ReportError,
+            "^New date string didn't match month. 2014-03 doesn't include "
+            "2014-04-01.$",
+            Parser().parse_data_folder,
+            self.temp_dir.name,
+            workers=2)
+
+    def test_parse_data_folder(self):
+        with open(os.path.join(self.temp_dir.name, "user.cfg"), "w") as f:
+            f.write("Name: Jane Doe\nEmployed date: 2014-12-01\n")
+        with open(os.path.join(self.temp_dir.name, "2015.cfg"), "w") as f:
+            f.write("2015-01-01: \"New years day\"\n")
+
+        month_string = "\n".join(
+            "{}. 8:00 1:00 17:00".format(n) for n in (
+                1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 15, 16, 17, 18, 19,
+                22, 23, 24, 25, 26, 29, 30, 31))
+
+        save_month_file(month_string, "2014-12.txt", self.temp_dir.name)
+        save_month_file("2. 8:00 1:00 17:30\n", "2015-01.txt",
+                        self.temp_dir.name)
+
+        user_1 = Parser().parse_data_folder(self.temp_dir.name)
+        nt.assert_equal([y.year for y in user_1.years], [2014, 2015])
+        nt.assert_equal(user_1.today().date, datetime.date(2015, 1, 2))
+        nt.assert_equal(user_1.current_year().holidays["2015-01"],
+                        {"2015-01-01": "New years day"})
+
+        nt.assert_equal(user_1.calculate_flextime(),
+                        datetime.timedelta(minutes=30))
+
+    def test_parse_data_folder_from_first_month(self):
+        self._save_history(2013, 2014)
+        with open(os.path.join(self.temp_dir.name, "2014.cfg"), "w") as f:
+            f.write("2014-06-06: \"National day\"\n")
+        save_month_file(
+            "2. 8:00 0:45 17:00\n3. 8:00 0:45 17:00\n4. 8:00 0:45 17:00\n"
+            "5. 8:00 0:45 17:00\n9. 8:00 0:45 17:00\n",
+            "2014-06.txt", self.temp_dir.name)
+        for month_string in ("2014-07", "2014-08", "2014-09", "2014-10",
+                             "2014-11", "2014-12"):
+            os.remove(os.path.join(self.temp_dir.name,
+                                   month_string + ".txt"))
+
+        user_1 = Parser().parse_data_folder(self.temp_dir.name)
+        user_2 = Parser().parse_data_folder(self.temp_dir.name,
+                                            first_month="2014-06")
+        nt.assert_equal([y.year for y in user_2.years], [2014])
+        nt.assert_equal([m.month for m in user_2.years[0].months], [6])
+        nt.assert_equal([d.export() for d in user_2.all_days()],
+                        [d.export() for d in user_1.get_month(2014, 6).days])
+        nt.assert_equal(user_2.next_workday(), user_1.next_workday())
+        nt.assert_equal(user_2.calculate_flextime(),
+                        user_1.get_month(2014, 6).calculate_flextime())
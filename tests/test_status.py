@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+
+import os
+import tempfile
+
+import nose.tools as nt
+
+from chrono import status
+from chrono.parser import Parser
+
+
+class TestStatus(object):
+    def setup(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_folder = os.path.join(self.temp_dir.name, "data")
+        self.cache_folder = os.path.join(self.temp_dir.name, "cache")
+        os.mkdir(self.data_folder)
+        self.write_file("user.cfg",
+                        "Name: Jane Doe\nEmployed date: 2014-09-01\n")
+        self.write_file("2014.cfg", "2014-10-03: \"Holiday\"\n")
+        self.write_file("2014-09.txt", "\n".join(
+            "{}. 8:00 1:00 17:30".format(day) for day in
+            (1, 2, 3, 4, 5, 8, 9, 10, 11, 12, 15, 16, 17, 18, 19, 22, 23, 24,
+             25, 26, 29, 30)))
+        self.write_file("2014-10.txt", "1. 8:00 1:00 17:00\n"
+                                       "2. 8:00 1:00 16:00\n")
+
+    def teardown(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name, string):
+        with open(os.path.join(self.data_folder, name), "w") as data_file:
+            data_file.write(string)
+
+    def parse(self):
+        return Parser().parse_data_folder(self.data_folder)
+
+    def full_status(self):
+        user_1 = self.parse()
+        return status.status_line(user_1.today(),
+                                  user_1.calculate_flextime())
+
+    def test_no_summary(self):
+        nt.assert_is_none(
+            status.read_status(self.data_folder, self.cache_folder))
+
+    def test_read_status(self):
+        status.write_summary(self.parse(), self.data_folder,
+                             self.cache_folder)
+        nt.assert_equal(
+            status.read_status(self.data_folder, self.cache_folder),
+            "Today: 0:00 | Flextime: +10:00")
+        nt.assert_equal(
+            status.read_status(self.data_folder, self.cache_folder),
+            self.full_status())
+
+    def test_report_to_current_month(self):
+        status.write_summary(self.parse(), self.data_folder,
+                             self.cache_folder)
+        # 2014-10-03 is a holiday.
+        self.write_file("2014-10.txt", "1. 8:00 1:00 17:00\n"
+                                       "2. 8:00 1:00 16:00\n"
+                                       "6. 8:00 1:00 18:00\n")
+        nt.assert_equal(
+            status.read_status(self.data_folder, self.cache_folder),
+            "Today: 0:00 | Flextime: +11:00")
+        nt.assert_equal(
+            status.read_status(self.data_folder, self.cache_folder),
+            self.full_status())
+
+    def test_changed_data_folder(self):
+        status.write_summary(self.parse(), self.data_folder,
+                             self.cache_folder)
+        self.write_file("2014-09.txt", "1. 8:00 1:00 17:00")
+        nt.assert_is_none(
+            status.read_status(self.data_folder, self.cache_folder))
+
+    def test_new_month(self):
+        status.write_summary(self.parse(), self.data_folder,
+                             self.cache_folder)
+        self.write_file("2014-11.txt", "")
+        nt.assert_is_none(
+            status.read_status(self.data_folder, self.cache_folder))
+
+    def test_journal(self):
+        status.write_summary(self.parse(), self.data_folder,
+                             self.cache_folder)
+        self.write_file("journal.log", "2014-10-06 start 8:00\n"
+                                       "2014-10-06 lunch 1:00\n"
+                                       "2014-10-06 end 18:00\n")
+        nt.assert_equal(
+            status.read_status(self.data_folder, self.cache_folder),
+            "Today: 0:00 | Flextime: +11:00")
+        nt.assert_equal(
+            status.read_status(self.data_folder, self.cache_folder),
+            self.full_status())
+
+        self.write_file("journal.log", "2014-11-03 start 8:00\n")
+        nt.assert_is_none(
+            status.read_status(self.data_folder, self.cache_folder))
@@ -4,7 +4,7 @@ import datetime
 
 import nose.tools as nt
 
-from chrono.time_utilities import pretty_timedelta
+from chrono.time_utilities import pretty_minutes, pretty_timedelta
 
 
 class TestTimeHelpers(object):
@@ -38,4 +38,9 @@ class TestTimeHelpers(object):
                         "-1:23")
 
         nt.assert_equal(pretty_timedelta(zero_timedelta, signed=True), "0:00")
-        nt.assert_equal(pretty_timedelta(none_timedelta, signed=True), "")
\ No newline at end of file
+        nt.assert_equal(pretty_timedelta(none_timedelta, signed=True), "")
+
+    def test_pretty_minutes(self):
+        nt.assert_equal(pretty_minutes(0), "0:00")
+        nt.assert_equal(pretty_minutes(8 * 60 + 5), "8:05")
+        nt.assert_equal(pretty_minutes(-83), "-1:23")
@@ -135,7 +135,56 @@ class TestParseUserFile(object):
         user_1.add_day("2014-09-02").report("8:00", "1:00", "16:00")
         nt.assert_equal(user_1.calculate_flextime(),
                         datetime.timedelta(minutes=-30))
-    
+
+    def test_flextime_balance(self):
+        user_1 = user.User(employed_date="2014-09-01")
+        user_1.flextime = datetime.timedelta(hours=2)
+        user_1.add_day("2014-09-01").report("8:00", "0:30", "17:00")
+        user_1.add_day("2014-09-02").report("8:00", "1:00", "16:00")
+        user_1.add_day("2014-09-03").report("8:00", "1:00", "17:15")
+        nt.assert_equal(user_1.flextime_balance("2014-08-31"),
+                        datetime.timedelta(hours=2))
+        nt.assert_equal(user_1.flextime_balance("2014-09-01"),
+                        datetime.timedelta(minutes=150))
+        nt.assert_equal(user_1.flextime_balance("2014-09-02"),
+                        datetime.timedelta(minutes=90))
+        nt.assert_equal(user_1.flextime_balance(),
+                        user_1.calculate_flextime())
+        nt.assert_equal(user_1.flextime_between("2014-09-02", "2014-09-03"),
+                        datetime.timedelta(minutes=-45))
+        nt.assert_raises(errors.BadDateError, user_1.flextime_balance,
+                         "2014-09")
+
+    def test_get_day(self):
+        user_1 = user.User(employed_date="2014-12-01")
+        while user_1.next_workday() != "2015-01-08":
+            user_1.add_day(user_1.next_workday()).report(
+                "8:00", "1:00", "17:00")
+
+        day_1 = user_1.get_day("2014-12-02")
+        nt.assert_equal(day_1.date, datetime.date(2014, 12, 2))
+        nt.assert_is(user_1.get_day("2014-12-02"), day_1)
+        nt.assert_is(user_1.get_day("2015-01-07"), user_1.today())
+        nt.assert_is_none(user_1.get_day("2014-12-06"))
+        nt.assert_is_none(user_1.get_day("2015-01-08"))
+        nt.assert_equal(
+            [d.date.day for d in user_1.get_days("2014-12-27",
+                                                 "2015-01-02")],
+            [29, 30, 31, 1, 2])
+        nt.assert_equal(user_1.get_days("2015-02-01", "2015-02-28"), [])
+
+    def test_get_month(self):
+        user_1 = user.User(employed_date="2014-12-01")
+        while user_1.next_workday() != "2015-01-08":
+            user_1.add_day(user_1.next_workday()).report(
+                "8:00", "1:00", "17:00")
+
+        nt.assert_is(user_1.get_month(2014, 12), user_1.years[0].months[0])
+        nt.assert_is(user_1.get_month(2015, 1), user_1.current_month())
+        nt.assert_is_none(user_1.get_month(2015, 2))
+        nt.assert_is_none(user_1.get_month(2013, 12))
+        nt.assert_is(user_1.get_year(2015), user_1.current_year())
+
     def test_add_day(self):
         user_1 = user.User(employed_date="2014-09-01")
         day_1 = user_1.add_day("2014-09-01")
@@ -295,4 +344,40 @@ class TestParseUserFile(object):
 
         any_user.add_day(any_user.next_workday())
         nt.assert_equal(any_user.current_month().holidays,
-                        {"2015-03-03": "Hinamatsuri"})
\ No newline at end of file
+                        {"2015-03-03": "Hinamatsuri"})
+
+    def test_add_days_bulk(self):
+        user_1 = user.User(employed_date="2014-12-01")
+        user_1.add_holiday("2014-12-24", "Christmas Eve")
+        user_1.add_holiday("2014-12-25", "Christmas Day")
+        user_1.add_holiday("2015-01-01", "New Year's Day")
+        while user_1.next_workday() < "2014-12-20":
+            user_1.add_day(user_1.next_workday()).report("8:00", "1:00",
+                                                         "17:00")
+
+        months = user_1.add_days_bulk("2014-12-20", "2015-01-09",
+                                      day.DayType.vacation)
+        nt.assert_equal([(m.year, m.month) for m in months],
+                        [(2014, 12), (2015, 1)])
+        nt.assert_equal(
+            [d.date.isoformat() for d in user_1.all_days()[15:]],
+            ["2014-12-22", "2014-12-23", "2014-12-26", "2014-12-29",
+             "2014-12-30", "2014-12-31", "2015-01-02", "2015-01-05",
+             "2015-01-06", "2015-01-07", "2015-01-08", "2015-01-09"])
+        nt.assert_equal(user_1.used_vacation(), 12)
+        nt.assert_equal(user_1.calculate_flextime(), datetime.timedelta())
+        nt.assert_equal(user_1.next_workday(), "2015-01-12")
+
+    def test_add_days_bulk_out_of_order(self):
+        user_1 = user.User(employed_date="2014-12-01")
+        nt.assert_raises_regexp(
+            errors.ReportError,
+            "^New work days must be added consecutively. Expected "
+            "2014-12-01, got 2014-12-02.$",
+            user_1.add_days_bulk, "2014-12-02", "2014-12-05",
+            day.DayType.vacation)
+        nt.assert_raises_regexp(
+            errors.BadDateError,
+            "^Last date 2014-12-01 is before first date 2014-12-05.$",
+            user_1.add_days_bulk, "2014-12-05", "2014-12-01",
+            day.DayType.vacation)
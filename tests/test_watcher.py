@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+import os
+import tempfile
+
+import nose.tools as nt
+
+from chrono.day import DayType
+from chrono.parser import Parser
+from chrono.watcher import Watcher
+
+HOLIDAYS = {"2014-12-24": "Christmas Eve", "2014-12-25": "Christmas Day",
+            "2015-01-01": "New Year's Day", "2015-01-06": "Epiphany"}
+
+
+class TestWatcher(object):
+    def setup(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_folder = self.temp_dir.name
+        self.modified = 1500000000 * 10 ** 9
+        self.write_file("user.cfg",
+                        "Name: Jane Doe\nEmployed date: 2014-09-01\n")
+        self.write_year_files(HOLIDAYS)
+        for month_string in ("2014-09", "2014-10", "2014-11", "2014-12",
+                             "2015-01", "2015-02"):
+            self.write_month(month_string)
+        self.watcher = Watcher(self.data_folder)
+
+    def teardown(self):
+        self.temp_dir.cleanup()
+
+    def write_file(self, name, string):
+        path = os.path.join(self.data_folder, name)
+        with open(path, "w") as data_file:
+            data_file.write(string)
+        # Files rewritten with the same size must get a new timestamp.
+        self.modified += 10 ** 9
+        os.utime(path, ns=(self.modified, self.modified))
+
+    def write_year_files(self, holidays):
+        for year in ("2014", "2015"):
+            self.write_file("{}.cfg".format(year), "".join(
+                "{}: \"{}\"\n".format(date_string, name)
+                for date_string, name in sorted(holidays.items())
+                if date_string.startswith(year)))
+
+    def write_month(self, month_string, end_time="17:00", holidays=HOLIDAYS):
+        current_date = datetime.datetime.strptime(
+            month_string, "%Y-%m").date()
+        lines = []
+        while current_date.isoformat().startswith(month_string):
+            if (current_date.weekday() < 5 and
+                    current_date.isoformat() not in holidays):
+                lines.append("{}. 8:00 1:00 {}".format(
+                    current_date.day, end_time))
+            current_date += datetime.timedelta(days=1)
+        self.write_file("{}.txt".format(month_string), "\n".join(lines))
+
+    def assert_parsed(self):
+        user_1 = self.watcher.parser.user
+        user_2 = Parser().parse_data_folder(self.data_folder)
+        nt.assert_equal(user_1.calculate_flextime(),
+                        user_2.calculate_flextime())
+        nt.assert_equal(user_1.flextime_balance("2014-12-31"),
+                        user_2.flextime_balance("2014-12-31"))
+        nt.assert_equal([(y.year, [m.month for m in y.months])
+                         for y in user_1.years],
+                        [(y.year, [m.month for m in y.months])
+                         for y in user_2.years])
+        nt.assert_equal([(d.date, d.day_type, d.end_time)
+                         for d in user_1.all_days()],
+                        [(d.date, d.day_type, d.end_time)
+                         for d in user_2.all_days()])
+        nt.assert_equal(user_1.next_workday(), user_2.next_workday())
+
+    def test_no_changes(self):
+        parser = self.watcher.parser
+        nt.assert_equal(self.watcher.poll(), set())
+        nt.assert_is(self.watcher.parser, parser)
+
+    def test_edit_current_month(self):
+        user_1 = self.watcher.parser.user
+        month_1 = user_1.get_month(2015, 1)
+        self.write_month("2015-02", end_time="17:30")
+        nt.assert_equal(self.watcher.poll(), {"2015-02.txt"})
+        nt.assert_is(self.watcher.parser.user, user_1)
+        nt.assert_is(user_1.get_month(2015, 1), month_1)
+        nt.assert_equal(user_1.calculate_flextime(),
+                        datetime.timedelta(minutes=30 * 20))
+        self.assert_parsed()
+
+    def test_edit_earlier_month(self):
+        self.write_month("2014-10", end_time="16:45")
+        nt.assert_equal(self.watcher.poll(), {"2014-10.txt"})
+        nt.assert_equal(self.watcher.parser.user.calculate_flextime(),
+                        -datetime.timedelta(minutes=15 * 23))
+        self.assert_parsed()
+
+    def test_new_month(self):
+        self.write_month("2015-03")
+        nt.assert_equal(self.watcher.poll(), {"2015-03.txt"})
+        nt.assert_equal(self.watcher.parser.user.get_day(
+            "2015-03-31").end_time, datetime.datetime(2015, 3, 31, 17, 0))
+        self.assert_parsed()
+
+    def test_edit_year_file(self):
+        holidays = dict(HOLIDAYS)
+        del holidays["2015-01-06"]
+        holidays["2015-01-02"] = "Bridge day"
+        self.write_year_files(holidays)
+        self.write_month("2015-01", holidays=holidays)
+        nt.assert_equal(self.watcher.poll(),
+                        {"2014.cfg", "2015.cfg", "2015-01.txt"})
+        user_1 = self.watcher.parser.user
+        nt.assert_equal(user_1.get_day("2015-01-06").day_type,
+                        DayType.working_day)
+        nt.assert_is_none(user_1.get_day("2015-01-02"))
+        self.assert_parsed()
+
+    def test_edit_user_file(self):
+        self.write_file("user.cfg",
+                        "Name: John Doe\nEmployed date: 2014-09-01\n")
+        nt.assert_equal(self.watcher.poll(), {"user.cfg"})
+        nt.assert_equal(self.watcher.parser.user.name, "John Doe")
+        self.assert_parsed()
+
+    def test_journal(self):
+        self.write_file("journal.log", "2015-03-02 start 8:00\n")
+        nt.assert_equal(self.watcher.poll(), {"journal.log"})
+        with open(os.path.join(self.data_folder, "journal.log"),
+                  "a") as journal_file:
+            journal_file.write("2015-03-02 lunch 1:00\n"
+                               "2015-03-02 end 18:00\n")
+        nt.assert_equal(self.watcher.poll(), {"journal.log"})
+        user_1 = self.watcher.parser.user
+        nt.assert_equal(user_1.today().end_time,
+                        datetime.datetime(2015, 3, 2, 18, 0))
+        self.assert_parsed()
+
+        self.watcher.parser.compact_journal(self.data_folder)
+        self.watcher.accept()
+        self.write_month("2015-02", end_time="17:30")
+        nt.assert_equal(self.watcher.poll(), {"2015-02.txt"})
+        nt.assert_equal(user_1.calculate_flextime(),
+                        datetime.timedelta(minutes=30 * 20 + 60))
+        self.assert_parsed()
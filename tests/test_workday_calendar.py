@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+
+import datetime
+
+import nose.tools as nt
+
+from chrono.workday_calendar import WorkdayCalendar
+
+
+def ordinal(date_string):
+    return datetime.datetime.strptime(
+        date_string, "%Y-%m-%d").date().toordinal()
+
+
+class TestWorkdayCalendar(object):
+    def setup(self):
+        self.calendar = WorkdayCalendar(2014)
+        self.calendar.add_holiday(datetime.date(2014, 12, 24))
+        self.calendar.add_holiday(datetime.date(2014, 12, 25))
+        self.calendar.add_holiday(datetime.date(2014, 12, 26))
+
+    def teardown(self):
+        pass
+
+    def test_weekends(self):
+        nt.assert_equal(len(self.calendar.workdays), 365)
+        nt.assert_true(self.calendar.is_workday(ordinal("2014-01-01")))
+        nt.assert_false(self.calendar.is_workday(ordinal("2014-01-04")))
+        nt.assert_false(self.calendar.is_workday(ordinal("2014-01-05")))
+        nt.assert_false(self.calendar.is_workday(ordinal("2015-01-03")))
+        nt.assert_true(self.calendar.is_workday(ordinal("2013-12-31")))
+
+    def test_holidays(self):
+        nt.assert_false(self.calendar.is_workday(ordinal("2014-12-24")))
+        self.calendar.add_holiday(datetime.date(2015, 1, 1))
+        nt.assert_true(self.calendar.is_workday(ordinal("2015-01-01")))
+
+    def test_next_workday(self):
+        nt.assert_equal(self.calendar.next_workday(ordinal("2014-09-01")),
+                        ordinal("2014-09-01"))
+        nt.assert_equal(self.calendar.next_workday(ordinal("2014-09-06")),
+                        ordinal("2014-09-08"))
+        nt.assert_equal(self.calendar.next_workday(ordinal("2014-12-24")),
+                        ordinal("2014-12-29"))
+        nt.assert_equal(self.calendar.next_workday(ordinal("2015-01-03")),
+                        ordinal("2015-01-05"))
+
+    def test_next_workday_after_year(self):
+        calendar = WorkdayCalendar(2016)
+        calendar.add_holiday(datetime.date(2016, 12, 30))
+        nt.assert_equal(calendar.next_workday(ordinal("2016-12-30")),
+                        ordinal("2017-01-02"))
+
+    def test_workdays_between(self):
+        nt.assert_equal(self.calendar.workdays_between(
+            ordinal("2014-09-01"), ordinal("2014-09-30")), 22)
+        nt.assert_equal(self.calendar.workdays_between(
+            ordinal("2014-12-01"), ordinal("2014-12-31")), 20)
+        nt.assert_equal(self.calendar.workdays_between(
+            ordinal("2014-12-20"), ordinal("2015-01-31")), 5)
+        nt.assert_equal(self.calendar.workdays_between(
+            ordinal("2014-01-01"), ordinal("2014-12-31")), 258)
+        nt.assert_equal(self.calendar.workdays_between(
+            ordinal("2014-09-06"), ordinal("2014-09-07")), 0)
+        self.calendar.add_holiday(datetime.date(2014, 12, 31))
+        nt.assert_equal(self.calendar.workdays_between(
+            ordinal("2014-12-01"), ordinal("2014-12-31")), 19)
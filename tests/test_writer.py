@@ -134,6 +134,69 @@ class TestWriter:
                 month_file.read(),
                 "2. 8:00")
 
+    def test_edit_line_with_shorter_line(self):
+        file_path = self._create_month_file("2015-02.txt",
+                                            "2. 8:00 1:00 17:00\n"
+                                            "3. 8:15 0:45 17:00\n\n")
+
+        write_line(file_path, "3. 8:15")
+
+        with open(file_path, 'r') as month_file:
+            nt.assert_equal(
+                month_file.read(),
+                "2. 8:00 1:00 17:00\n"
+                "3. 8:15")
+
+    def test_write_line_to_long_file(self):
+        lines = ["{}. 8:00 1:00 17:00 \"{}\"".format(day, "x" * 1000)
+                 for day in range(1, 20)]
+        file_path = self._create_month_file(
+            "2015-02.txt", "\n".join(lines) + "\n" + " \n" * 5000)
+
+        write_line(file_path, "19. 8:00 1:00 17:30", fsync=True)
+        write_line(file_path, "20. 8:00")
+
+        with open(file_path, 'r') as month_file:
+            nt.assert_equal(
+                month_file.read(),
+                "\n".join(lines[:-1]) + "\n19. 8:00 1:00 17:30\n20. 8:00")
+
+    def test_blank_lines_before_last_line_are_kept(self):
+        file_path = self._create_month_file("2015-02.txt",
+                                            "2. 8:00 1:00 17:00\n\n"
+                                            "3. 8:15")
+
+        write_line(file_path, "3. 8:15 0:45")
+
+        with open(file_path, 'r') as month_file:
+            nt.assert_equal(
+                month_file.read(),
+                "2. 8:00 1:00 17:00\n\n"
+                "3. 8:15 0:45")
+
+    def test_replace_line_with_shorter_line_is_atomic(self):
+        file_path = self._create_month_file("2015-02.txt",
+                                            "2. 8:00 1:00 17:00\n"
+                                            "3. 8:15 0:45 17:00 \"A long "
+                                            "comment\"")
+        inode = os.stat(file_path).st_ino
+
+        write_line(file_path, "3. 8:15 0:45 17:00")
+
+        with open(file_path, 'r') as month_file:
+            nt.assert_equal(month_file.read(),
+                            "2. 8:00 1:00 17:00\n"
+                            "3. 8:15 0:45 17:00")
+        # The line is written to a new file that replaces the month file.
+        nt.assert_not_equal(os.stat(file_path).st_ino, inode)
+        nt.assert_equal(os.listdir(self.tempdir.name), ["2015-02.txt"])
+
+    def test_write_line_to_blank_file(self):
+        file_path = self._create_month_file("2015-02.txt", "\n")
+        write_line(file_path, "2. 8:00")
+        with open(file_path, 'r') as month_file:
+            nt.assert_equal(month_file.read(), "2. 8:00")
+
     def _create_month_file(self, file_name, content):
         file_path = os.path.join(self.tempdir.name, file_name)
         with open(file_path, 'w') as month_file:
@@ -70,6 +70,16 @@ class TestYear(object):
         nt.assert_equal(len(year_1.months), 12)
         nt.assert_true(year_1.complete())
 
+    def test_holiday_after_month(self):
+        year_1 = year.Year("2014", start_date="2014-04-01")
+        year_1.add_holiday("2014-05-01", "First of May")
+        year_1.add_holiday("2014-05-02", "Squeeze day")
+        while year_1.next_workday()[:7] == "2014-04":
+            day_1 = year_1.add_day(year_1.next_workday())
+            day_1.report("8:00", "1:00", "17:00")
+        nt.assert_equal(year_1.next_workday(), "2014-05-05")
+        nt.assert_true(year_1.months[-1].complete())
+
     def test_calculate_flextime(self):
         year_1 = year.Year("2013")
         nt.assert_equal(year_1.calculate_flextime(), datetime.timedelta())